@@ -18,12 +18,150 @@ class Config:
 
     # Configuration des requêtes
     REQUEST_TIMEOUT = 10  # secondes
+    REQUEST_CONNECT_TIMEOUT = 3  # Établissement de la connexion (secondes)
+    FANOUT_WORKERS = 16  # Threads pour les appels TMDB parallèles d'une même route
+
+    # Limitation du débit vers TMDB (quota d'environ 40 requêtes/s par IP)
+    TMDB_RATE_LIMIT = 35  # Requêtes par seconde pour l'ensemble des workers
+    TMDB_RATE_LIMIT_WORKERS = int(os.getenv('WEB_CONCURRENCY', 1))  # Quota réparti entre les workers
+    TMDB_RATE_LIMIT_TIMEOUT = 5  # Attente maximum d'un jeton (secondes)
+    TMDB_MAX_RETRIES = 2  # Nouvelles tentatives sur 429 / 502 / 503 / 504
+    TMDB_RETRY_BASE_DELAY = 0.5  # Délai de base du backoff exponentiel (secondes)
+    TMDB_RETRY_MAX_DELAY = 4  # Au-delà (ex: Retry-After), l'erreur est renvoyée
+
+    # Priorité des familles d'endpoints ('high', 'normal', 'low'), 'normal' par défaut
+    TMDB_ENDPOINT_PRIORITIES = {
+        'movie_details': 'high',
+        'movie_credits': 'high',
+        'search': 'high',
+    }
+    # Part du seau à jetons réservée aux priorités supérieures
+    TMDB_PRIORITY_RESERVES = {
+        'high': 0,
+        'normal': 0.1,
+        'low': 0.5,
+    }
     MAX_PAGE_LIMIT = 1000
     MAX_QUERY_LENGTH = 100
     MAX_GENRE_ID = 10779  # Limite TMDB
 
+    # Pool de connexions HTTP keep-alive vers TMDB
+    HTTP_POOL_CONNECTIONS = 10  # Nombre d'hôtes conservés dans le pool
+    HTTP_POOL_MAXSIZE = 20  # Connexions maximum conservées par hôte
+    HTTP_POOL_BLOCK = False  # Attendre une connexion libre plutôt que d'en ouvrir une en plus
+
     # Cache configuration
-    CACHE_TIMEOUT = 3600  # 1 heure en secondes
+    CACHE_TIMEOUT = 3600  # 1 heure en secondes (durée par défaut)
+    CACHE_TTL_JITTER = 0.1  # Aléa de ±10 % pour désynchroniser les expirations
+    CACHE_HARD_TTL_FACTOR = 2  # Une entrée périmée reste servie jusqu'à 2x sa durée de validité
+    CACHE_REFRESH_WORKERS = 4  # Threads de rafraîchissement en arrière-plan
+    CACHE_STALE_IF_ERROR = 24 * 3600  # Dernière valeur connue servie si TMDB est indisponible
+
+    # Cache négatif des ressources inexistantes (404)
+    NEGATIVE_CACHE_TTL = 60
+    NEGATIVE_CACHE_MAX_ENTRIES = 1000
+
+    # Disjoncteur par famille d'endpoints
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5  # Échecs consécutifs avant ouverture
+    CIRCUIT_BREAKER_RESET_TIMEOUT = 30  # Secondes avant un appel d'essai
+
+    # Durée de cache par famille d'endpoints TMDB (en secondes)
+    CACHE_TTL_POLICIES = {
+        'genres': 7 * 24 * 3600,  # Les genres ne changent quasiment jamais
+        'movie_details': 24 * 3600,
+        'movie_credits': 24 * 3600,
+        'top_rated': 6 * 3600,
+        'upcoming': 6 * 3600,
+        'popular': 3600,
+        'now_playing': 3600,
+        'discover': 3600,
+        'search': 1800,
+        'movie_summary': 24 * 3600,  # Résumés partagés par les listes (magasin de films)
+    }
+    CACHE_MAX_ENTRIES = 10000  # Nombre maximum d'entrées avant éviction LRU (dont un résumé par film)
+    CACHE_MAX_BYTES = 64 * 1024 * 1024  # Taille approximative maximum (64 Mo)
+    CACHE_SWEEP_INTERVAL = 60  # Intervalle minimum entre deux purges des entrées expirées
+
+    # Cache L2 partagé entre les workers : None, 'sqlite' ou 'redis'
+    CACHE_L2_BACKEND = os.getenv('CACHE_L2_BACKEND')
+    # Fichier du backend sqlite, obligatoire : ses valeurs sont désérialisées avec pickle,
+    # il ne doit pas se trouver dans un répertoire accessible en écriture à tous (/tmp)
+    CACHE_L2_PATH = os.getenv('CACHE_L2_PATH')
+    CACHE_L2_URL = os.getenv('CACHE_L2_URL', 'redis://localhost:6379/0')
+    CACHE_L2_PREFIX = 'ivoire-cine:'
+
+    # Snapshot du cache sur disque pour redémarrer à chaud (désactivé si vide)
+    CACHE_SNAPSHOT_PATH = os.getenv('CACHE_SNAPSHOT_PATH')
+    CACHE_SNAPSHOT_INTERVAL = 300  # Sauvegarde toutes les 5 minutes
+
+    # Cache des pages HTML rendues (accueil, genres, catégories, détail)
+    PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'false').lower() == 'true'
+    PAGE_CACHE_MAX_ENTRIES = 500
+    PAGE_CACHE_TIMEOUT = 300  # Durée de vie maximum d'une page, même si ses données n'ont pas changé
+    PAGE_CACHE_COMPRESS_LEVEL = 6
+    # Paramètres lus par chaque vue en cache : les autres (utm_source, fbclid...) sont ignorés dans la clé
+    PAGE_CACHE_KEY_ARGS = {
+        'movies.home': ('page',),
+        'movies.movies_by_genre': ('page',),
+        'movies.movies_by_category': ('page',),
+    }
+
+    # Compression des réponses dynamiques (brotli et zstd si les paquets sont installés)
+    COMPRESSION_ALGORITHMS = ('br', 'zstd', 'gzip')  # Par ordre de préférence
+    COMPRESSION_LEVELS = {'br': 5, 'zstd': 6, 'gzip': 6}  # Niveaux adaptés à la compression à la volée
+    COMPRESSION_MIN_SIZE = 1024
+    COMPRESSION_CACHE_MAX_BYTES = 8 * 1024 * 1024  # Corps compressés mémorisés
+
+    # Ressources versionnées par leur contenu (static/dist, flask build-assets)
+    STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 3600  # 1 an
+
+    # Préchargement des ressources des pages de films (103 Early Hints et en-tête Link)
+    EARLY_HINTS_ENABLED = True
+    EARLY_HINTS_POSTERS = 4  # Premières affiches annoncées, lues dans le cache
+
+    # Rendu en flux des pages de films dont les données TMDB ne sont pas en cache
+    STREAMED_RENDERING = os.getenv('STREAMED_RENDERING', 'true').lower() == 'true'
+
+    # Feuilles de style de chaque type de page ({% set page_type %}), regroupées par flask build-assets
+    PAGE_STYLESHEETS = {
+        'base': ('css/main.css',),
+        'movie_detail': ('css/main.css', 'css/pages/movie_detail.css'),
+        'movies_by_genre': ('css/main.css', 'css/pages/movies_by_genre.css'),
+        'movies_by_category': ('css/main.css', 'css/pages/movies_by_category.css'),
+        'advanced_search': ('css/main.css', 'css/pages/advanced_search.css'),
+    }
+
+    # CSS critique : préfixes des sélecteurs du premier affichage, insérés dans la page
+    # (ceux de 'base' valent pour tous les types de page)
+    CRITICAL_CSS_SELECTORS = {
+        'base': ('*', 'body', ':root', '[data-theme="dark"]', 'main', '.navbar', '.nav-left', '.theme-toggle',
+                 '.dropdown', '.dropdown-menu', '.search-form', '.movies', '.movie', '.movie-poster-link',
+                 '.movie-poster', '.movie-title-link', '.release-date', '.rating', '.star',
+                 '.stream-placeholder', '.error-container'),
+        'movie_detail': ('.movie-detail', '.back-button', '.movie-header', '.movie-poster-large', '.movie-info',
+                         '.movie-title', '.movie-tagline', '.movie-meta', '.movie-rating', '.rating-score',
+                         '.movie-genres', '.genre-tag'),
+        'movies_by_genre': ('.genre-header', '.page-info'),
+        'movies_by_category': ('.category-container', '.sidebar', '.content'),
+        'advanced_search': ('.search-container', '.form-grid', '.form-group', '.search-buttons', '.btn'),
+    }
+
+    # Cache des fragments de templates (cartes de films, menu des genres)
+    FRAGMENT_CACHE_MAX_ENTRIES = 5000
+
+    # En-têtes de cache HTTP des pages HTML, par endpoint (navigateur / CDN)
+    HTTP_CACHE_POLICIES = {
+        'movies.home': {'max_age': 60, 's_maxage': 300, 'stale_while_revalidate': 60},
+        'movies.movies_by_genre': {'max_age': 60, 's_maxage': 600, 'stale_while_revalidate': 60},
+        'movies.movies_by_category': {'max_age': 60, 's_maxage': 600, 'stale_while_revalidate': 60},
+        'movies.movie_detail': {'max_age': 300, 's_maxage': 3600, 'stale_while_revalidate': 300},
+    }
+
+    # Préchauffage du cache (flask cache-warm)
+    CACHE_WARM_POPULAR_PAGES = 5
+    CACHE_WARM_GENRE_PAGES = 1
+    CACHE_WARM_WORKERS = 4
+    CACHE_WARM_RATE = 20  # Appels TMDB par seconde maximum
 
     @classmethod
     def validate(cls):
@@ -58,6 +196,11 @@ class TestingConfig(Config):
     DEBUG = True
     # Utiliser une clé API de test si disponible
     TMDB_API_KEY = os.getenv('TMDB_TEST_API_KEY', os.getenv('TMDB_API_KEY'))
+    # Pas de cache partagé ni persistant entre les tests
+    CACHE_L2_BACKEND = None
+    CACHE_SNAPSHOT_PATH = None
+    PAGE_CACHE_ENABLED = False
+    STREAMED_RENDERING = False
 
 # Dictionnaire des configurations disponibles
 config = {
@@ -8,6 +8,11 @@ from app.routes.movies import movies_bp
 from app.utils.errors import register_error_handlers, setup_logging
 from app.utils.context_processors import register_context_processors
 from app.utils.static_optimization import configure_static_optimization
+from app.utils.cli import register_cli_commands
+from app.utils.page_cache import register_page_cache
+from app.utils.http_cache import register_http_cache
+from app.utils.fragment_cache import register_fragment_cache
+from app.utils.early_hints import register_early_hints
 
 # SÉCURITÉ: Configurer les logs dès l'import pour éviter l'exposition de clés API
 logging.getLogger('urllib3.connectionpool').setLevel(logging.WARNING)
@@ -47,7 +52,22 @@ def create_app(config_name=None):
     # Enregistrer les processeurs de contexte
     register_context_processors(app)
 
+    # Balise {% fragment %} pour réutiliser les composants rendus
+    register_fragment_cache(app)
+
+    # En-têtes de cache HTTP des pages (avant la compression, voir register_http_cache)
+    register_http_cache(app)
+
     # Configurer l'optimisation des ressources statiques
     configure_static_optimization(app)
 
+    # Préchargement des ressources des pages de films (103 Early Hints, en-tête Link)
+    register_early_hints(app)
+
+    # Cache des pages rendues (PAGE_CACHE_ENABLED)
+    register_page_cache(app)
+
+    # Enregistrer les commandes CLI (flask cache-warm...)
+    register_cli_commands(app)
+
     return app
\ No newline at end of file
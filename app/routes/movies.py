@@ -2,42 +2,190 @@
 Routes pour les films
 """
 from flask import Blueprint, render_template, request, abort
-from app.services.tmdb_service import tmdb_service
+from app.services.tmdb_service import tmdb_service, MOVIE_CATEGORIES, ERROR_NOT_FOUND
+from app.utils.page_cache import cached_page
+from app.utils.streaming import stream_page, streams_cold_page
 from app.utils.validators import validate_page, validate_query, validate_genre_id
 
 movies_bp = Blueprint('movies', __name__)
 
 @movies_bp.route('/')
+@cached_page
 def home():
     """Page d'accueil avec films populaires"""
     page = validate_page(request.args.get('page', 1))
 
-    data, error = tmdb_service.get_popular_movies(page)
-
-    if data:
-        movies = data.get("results", [])
-        total_pages = data.get("total_pages", 1)
-        return render_template(
-            "movies_paginated.html",
-            movies=movies,
-            page=page,
-            total_pages=total_pages
-        )
-    else:
-        return render_template(
-            "error.html",
-            error=error or "Erreur lors de la récupération des films"
+    # Liste absente du cache : la page est envoyée en flux pendant l'appel à TMDB
+    if streams_cold_page(tmdb_service.popular_cache_key(page)):
+        return stream_page(
+            "movies_paginated.html", {},
+            lambda: home_page(page, *tmdb_service.get_popular_movies(page))
         )
 
+    # Les genres (barre de navigation) sont chargés en parallèle
+    results = tmdb_service.fan_out(
+        movies=lambda: tmdb_service.get_popular_movies(page),
+        genres=tmdb_service.get_genres
+    )
+    data, error = results['movies']
+
+    return render_home(page, data, error)
+
 @movies_bp.route('/search')
 def search():
     """Recherche de films"""
     query = request.args.get('query')
     validated_query = validate_query(query)
 
+    data, error = None, None
     if validated_query:
-        data, error = tmdb_service.search_movies(validated_query)
+        results = tmdb_service.fan_out(
+            search=lambda: tmdb_service.search_movies(validated_query),
+            genres=tmdb_service.get_genres
+        )
+        data, error = results['search']
+
+    return render_search(query, validated_query, data, error)
+
+@movies_bp.route('/genre/<int:genre_id>')
+@cached_page
+def movies_by_genre(genre_id):
+    """Films filtrés par genre"""
+    validated_genre_id = validate_genre_id(genre_id)
+    if not validated_genre_id:
+        abort(404)
+
+    page = validate_page(request.args.get('page', 1))
+
+    if streams_cold_page(tmdb_service.genre_cache_key(validated_genre_id, page)):
+        # Le nom du genre (titre de la page) est connu avant l'envoi du squelette
+        genres_data, _ = tmdb_service.get_genres()
+        return stream_page(
+            "movies_by_genre.html",
+            {"genre_id": validated_genre_id, "genre_name": genre_name(validated_genre_id, genres_data)},
+            lambda: genre_page(
+                validated_genre_id, page,
+                *tmdb_service.discover_movies_by_genre(validated_genre_id, page),
+                genres_data
+            )
+        )
+
+    # Récupérer les films du genre et le nom du genre en parallèle
+    results = tmdb_service.fan_out(
+        movies=lambda: tmdb_service.discover_movies_by_genre(validated_genre_id, page),
+        genres=tmdb_service.get_genres
+    )
+    data, error = results['movies']
+    genres_data, _ = results['genres']
+
+    return render_genre(validated_genre_id, page, data, error, genres_data)
+
+@movies_bp.route('/category/<string:category>')
+@cached_page
+def movies_by_category(category):
+    """Films filtrés par catégorie TMDB"""
+    if category not in MOVIE_CATEGORIES:
+        abort(404)
+
+    page = validate_page(request.args.get('page', 1))
+
+    if streams_cold_page(tmdb_service.category_cache_key(category, page)):
+        return stream_page(
+            "movies_by_category.html",
+            {"category": category, "category_name": MOVIE_CATEGORIES[category]},
+            lambda: category_page(category, page, *tmdb_service.get_movies_by_category(category, page))
+        )
+
+    # Utiliser le service TMDB (mis en cache) pour les catégories
+    results = tmdb_service.fan_out(
+        movies=lambda: tmdb_service.get_movies_by_category(category, page),
+        genres=tmdb_service.get_genres
+    )
+    data, error = results['movies']
+
+    return render_category(category, page, data, error)
+
+@movies_bp.route('/movie/<int:movie_id>')
+@cached_page
+def movie_detail(movie_id):
+    """Page de détail d'un film"""
+    # Valider l'ID du film
+    if movie_id <= 0:
+        abort(404)
+
+    # Détails absents du cache : le squelette (titre du film) part avant l'appel à TMDB
+    if streams_cold_page(tmdb_service.details_cache_key(movie_id)):
+        known = tmdb_service.get_movie_summary(movie_id)
+        if known is not None:
+            def load_movie_detail():
+                movie_data, error = tmdb_service.get_movie_details(movie_id)
+                return movie_detail_page(movie_data, error, fallback_summary(movie_id, movie_data, error))
+
+            return stream_page("movie_detail.html", {"movie": known}, load_movie_detail)
+
+    # Récupérer les détails du film
+    results = tmdb_service.fan_out(
+        movie=lambda: tmdb_service.get_movie_details(movie_id),
+        genres=tmdb_service.get_genres
+    )
+    movie_data, error = results['movie']
+
+    return render_movie_detail(movie_data, error, fallback_summary(movie_id, movie_data, error))
+
+@movies_bp.route('/advanced-search')
+def advanced_search():
+    """Recherche avancée avec filtres"""
+    # Récupérer les paramètres de recherche
+    filters = parse_advanced_search_filters()
+
+    # Genres du formulaire toujours nécessaires
+    calls = {'genres': tmdb_service.get_genres}
+
+    # Si des filtres sont appliqués
+    if filters['active']:
+        if filters['query']:
+            # Si une requête textuelle est présente, utiliser l'endpoint de recherche
+            validated_query = validate_query(filters['query'])
+            if validated_query:
+                calls['search'] = lambda: tmdb_service.search_movies(validated_query, filters['page'])
+        else:
+            # Utiliser l'endpoint discover
+            params = build_discover_params(filters)
+            calls['search'] = lambda: tmdb_service.discover_movies(params)
+
+    results = tmdb_service.fan_out(**calls)
+    genres_data, _ = results['genres']
+    data, error = results.get('search', (None, None))
+
+    return render_advanced_search(filters, genres_data, data, error)
+
+
+# Rendu des pages
+# Les fonctions *_page retournent (template, contexte), rendus d'un bloc ou en flux
+
+def home_page(page, data, error):
+    """Page d'accueil"""
+    if data:
+        movies = data.get("results", [])
+        total_pages = data.get("total_pages", 1)
+        return "movies_paginated.html", {
+            "movies": movies,
+            "page": page,
+            "total_pages": total_pages
+        }
+    else:
+        return "error.html", {
+            "error": error or "Erreur lors de la récupération des films"
+        }
+
+def render_home(page, data, error):
+    """Rendu de la page d'accueil"""
+    template, context = home_page(page, data, error)
+    return render_template(template, **context)
 
+def render_search(query, validated_query, data, error):
+    """Rendu des résultats de recherche"""
+    if validated_query:
         if data:
             movies = data.get('results', [])
             return render_template(
@@ -57,20 +205,8 @@ def search():
             query=query or ""
         )
 
-@movies_bp.route('/genre/<int:genre_id>')
-def movies_by_genre(genre_id):
-    """Films filtrés par genre"""
-    validated_genre_id = validate_genre_id(genre_id)
-    if not validated_genre_id:
-        abort(404)
-
-    page = validate_page(request.args.get('page', 1))
-
-    # Récupérer les films du genre
-    data, error = tmdb_service.discover_movies_by_genre(validated_genre_id, page)
-
-    # Récupérer le nom du genre
-    genres_data, _ = tmdb_service.get_genres()
+def genre_name(genre_id, genres_data):
+    """Nom d'un genre d'après la liste des genres TMDB"""
     genres_dict = {}
     if genres_data:
         genres_dict = {
@@ -78,180 +214,153 @@ def movies_by_genre(genre_id):
             for genre in genres_data.get('genres', [])
         }
 
-    genre_name = genres_dict.get(validated_genre_id, "Inconnu")
+    return genres_dict.get(genre_id, "Inconnu")
+
+def genre_page(genre_id, page, data, error, genres_data):
+    """Page des films d'un genre"""
+    name = genre_name(genre_id, genres_data)
 
     if data:
         movies = data.get("results", [])
         total_pages = data.get("total_pages", 1)
-        return render_template(
-            "movies_by_genre.html",
-            movies=movies,
-            genre_id=validated_genre_id,
-            genre_name=genre_name,
-            total_pages=total_pages,
-            page=page
-        )
+        return "movies_by_genre.html", {
+            "movies": movies,
+            "genre_id": genre_id,
+            "genre_name": name,
+            "total_pages": total_pages,
+            "page": page
+        }
     else:
-        return render_template(
-            "error.html",
-            error=error or f"Erreur lors de la récupération des films pour le genre {genre_name}"
-        )
-
-@movies_bp.route('/category/<string:category>')
-def movies_by_category(category):
-    """Films filtrés par catégorie TMDB"""
-    # Mapper les catégories avec les endpoints TMDB
-    category_map = {
-        "now_playing": "Films en Salle",
-        "popular": "Films Populaires",
-        "top_rated": "Films les Mieux Notés",
-        "upcoming": "Films à Venir"
-    }
+        return "error.html", {
+            "error": error or f"Erreur lors de la récupération des films pour le genre {name}"
+        }
 
-    if category not in category_map:
-        abort(404)
+def render_genre(genre_id, page, data, error, genres_data):
+    """Rendu des films d'un genre"""
+    template, context = genre_page(genre_id, page, data, error, genres_data)
+    return render_template(template, **context)
 
-    page = validate_page(request.args.get('page', 1))
-
-    # Utiliser le service TMDB pour les catégories
-    if category == 'popular':
-        data, error = tmdb_service.get_popular_movies(page)
-    else:
-        # Pour les autres catégories, faire un appel direct via le service
-        from app.services.tmdb_service import tmdb_service as service
-        endpoint = f"movie/{category}"
-        data, error = service._make_request(endpoint, {"page": page})
-
-    category_name = category_map[category]
+def category_page(category, page, data, error):
+    """Page des films d'une catégorie"""
+    category_name = MOVIE_CATEGORIES[category]
 
     if data:
         movies = data.get("results", [])
         total_pages = min(data.get("total_pages", 1), 500)
-        return render_template(
-            "movies_by_category.html",
-            movies=movies,
-            category=category,
-            category_name=category_name,
-            total_pages=total_pages,
-            page=page
-        )
+        return "movies_by_category.html", {
+            "movies": movies,
+            "category": category,
+            "category_name": category_name,
+            "total_pages": total_pages,
+            "page": page
+        }
     else:
-        return render_template(
-            "error.html",
-            error=error or f"Erreur lors de la récupération des films pour la catégorie {category_name}"
-        )
+        return "error.html", {
+            "error": error or f"Erreur lors de la récupération des films pour la catégorie {category_name}"
+        }
 
-@movies_bp.route('/movie/<int:movie_id>')
-def movie_detail(movie_id):
-    """Page de détail d'un film"""
-    # Valider l'ID du film
-    if movie_id <= 0:
-        abort(404)
+def render_category(category, page, data, error):
+    """Rendu des films d'une catégorie"""
+    template, context = category_page(category, page, data, error)
+    return render_template(template, **context)
 
-    # Récupérer les détails du film
-    movie_data, error = tmdb_service.get_movie_details(movie_id)
+def fallback_summary(movie_id, movie_data, error):
+    """TMDB indisponible : résumé déjà connu du film, pour une page partielle"""
+    if movie_data is None and error != ERROR_NOT_FOUND:
+        return tmdb_service.get_movie_summary(movie_id)
+    return None
 
+def movie_detail_page(movie_data, error, summary=None):
+    """Page de détail d'un film (partielle si seul son résumé est connu)"""
     if not movie_data:
-        return render_template(
-            "error.html",
-            error=error or "Film non trouvé"
-        )
-
-    # Extraire les données utiles
-    movie = movie_data
-    cast = movie_data.get('credits', {}).get('cast', [])[:10]  # Top 10 acteurs
-    crew = movie_data.get('credits', {}).get('crew', [])
-    similar_movies = movie_data.get('similar', {}).get('results', [])[:6]
-    videos = movie_data.get('videos', {}).get('results', [])
-
-    # Filtrer les vidéos pour ne garder que les trailers YouTube
-    trailers = [
-        video for video in videos
-        if video.get('type') == 'Trailer' and video.get('site') == 'YouTube'
-    ][:3]
-
-    # Trouver le réalisateur
-    director = None
-    for person in crew:
-        if person.get('job') == 'Director':
-            director = person.get('name')
-            break
+        if summary is not None:
+            return "movie_detail.html", {
+                "movie": summary,
+                "cast": [],
+                "director": None,
+                "similar_movies": [],
+                "trailers": [],
+                "partial": True
+            }
+        return "error.html", {
+            "error": error or "Film non trouvé"
+        }
 
-    return render_template(
-        "movie_detail.html",
-        movie=movie,
-        cast=cast,
-        director=director,
-        similar_movies=similar_movies,
-        trailers=trailers
-    )
+    # Modèle de vue calculé à la mise en cache (distribution, réalisateur, bandes-annonces)
+    return "movie_detail.html", {
+        "movie": movie_data,
+        "cast": movie_data.get('cast', []),
+        "director": movie_data.get('director'),
+        "similar_movies": movie_data.get('similar', []),
+        "trailers": movie_data.get('trailers', [])
+    }
 
-@movies_bp.route('/advanced-search')
-def advanced_search():
-    """Recherche avancée avec filtres"""
-    # Récupérer les genres pour le formulaire
-    genres_data, _ = tmdb_service.get_genres()
-    genres = genres_data.get('genres', []) if genres_data else []
+def render_movie_detail(movie_data, error, summary=None):
+    """Rendu de la page de détail d'un film (partielle si seul son résumé est connu)"""
+    template, context = movie_detail_page(movie_data, error, summary)
+    return render_template(template, **context)
+
+def parse_advanced_search_filters():
+    """Extrait les filtres de la recherche avancée de la requête"""
+    filters = {
+        'query': request.args.get('query', '').strip(),
+        'genre_id': request.args.get('genre_id', type=int),
+        'year': request.args.get('year', type=int),
+        'min_rating': request.args.get('min_rating', type=float),
+        'sort_by': request.args.get('sort_by', 'popularity.desc'),
+        'page': validate_page(request.args.get('page', 1))
+    }
+    filters['active'] = any([filters['query'], filters['genre_id'], filters['year'], filters['min_rating']])
+    return filters
+
+def build_discover_params(filters):
+    """Construit les paramètres de l'endpoint discover à partir des filtres"""
+    params = {
+        'page': filters['page'],
+        'sort_by': filters['sort_by'],
+        'vote_count.gte': 10  # Films avec au moins 10 votes
+    }
 
-    # Récupérer les paramètres de recherche
-    query = request.args.get('query', '').strip()
-    genre_id = request.args.get('genre_id', type=int)
-    year = request.args.get('year', type=int)
-    min_rating = request.args.get('min_rating', type=float)
-    sort_by = request.args.get('sort_by', 'popularity.desc')
-    page = validate_page(request.args.get('page', 1))
+    # Ajouter les filtres
+    if filters['genre_id']:
+        params['with_genres'] = filters['genre_id']
 
-    movies = []
-    total_pages = 1
-    error = None
+    if filters['year']:
+        params['primary_release_year'] = filters['year']
 
-    # Si des filtres sont appliqués
-    if any([query, genre_id, year, min_rating]):
-        # Construire les paramètres de recherche
-        params = {
-            'page': page,
-            'sort_by': sort_by,
-            'vote_count.gte': 10  # Films avec au moins 10 votes
-        }
+    if filters['min_rating']:
+        params['vote_average.gte'] = filters['min_rating']
 
-        # Ajouter les filtres
-        if genre_id:
-            params['with_genres'] = genre_id
+    return params
 
-        if year:
-            params['primary_release_year'] = year
+def render_advanced_search(filters, genres_data, data, error):
+    """Rendu de la recherche avancée"""
+    genres = genres_data.get('genres', []) if genres_data else []
+    genre_id, min_rating, year = filters['genre_id'], filters['min_rating'], filters['year']
 
-        if min_rating:
-            params['vote_average.gte'] = min_rating
+    movies = []
+    total_pages = 1
 
-        if query:
-            # Si une requête textuelle est présente, utiliser l'endpoint de recherche
-            validated_query = validate_query(query)
-            if validated_query:
-                data, error = tmdb_service.search_movies(validated_query, page)
-                if data:
-                    # Filtrer les résultats selon les critères additionnels
-                    movies = data.get('results', [])
-                    if genre_id or min_rating or year:
-                        movies = filter_search_results(movies, genre_id, min_rating, year)
-                    total_pages = data.get('total_pages', 1)
+    if data:
+        movies = data.get('results', [])
+        if filters['query']:
+            # Filtrer les résultats selon les critères additionnels
+            if genre_id or min_rating or year:
+                movies = filter_search_results(movies, genre_id, min_rating, year)
+            total_pages = data.get('total_pages', 1)
         else:
-            # Utiliser l'endpoint discover
-            data, error = tmdb_service._make_request('discover/movie', params)
-            if data:
-                movies = data.get('results', [])
-                total_pages = min(data.get('total_pages', 1), 500)
+            total_pages = min(data.get('total_pages', 1), 500)
 
     return render_template(
         'advanced_search.html',
         movies=movies,
         genres=genres,
-        query=query,
+        query=filters['query'],
         selected_genre_id=genre_id,
         selected_year=year,
         selected_min_rating=min_rating,
-        selected_sort_by=sort_by,
-        page=page,
+        selected_sort_by=filters['sort_by'],
+        page=filters['page'],
         total_pages=total_pages,
         error=error
     )
@@ -0,0 +1,160 @@
+"""
+Backends de cache de second niveau (L2) partagés entre les workers
+
+Le TMDBCache en mémoire reste un petit cache L1 propre à chaque processus ;
+ces backends stockent des entrées déjà sérialisées (bytes) accessibles à
+tous les workers d'un même hôte.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Any
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interface d'un backend de cache de second niveau"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Récupère une entrée sérialisée, ou None si absente ou expirée"""
+        raise NotImplementedError
+
+    def set(self, key: str, data: bytes, expires_in: float) -> None:
+        """Enregistre une entrée sérialisée pour expires_in secondes"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Supprime une entrée"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Vide le backend"""
+        raise NotImplementedError
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Backend fichier SQLite partagé par les workers d'un même hôte
+
+    Chaque thread utilise sa propre connexion ; le mode WAL permet des
+    lectures concurrentes pendant qu'un worker écrit. Le fichier est créé
+    lisible par son seul propriétaire (fichiers WAL compris).
+    """
+
+    def __init__(self, path: str, purge_interval: float = 300):
+        self.path = path
+        self.purge_interval = purge_interval
+        self._local = threading.local()
+        self._last_purge = time.time()
+
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, data: bytes, expires_in: float) -> None:
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, sqlite3.Binary(data), now + expires_in)
+        )
+
+        # Purge amortie des lignes expirées
+        if now - self._last_purge >= self.purge_interval:
+            self._last_purge = now
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache")
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend parlant le protocole Redis
+
+    N'importe quel client exposant get/set(px=)/delete/scan_iter peut être
+    fourni (redis-py, un serveur compatible ou un substitut local). Sans
+    client, redis-py est importé et connecté à l'URL donnée.
+    """
+
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = ''):
+        if client is None:
+            try:
+                import redis
+            except ImportError as exc:
+                raise RuntimeError(
+                    "Le backend Redis nécessite le paquet 'redis' (pip install redis)"
+                ) from exc
+            client = redis.Redis.from_url(url)
+
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, data: bytes, expires_in: float) -> None:
+        self.client.set(self.prefix + key, data, px=max(1, int(expires_in * 1000)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_l2_backend(config) -> Optional[CacheBackend]:
+    """
+    Crée le backend L2 décrit par la configuration
+
+    Returns:
+        Le backend configuré, ou None si aucun backend n'est activé
+        ou s'il ne peut pas être initialisé
+
+    Raises:
+        ValueError: Backend inconnu, ou backend sqlite sans CACHE_L2_PATH
+    """
+    backend = config.CACHE_L2_BACKEND
+    if not backend:
+        return None
+    if backend == 'sqlite' and not config.CACHE_L2_PATH:
+        raise ValueError("CACHE_L2_PATH est obligatoire avec CACHE_L2_BACKEND=sqlite")
+
+    try:
+        if backend == 'sqlite':
+            return SQLiteCacheBackend(config.CACHE_L2_PATH)
+        if backend == 'redis':
+            return RedisCacheBackend(url=config.CACHE_L2_URL, prefix=config.CACHE_L2_PREFIX)
+    except (sqlite3.Error, OSError, RuntimeError) as exc:
+        logger.warning("Cache L2 '%s' indisponible, cache mémoire seul: %s", backend, exc)
+        return None
+
+    raise ValueError(f"Backend de cache L2 inconnu: {backend}")
@@ -0,0 +1,153 @@
+"""
+Snapshots binaires du cache TMDB pour un redémarrage à chaud
+
+Format du fichier (little-endian) :
+    en-tête : signature (8 octets) + nombre d'entrées (uint32)
+    entrée  : horodatage, ttl, hard_ttl (3 x float64),
+              longueur de la clé, longueur de la valeur (2 x uint32),
+              clé UTF-8, valeur sérialisée (pickle)
+
+À l'ouverture, seuls les en-têtes d'entrées sont parcourus dans le fichier
+mappé en mémoire ; chaque valeur n'est désérialisée qu'au premier accès.
+"""
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from typing import Optional, Dict, Any, Tuple, List, Iterable
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'IVCSNAP1'
+_HEADER = struct.Struct('<8sI')
+_ENTRY = struct.Struct('<dddII')
+
+# (clé, horodatage, ttl, hard_ttl, valeur sérialisée)
+SnapshotEntry = Tuple[str, float, float, float, bytes]
+
+
+def write_snapshot(path: str, entries: Iterable[SnapshotEntry]) -> int:
+    """
+    Écrit un snapshot de manière atomique (fichier temporaire puis renommage)
+
+    Chaque écriture a son propre fichier temporaire : les sauvegardes
+    simultanées de plusieurs workers ne se mélangent pas.
+
+    Returns:
+        Le nombre d'entrées écrites
+    """
+    entries = list(entries)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+
+    try:
+        with os.fdopen(fd, 'wb') as snapshot_file:
+            snapshot_file.write(_HEADER.pack(MAGIC, len(entries)))
+            for key, timestamp, ttl, hard_ttl, payload in entries:
+                encoded_key = key.encode('utf-8')
+                snapshot_file.write(_ENTRY.pack(timestamp, ttl, hard_ttl, len(encoded_key), len(payload)))
+                snapshot_file.write(encoded_key)
+                snapshot_file.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(entries)
+
+
+class CacheSnapshot:
+    """Snapshot ouvert en lecture, mappé en mémoire et désérialisé à la demande"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Dict[str, Tuple[int, int, float, float, float]] = {}
+        self._lock = threading.Lock()
+
+        with open(path, 'rb') as snapshot_file:
+            self._mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._build_index()
+        except (ValueError, struct.error, UnicodeDecodeError):
+            self.close()
+            raise
+
+    def _build_index(self) -> None:
+        """Indexe les entrées encore valides sans lire leurs valeurs"""
+        magic, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Snapshot de cache invalide: {self.path}")
+
+        now = time.time()
+        offset = _HEADER.size
+        for _ in range(count):
+            timestamp, ttl, hard_ttl, key_length, payload_length = _ENTRY.unpack_from(self._mmap, offset)
+            offset += _ENTRY.size
+            key = self._mmap[offset:offset + key_length].decode('utf-8')
+            offset += key_length
+
+            if offset + payload_length > len(self._mmap):
+                raise ValueError(f"Snapshot de cache tronqué: {self.path}")
+
+            if now - timestamp <= hard_ttl:
+                self._index[key] = (offset, payload_length, timestamp, ttl, hard_ttl)
+            offset += payload_length
+
+    def pop(self, key: str) -> Optional[Tuple[Any, float, float, float]]:
+        """
+        Retire une entrée du snapshot et la désérialise
+
+        Returns:
+            Tuple[valeur, horodatage, ttl, hard_ttl] ou None si absente ou expirée
+        """
+        with self._lock:
+            meta = self._index.pop(key, None)
+        if meta is None:
+            return None
+
+        offset, length, timestamp, ttl, hard_ttl = meta
+        if time.time() - timestamp > hard_ttl:
+            return None
+
+        return pickle.loads(self._mmap[offset:offset + length]), timestamp, ttl, hard_ttl
+
+    def discard(self, key: str) -> None:
+        """Oublie une entrée remplacée par une valeur plus récente"""
+        with self._lock:
+            self._index.pop(key, None)
+
+    def remaining_entries(self) -> List[SnapshotEntry]:
+        """Entrées encore valides qui n'ont pas été chargées (valeurs brutes)"""
+        now = time.time()
+        with self._lock:
+            index = list(self._index.items())
+
+        return [
+            (key, timestamp, ttl, hard_ttl, self._mmap[offset:offset + length])
+            for key, (offset, length, timestamp, ttl, hard_ttl) in index
+            if now - timestamp <= hard_ttl
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._index.clear()
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+def open_snapshot(path: str) -> Optional[CacheSnapshot]:
+    """Ouvre un snapshot existant, ou retourne None s'il est absent ou illisible"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+
+    try:
+        return CacheSnapshot(path)
+    except (OSError, ValueError, struct.error, UnicodeDecodeError) as exc:
+        logger.warning("Snapshot de cache ignoré (%s): %s", path, exc)
+        return None
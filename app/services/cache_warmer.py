@@ -0,0 +1,123 @@
+"""
+Préchauffage du cache TMDB avant l'arrivée du trafic
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Tuple, Callable
+from app.services.rate_limit import TokenBucket, PRIORITY_LOW, request_priority
+from app.services.tmdb_service import MOVIE_CATEGORIES
+
+# (libellé, clé de cache, appel au service retournant Tuple[data, error])
+WarmTask = Tuple[str, str, Callable[[], Tuple[Any, Any]]]
+
+
+class CacheWarmer:
+    """
+    Précharge les pages les plus consultées dans le cache du service
+
+    Les appels sont exécutés par un pool de threads borné et cadencés par un
+    seau à jetons pour rester sous le quota de l'API TMDB. Ils sont marqués
+    peu prioritaires pour ne pas retarder les pages consultées en direct.
+
+    Le cache n'est partagé avec les workers web que par le cache L2
+    (CACHE_L2_BACKEND) : le cache mémoire du processus qui préchauffe est
+    perdu à sa sortie.
+    """
+
+    def __init__(self, service, workers: int = 4, rate: float = 20.0):
+        self.service = service
+        self.workers = max(1, workers)
+        self.bucket = TokenBucket(rate) if rate and rate > 0 else None
+
+    def build_tasks(self, genres: List[Dict[str, Any]], popular_pages: int, genre_pages: int) -> List[WarmTask]:
+        """Construit la liste des appels à préchauffer"""
+        service = self.service
+        tasks: List[WarmTask] = []
+
+        for page in range(1, popular_pages + 1):
+            tasks.append((f"popular:{page}", service.popular_cache_key(page),
+                          lambda page=page: service.get_popular_movies(page)))
+
+        for category in MOVIE_CATEGORIES:
+            if category != 'popular':
+                tasks.append((f"category:{category}:1", service.category_cache_key(category, 1),
+                              lambda category=category: service.get_movies_by_category(category, 1)))
+
+        for genre in genres:
+            for page in range(1, genre_pages + 1):
+                tasks.append((f"genre:{genre['id']}:{page}", service.genre_cache_key(genre['id'], page),
+                              lambda genre_id=genre['id'], page=page: service.discover_movies_by_genre(genre_id, page)))
+
+        return tasks
+
+    def _run_task(self, task: WarmTask) -> Tuple[str, float, bool, Any, Any]:
+        """
+        Exécute un appel
+
+        Returns:
+            (libellé, durée, hit, données, erreur) : hit si l'entrée de la tâche
+            était déjà en cache (mémoire, L2 ou snapshot) avant l'appel
+        """
+        label, cache_key, call = task
+        if self.bucket is not None:
+            self.bucket.acquire()
+
+        started_at = time.time()
+        start = time.perf_counter()
+        with request_priority(PRIORITY_LOW):
+            data, error = call()
+        duration = time.perf_counter() - start
+
+        # La version d'une entrée est sa date d'écriture, conservée dans le L2 et les snapshots
+        version = self.service.cache.version(cache_key)
+        hit = error is None and version is not None and version < started_at
+        return label, duration, hit, data, error
+
+    def run(self, popular_pages: int = 5, genre_pages: int = 1) -> Dict[str, Any]:
+        """
+        Préchauffe le cache
+
+        Args:
+            popular_pages: Nombre de pages de films populaires à charger
+            genre_pages: Nombre de pages à charger pour chaque genre
+
+        Returns:
+            Rapport avec la durée, les erreurs et les hits/misses du cache
+            (une tâche préchauffée compte pour un hit ou un miss)
+        """
+        start = time.perf_counter()
+        durations = []
+        hits = 0
+        errors = {}
+
+        # Les genres sont nécessaires pour construire les autres appels
+        label, duration, hit, genres_data, error = self._run_task(
+            ("genres", self.service.genres_cache_key(), self.service.get_genres)
+        )
+        durations.append(duration)
+        hits += hit
+        if error:
+            errors[label] = error
+
+        genres = genres_data.get('genres', []) if genres_data else []
+        tasks = self.build_tasks(genres, popular_pages, genre_pages)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='cache-warm') as executor:
+            futures = [executor.submit(self._run_task, task) for task in tasks]
+            for future in as_completed(futures):
+                label, duration, hit, _, error = future.result()
+                durations.append(duration)
+                hits += hit
+                if error:
+                    errors[label] = error
+
+        return {
+            "tasks": len(durations),
+            "errors": errors,
+            "duration": time.perf_counter() - start,
+            "slowest_call": max(durations),
+            "average_call": sum(durations) / len(durations),
+            "cache_hits": hits,
+            "cache_misses": len(durations) - hits,
+            "cache_entries": self.service.cache.stats()["entries"]
+        }
@@ -0,0 +1,82 @@
+"""
+Disjoncteur pour les appels à un service amont défaillant
+"""
+import threading
+import time
+from typing import Dict, Any
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à trois états
+
+    - fermé : les appels passent, les échecs consécutifs sont comptés ;
+    - ouvert : après `failure_threshold` échecs, les appels sont refusés
+      immédiatement pendant `reset_timeout` secondes ;
+    - semi-ouvert : un seul appel d'essai est autorisé, son succès referme
+      le disjoncteur et son échec le rouvre.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Indique si un appel peut être tenté maintenant"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+
+            # Semi-ouvert : un seul appel d'essai à la fois
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Enregistre un appel réussi"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_skipped(self) -> None:
+        """Enregistre un appel qui n'a pas atteint le service amont (état inchangé)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Enregistre un appel en échec"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne l'état du disjoncteur"""
+        state = self.state
+        with self._lock:
+            return {"state": state, "consecutive_failures": self._failures}
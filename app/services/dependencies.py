@@ -0,0 +1,54 @@
+"""
+Suivi des entrées de cache lues pendant le rendu d'une page
+
+Le cache des pages enregistre, pour chaque page rendue, la version des
+entrées du cache TMDB qu'elle a utilisées. La page n'est resservie que tant
+que ces entrées n'ont pas changé.
+"""
+import contextvars
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterator
+
+
+class Dependencies:
+    """Entrées de cache (clé -> version) utilisées par un rendu"""
+    __slots__ = ('versions', 'cacheable')
+
+    def __init__(self, versions: Optional[Dict[str, Optional[float]]] = None):
+        self.versions: Dict[str, Optional[float]] = dict(versions or {})
+        self.cacheable = True
+
+
+_current_dependencies: contextvars.ContextVar[Optional[Dependencies]] = contextvars.ContextVar(
+    'cache_dependencies', default=None
+)
+
+
+@contextmanager
+def track_dependencies() -> Iterator[Dependencies]:
+    """
+    Collecte les dépendances des appels effectués dans ce contexte
+
+    Les appels parallélisés (fan_out) copient le contexte
+    courant et enregistrent donc leurs dépendances dans le même objet.
+    """
+    dependencies = Dependencies()
+    token = _current_dependencies.set(dependencies)
+    try:
+        yield dependencies
+    finally:
+        _current_dependencies.reset(token)
+
+
+def record_dependency(key: str, version: Optional[float]) -> None:
+    """Enregistre la version d'une entrée lue (None si elle n'est pas réutilisable)"""
+    dependencies = _current_dependencies.get()
+    if dependencies is not None:
+        dependencies.versions[key] = version
+
+
+def mark_uncacheable() -> None:
+    """Signale que le rendu courant repose sur une erreur ou une valeur de secours"""
+    dependencies = _current_dependencies.get()
+    if dependencies is not None:
+        dependencies.cacheable = False
@@ -0,0 +1,65 @@
+"""
+Magasin normalisé des films partagé par les listes, la recherche et les détails
+"""
+from typing import Optional, Dict, Any, Iterable, List, Tuple, Callable
+from app.services.projection import MovieSummary
+
+
+class MovieStore:
+    """
+    Résumés de films indexés par identifiant
+
+    Chaque film n'est stocké qu'une seule fois dans le cache du service (clé
+    movie_summary_<id>) : les listes mises en cache ne conservent que des
+    identifiants. Un résumé déjà connu est mis à jour sur place, ce qui
+    rafraîchit toutes les listes qui affichent ce film.
+    """
+
+    KEY_PREFIX = 'movie_summary_'
+
+    def __init__(self, cache, ttl_for: Callable[[], float], hard_ttl_factor: float = 1):
+        self.cache = cache
+        self._ttl_for = ttl_for
+        self.hard_ttl_factor = hard_ttl_factor
+
+    def _key(self, movie_id: int) -> str:
+        return f"{self.KEY_PREFIX}{movie_id}"
+
+    def get(self, movie_id: int) -> Optional[MovieSummary]:
+        """Retourne le résumé d'un film, même périmé, ou None s'il est inconnu"""
+        entry = self.cache.get_entry(self._key(movie_id))
+        return entry[0] if entry else None
+
+    def peek(self, movie_id: int) -> Optional[MovieSummary]:
+        """Résumé d'un film en mémoire, sans effet sur les compteurs ni les dépendances"""
+        return self.cache.peek(self._key(movie_id))
+
+    def get_many(self, movie_ids: Iterable[int]) -> List[Optional[MovieSummary]]:
+        """Retourne les résumés dans l'ordre des identifiants (None si évincé)"""
+        return [self.get(movie_id) for movie_id in movie_ids]
+
+    def upsert(self, summary: MovieSummary) -> MovieSummary:
+        """
+        Enregistre un résumé, en mettant à jour sur place celui déjà connu
+
+        Un résumé frais et inchangé n'est pas réécrit : sa version est
+        conservée, et les pages en cache qui l'affichent restent valides.
+        """
+        key = self._key(summary.id)
+        existing = self.cache.peek(key)
+        if existing is not None:
+            if existing == summary and self.cache.version(key) is not None:
+                return existing
+            existing.update(summary)
+            summary = existing
+
+        ttl = self._ttl_for()
+        self.cache.set(key, summary, ttl=ttl, hard_ttl=ttl * self.hard_ttl_factor)
+        return summary
+
+    def upsert_many(self, movies: Iterable[Dict[str, Any]]) -> Tuple[int, ...]:
+        """Enregistre des films TMDB et retourne leurs identifiants"""
+        return tuple(
+            self.upsert(MovieSummary.from_dict(movie)).id
+            for movie in movies if movie.get('id') is not None
+        )
@@ -0,0 +1,135 @@
+"""
+Projection des réponses TMDB avant leur mise en cache
+
+Les listes de films (populaires, recherche, découverte...) ne conservent que
+les champs lus par les templates et les filtres, sous forme d'enregistrements
+compacts à slots au lieu des dictionnaires complets renvoyés par TMDB.
+Les détails d'un film sont réduits au modèle de vue de la page de détail.
+"""
+from typing import Optional, Dict, Any, Tuple
+
+# Champs des listes de films lus par components/movie_card.html et filter_search_results
+MOVIE_SUMMARY_FIELDS = ('id', 'title', 'poster_path', 'release_date', 'vote_average', 'genre_ids')
+
+# Métadonnées de pagination conservées pour les listes
+LIST_FIELDS = ('page', 'total_pages', 'total_results')
+
+# Champs des détails d'un film lus par movie_detail.html
+DETAIL_FIELDS = ('id', 'title', 'tagline', 'overview', 'poster_path', 'release_date', 'runtime', 'vote_count')
+
+# Éléments affichés par la page de détail
+DETAIL_CAST_LIMIT = 10
+DETAIL_TRAILER_LIMIT = 3
+DETAIL_SIMILAR_LIMIT = 6
+
+
+class MovieSummary:
+    """
+    Résumé compact d'un film dans une liste
+
+    Accessible comme un objet (templates) ou comme un dictionnaire en lecture
+    (movie['title'], movie.get('genre_ids', [])).
+    """
+    __slots__ = MOVIE_SUMMARY_FIELDS
+
+    def __init__(self, id: int, title: Optional[str] = None, poster_path: Optional[str] = None,
+                 release_date: Optional[str] = None, vote_average: float = 0,
+                 genre_ids: Tuple[int, ...] = ()):
+        self.id = id
+        self.title = title
+        self.poster_path = poster_path
+        self.release_date = release_date
+        self.vote_average = vote_average
+        self.genre_ids = genre_ids
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MovieSummary':
+        """Construit un résumé à partir d'un film TMDB"""
+        return cls(
+            id=data.get('id'),
+            title=data.get('title'),
+            poster_path=data.get('poster_path'),
+            release_date=data.get('release_date'),
+            vote_average=data.get('vote_average') or 0,
+            genre_ids=tuple(data.get('genre_ids') or ())
+        )
+
+    @classmethod
+    def from_details(cls, data: Dict[str, Any]) -> 'MovieSummary':
+        """Construit un résumé à partir des détails complets d'un film"""
+        summary = cls.from_dict(data)
+        summary.genre_ids = tuple(genre['id'] for genre in data.get('genres') or ())
+        return summary
+
+    def update(self, other: 'MovieSummary') -> None:
+        """Remplace les champs par ceux d'un résumé plus récent du même film"""
+        for field in self.__slots__:
+            setattr(self, field, getattr(other, field))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, MovieSummary):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __reduce__(self):
+        # Sérialisation compacte (cache L2, snapshots) : uniquement les valeurs
+        return (MovieSummary, tuple(getattr(self, field) for field in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"MovieSummary(id={self.id!r}, title={self.title!r})"
+
+
+def project_movie_list(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Ne conserve d'une liste TMDB que la pagination et les résumés de films"""
+    projected = {field: data[field] for field in LIST_FIELDS if field in data}
+    projected['results'] = [MovieSummary.from_dict(movie) for movie in data.get('results', [])]
+    return projected
+
+
+def build_movie_detail(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Construit le modèle de vue de la page de détail d'un film
+
+    Calculé une seule fois à la mise en cache : distribution principale,
+    réalisateur, bandes-annonces YouTube et premiers films similaires. Le reste
+    de la réponse TMDB (équipe complète, autres vidéos...) est abandonné.
+    """
+    credits = data.get('credits') or {}
+    videos = (data.get('videos') or {}).get('results', [])
+
+    detail = {field: data.get(field) for field in DETAIL_FIELDS}
+    detail['vote_average'] = data.get('vote_average') or 0
+    detail['genres'] = [
+        {'id': genre.get('id'), 'name': genre.get('name')}
+        for genre in data.get('genres') or []
+    ]
+    detail['cast'] = [
+        {'name': actor.get('name'), 'character': actor.get('character'), 'profile_path': actor.get('profile_path')}
+        for actor in credits.get('cast', [])[:DETAIL_CAST_LIMIT]
+    ]
+    detail['director'] = next(
+        (person.get('name') for person in credits.get('crew', []) if person.get('job') == 'Director'),
+        None
+    )
+    detail['trailers'] = [
+        {'key': video.get('key'), 'name': video.get('name')}
+        for video in videos
+        if video.get('type') == 'Trailer' and video.get('site') == 'YouTube'
+    ][:DETAIL_TRAILER_LIMIT]
+    detail['similar'] = (data.get('similar') or {}).get('results', [])[:DETAIL_SIMILAR_LIMIT]
+    return detail
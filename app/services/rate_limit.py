@@ -0,0 +1,128 @@
+"""
+Limitation de débit des appels sortants
+"""
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Optional, Iterator
+
+# Priorités des appels sortants : les pages de détail passent avant le préchauffage
+PRIORITY_HIGH = 'high'
+PRIORITY_NORMAL = 'normal'
+PRIORITY_LOW = 'low'
+
+_current_priority: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    'tmdb_request_priority', default=None
+)
+
+
+class TokenBucket:
+    """
+    Seau à jetons partagé entre les threads
+
+    Le seau se remplit de `rate` jetons par seconde jusqu'à `capacity` ;
+    chaque appel consomme un jeton.
+
+    Une réserve de jetons peut être exigée pour les appels peu prioritaires :
+    ils n'obtiennent un jeton que s'il en reste au moins `reserve` ensuite,
+    ce qui garde de la marge pour les appels prioritaires.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1, reserve: float = 0) -> bool:
+        """Consomme des jetons s'ils sont disponibles, sans attendre"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens - tokens >= reserve:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None, reserve: float = 0) -> bool:
+        """
+        Attend que des jetons soient disponibles puis les consomme
+
+        Returns:
+            True si les jetons ont été obtenus, False si le délai est dépassé
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens - tokens >= reserve:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens + reserve - self._tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """Vide le seau pour suspendre les appels pendant `seconds` (ex: Retry-After)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """Définit la priorité des appels sortants effectués dans ce contexte"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority(default: str = PRIORITY_NORMAL) -> str:
+    """Priorité des appels sortants du contexte courant"""
+    return _current_priority.get() or default
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Délai exponentiel avec aléa complet (full jitter) avant une nouvelle tentative"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Interprète un en-tête Retry-After (secondes ou date HTTP)
+
+    Returns:
+        Le délai en secondes, ou None si l'en-tête est absent ou invalide
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -1,53 +1,604 @@
 """
 Service pour l'API TMDB avec cache et gestion d'erreurs
 """
+import atexit
+import contextvars
+import logging
+import pickle
+import random
 import requests
+import sys
+import threading
 import time
-from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Tuple, Callable, List
 from app.config.settings import get_config
+from app.services.cache_backends import CacheBackend, create_l2_backend
+from app.services.cache_snapshot import CacheSnapshot, SnapshotEntry, open_snapshot, write_snapshot
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.dependencies import record_dependency, mark_uncacheable
+from app.services.movie_store import MovieStore
+from app.services.projection import MovieSummary, project_movie_list, build_movie_detail
+from app.services.rate_limit import (
+    TokenBucket, PRIORITY_LOW, PRIORITY_NORMAL, backoff_delay, current_priority,
+    parse_retry_after, request_priority
+)
 
 config = get_config()
+logger = logging.getLogger(__name__)
+
+# Catégories TMDB exposées par l'application (endpoint movie/<catégorie>)
+MOVIE_CATEGORIES = {
+    "now_playing": "Films en Salle",
+    "popular": "Films Populaires",
+    "top_rated": "Films les Mieux Notés",
+    "upcoming": "Films à Venir"
+}
+
+# Réponses TMDB transitoires qui justifient une nouvelle tentative
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+
+# Messages d'erreur renvoyés aux routes
+ERROR_INVALID_KEY = "Clé API invalide"
+ERROR_NOT_FOUND = "Ressource non trouvée"
+ERROR_TOO_MANY_REQUESTS = "Trop de requêtes - veuillez patienter"
+# Seau à jetons local vide : l'appel n'a pas été envoyé à TMDB
+ERROR_RATE_LIMITED = "Trop de requêtes en attente - veuillez patienter"
+ERROR_UNAVAILABLE = "Service temporairement indisponible"
+ERROR_TIMEOUT = "Timeout - service trop lent"
+ERROR_CONNECTION = "Erreur de connexion"
+ERROR_UNEXPECTED = "Erreur inattendue"
+
+# Erreurs signalant un service amont défaillant (comptées par les disjoncteurs),
+# dont un 429 persistant après les nouvelles tentatives et une réponse illisible
+UPSTREAM_FAILURE_ERRORS = (
+    ERROR_UNAVAILABLE, ERROR_TIMEOUT, ERROR_CONNECTION, ERROR_TOO_MANY_REQUESTS, ERROR_UNEXPECTED
+)
+
+# Transformation appliquée aux données TMDB avant leur mise en cache
+Transform = Callable[[Dict[Any, Any]], Dict[Any, Any]]
+
+def _estimate_size(value: Any) -> int:
+    """Estime l'empreinte mémoire approximative d'une valeur (en octets)"""
+    size = 0
+    seen = set()
+    stack = [value]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, '__slots__'):
+            stack.extend(getattr(obj, slot, None) for slot in obj.__slots__)
+
+    return size
+
 
 class TMDBCache:
-    """Cache simple en mémoire pour les données TMDB"""
-    def __init__(self):
-        self._cache = {}
+    """
+    Cache LRU en mémoire pour les données TMDB
+
+    Le cache est borné en nombre d'entrées et en taille approximative : les
+    entrées les moins récemment utilisées sont évincées en O(1). Les entrées
+    expirées sont purgées périodiquement lors des accès, même si leur clé
+    n'est plus jamais relue.
+
+    Un backend L2 partagé entre les workers peut être placé derrière ce cache :
+    les écritures y sont propagées et les absences en mémoire y sont recherchées.
+
+    Avec un délai de grâce, une entrée expirée n'est plus servie normalement
+    mais reste disponible via peek() comme dernière valeur connue, par exemple
+    quand l'API TMDB est indisponible.
+
+    Un cache suivi (tracked) enregistre la version des entrées lues dans le
+    contexte courant, pour le cache des pages (voir dependencies).
+    """
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 sweep_interval: Optional[float] = None, l2: Optional[CacheBackend] = None,
+                 grace: float = 0, tracked: bool = False):
+        self.max_entries = max_entries if max_entries is not None else config.CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else config.CACHE_MAX_BYTES
+        self.sweep_interval = sweep_interval if sweep_interval is not None else config.CACHE_SWEEP_INTERVAL
+        self.l2 = l2
+        self.grace = grace
+        self.tracked = tracked
+        self._snapshot: Optional[CacheSnapshot] = None
+
+        self._cache = OrderedDict()
         self._timestamps = {}
+        self._ttls = {}
+        self._hard_ttls = {}
+        self._sizes = {}
+        self._total_bytes = 0
+        self._last_write = 0.0
+        self._last_sweep = time.time()
+        self._lock = threading.RLock()
+
+        # Compteurs
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.l2_hits = 0
+        self.l2_errors = 0
+        self.snapshot_hits = 0
 
     def get(self, key: str) -> Optional[Dict[Any, Any]]:
         """Récupère une valeur du cache si elle n'est pas expirée"""
-        if key not in self._cache:
-            return None
+        entry = self._lookup(key, allow_stale=False)
+        return entry[0] if entry else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[Dict[Any, Any], bool]]:
+        """
+        Récupère une valeur du cache et son état de fraîcheur
+
+        Une entrée dont la durée de validité (soft TTL) est dépassée reste
+        disponible comme valeur périmée jusqu'à son expiration définitive
+        (hard TTL).
+
+        Returns:
+            Tuple[valeur, périmée] ou None si la clé est absente ou expirée
+        """
+        return self._lookup(key, allow_stale=True)
+
+    def contains(self, key: str) -> bool:
+        """
+        Indique si une valeur, même périmée, peut être servie sans appel à TMDB
+
+        Le snapshot et le cache L2 sont consultés (l'entrée trouvée est
+        chargée en mémoire) ; ni les compteurs ni les dépendances ne changent.
+        """
+        with self._lock:
+            in_memory = key in self._cache
+        if not in_memory and self._snapshot is not None:
+            in_memory = self._load_from_snapshot(key, count_hit=False)
+        if not in_memory and self.l2 is not None:
+            self._load_from_l2(key, count_hit=False)
+
+        with self._lock:
+            return key in self._cache and time.time() - self._timestamps[key] <= self._hard_ttls[key]
+
+    def _lookup(self, key: str, allow_stale: bool) -> Optional[Tuple[Dict[Any, Any], bool]]:
+        with self._lock:
+            self._maybe_sweep()
+            in_memory = key in self._cache
+
+        # Absent du L1 : chercher dans le snapshot puis le L2 hors du verrou (entrée/sortie)
+        if not in_memory and self._snapshot is not None:
+            in_memory = self._load_from_snapshot(key)
+        if not in_memory and self.l2 is not None:
+            self._load_from_l2(key)
+
+        with self._lock:
+            if key not in self._cache:
+                self.misses += 1
+                return None
+
+            now = time.time()
+            if self._is_expired(key, now):
+                # Cache expiré
+                self._delete(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            if now - self._timestamps[key] > self._hard_ttls[key]:
+                # Expiré mais conservé pendant le délai de grâce (voir peek)
+                self.misses += 1
+                return None
+
+            is_stale = now - self._timestamps[key] > self._ttls[key]
+            if is_stale and not allow_stale:
+                self.misses += 1
+                return None
+
+            self._cache.move_to_end(key)
+            self.hits += 1
+            if is_stale:
+                self.stale_hits += 1
+            if self.tracked:
+                # Une valeur périmée va être rafraîchie : elle ne peut pas être réutilisée
+                record_dependency(key, None if is_stale else self._timestamps[key])
+            return self._cache[key], is_stale
+
+    def version(self, key: str) -> Optional[float]:
+        """
+        Version (date d'écriture) d'une entrée fraîche du cache mémoire
+
+        Les dates d'écriture sont strictement croissantes et suivent l'entrée
+        dans le cache L2 et les snapshots : tous les workers qui partagent
+        une entrée lui attribuent la même version.
+
+        Returns:
+            La version, ou None si la clé est absente, périmée ou expirée
+        """
+        with self._lock:
+            if key not in self._cache:
+                return None
+            timestamp = self._timestamps[key]
+            if time.time() - timestamp > self._ttls[key]:
+                return None
+            return timestamp
+
+    def set(self, key: str, value: Dict[Any, Any], ttl: Optional[float] = None,
+            hard_ttl: Optional[float] = None) -> None:
+        """
+        Ajoute une valeur au cache en évinçant les entrées les plus anciennes si besoin
+
+        Args:
+            key: Clé de cache
+            value: Valeur à mettre en cache
+            ttl: Durée de validité en secondes (CACHE_TIMEOUT par défaut)
+            hard_ttl: Durée pendant laquelle la valeur peut encore être servie
+                périmée (égale à ttl par défaut)
+        """
+        ttl = ttl if ttl is not None else config.CACHE_TIMEOUT
+        hard_ttl = max(hard_ttl or 0, ttl)
+        with self._lock:
+            # Dates d'écriture strictement croissantes : elles servent de version (voir version)
+            timestamp = max(time.time(), self._last_write + 1e-6)
+            self._last_write = timestamp
+
+        self._store(key, value, timestamp, ttl, hard_ttl)
+
+        if self._snapshot is not None:
+            self._snapshot.discard(key)
+
+        if self.l2 is not None:
+            try:
+                data = pickle.dumps((value, timestamp, ttl, hard_ttl), protocol=pickle.HIGHEST_PROTOCOL)
+                self.l2.set(key, data, hard_ttl + self.grace)
+            except Exception as exc:
+                self.l2_errors += 1
+                logger.warning("Écriture dans le cache L2 impossible: %s", exc)
+
+    def _store(self, key: str, value: Dict[Any, Any], timestamp: float, ttl: float, hard_ttl: float) -> None:
+        """Enregistre une entrée dans le cache mémoire (L1)"""
+        size = _estimate_size(value)
+
+        with self._lock:
+            if key in self._cache:
+                self._delete(key)
+
+            # Une valeur plus grosse que le budget total n'est jamais mise en cache
+            if size > self.max_bytes:
+                return
+
+            self._cache[key] = value
+            self._timestamps[key] = timestamp
+            self._ttls[key] = ttl
+            self._hard_ttls[key] = hard_ttl
+            self._sizes[key] = size
+            self._total_bytes += size
+
+            while self._cache and (len(self._cache) > self.max_entries
+                                   or self._total_bytes > self.max_bytes):
+                oldest_key = next(iter(self._cache))
+                self._delete(oldest_key)
+                self.evictions += 1
 
-        if time.time() - self._timestamps[key] > config.CACHE_TIMEOUT:
-            # Cache expiré
-            del self._cache[key]
-            del self._timestamps[key]
-            return None
+            self._maybe_sweep()
 
-        return self._cache[key]
+    def _load_from_l2(self, key: str, count_hit: bool = True) -> None:
+        """Promeut une entrée du cache L2 vers le cache mémoire"""
+        try:
+            data = self.l2.get(key)
+            if data is None:
+                return
+            value, timestamp, ttl, hard_ttl = pickle.loads(data)
+        except Exception as exc:
+            self.l2_errors += 1
+            logger.warning("Lecture dans le cache L2 impossible: %s", exc)
+            return
+
+        if time.time() - timestamp > hard_ttl + self.grace:
+            return
+
+        self._store(key, value, timestamp, ttl, hard_ttl)
+        if count_hit:
+            self.l2_hits += 1
+
+    def _load_from_snapshot(self, key: str, count_hit: bool = True) -> bool:
+        """Charge à la demande une entrée du snapshot de démarrage"""
+        try:
+            entry = self._snapshot.pop(key)
+        except Exception as exc:
+            logger.warning("Lecture du snapshot de cache impossible: %s", exc)
+            return False
+
+        if entry is None:
+            return False
+
+        value, timestamp, ttl, hard_ttl = entry
+        self._store(key, value, timestamp, ttl, hard_ttl)
+        if count_hit:
+            self.snapshot_hits += 1
+        return True
+
+    def attach_snapshot(self, snapshot: CacheSnapshot) -> None:
+        """Rend les entrées d'un snapshot disponibles, chargées à la demande"""
+        with self._lock:
+            self._snapshot = snapshot
+
+    def export_entries(self) -> List[SnapshotEntry]:
+        """
+        Exporte les entrées non expirées pour un snapshot
+
+        Les entrées du snapshot de démarrage jamais relues sont conservées
+        telles quelles, sans être désérialisées.
+        """
+        now = time.time()
+        with self._lock:
+            items = [
+                (key, self._cache[key], self._timestamps[key], self._ttls[key], self._hard_ttls[key])
+                for key in self._cache
+                if not self._is_expired(key, now)
+            ]
+            snapshot = self._snapshot
+
+        entries = []
+        for key, value, timestamp, ttl, hard_ttl in items:
+            try:
+                payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                continue
+            entries.append((key, timestamp, ttl, hard_ttl, payload))
+
+        if snapshot is not None:
+            exported = {entry[0] for entry in entries}
+            entries.extend(entry for entry in snapshot.remaining_entries() if entry[0] not in exported)
 
-    def set(self, key: str, value: Dict[Any, Any]) -> None:
-        """Ajoute une valeur au cache"""
-        self._cache[key] = value
-        self._timestamps[key] = time.time()
+        return entries
 
     def clear(self) -> None:
-        """Vide le cache"""
-        self._cache.clear()
-        self._timestamps.clear()
+        """Vide le cache (mémoire et L2)"""
+        if self.l2 is not None:
+            try:
+                self.l2.clear()
+            except Exception as exc:
+                self.l2_errors += 1
+                logger.warning("Vidage du cache L2 impossible: %s", exc)
+
+        with self._lock:
+            self._snapshot = None
+            self._cache.clear()
+            self._timestamps.clear()
+            self._ttls.clear()
+            self._hard_ttls.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du cache"""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "l2_backend": type(self.l2).__name__ if self.l2 is not None else None,
+                "l2_hits": self.l2_hits,
+                "l2_errors": self.l2_errors,
+                "snapshot_hits": self.snapshot_hits
+            }
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def peek(self, key: str) -> Optional[Dict[Any, Any]]:
+        """
+        Retourne la dernière valeur connue d'une clé, même expirée
+
+        Seul le cache mémoire est consulté et les compteurs ne sont pas modifiés.
+        """
+        with self._lock:
+            if key not in self._cache or self._is_expired(key, time.time()):
+                return None
+            return self._cache[key]
+
+    def _is_expired(self, key: str, now: float) -> bool:
+        return now - self._timestamps[key] > self._hard_ttls[key] + self.grace
+
+    def _delete(self, key: str) -> None:
+        del self._cache[key]
+        del self._timestamps[key]
+        del self._ttls[key]
+        del self._hard_ttls[key]
+        self._total_bytes -= self._sizes.pop(key)
+
+    def _maybe_sweep(self) -> None:
+        """Purge les entrées expirées au plus une fois par intervalle (coût amorti)"""
+        now = time.time()
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+
+        expired = [key for key in self._cache if self._is_expired(key, now)]
+        for key in expired:
+            self._delete(key)
+        self.expirations += len(expired)
+
+
+class SingleFlight:
+    """
+    Déduplication des appels concurrents portant sur une même clé
+
+    Le premier appelant exécute la fonction, les appelants concurrents
+    attendent et reçoivent le même résultat (ou la même exception).
+    """
+
+    class _Call:
+        __slots__ = ('event', 'result', 'exception')
+
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.exception = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Exécute fn pour la clé, ou attend le résultat d'un appel déjà en cours"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = self._Call()
+                is_leader = True
+            else:
+                self.coalesced += 1
+                is_leader = False
+
+        if not is_leader:
+            call.event.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.exception = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
 
 class TMDBService:
     """Service pour interagir avec l'API TMDB"""
 
     def __init__(self):
-        self.cache = TMDBCache()
+        self.cache = TMDBCache(l2=create_l2_backend(config), grace=config.CACHE_STALE_IF_ERROR, tracked=True)
+        # Cache négatif de courte durée pour les ressources inexistantes (404)
+        self.negative_cache = TMDBCache(max_entries=config.NEGATIVE_CACHE_MAX_ENTRIES)
+        # Films stockés une seule fois, les listes ne gardent que leurs identifiants
+        self.movie_store = MovieStore(
+            self.cache, lambda: self._ttl_for('movie_summary'), config.CACHE_HARD_TTL_FACTOR
+        )
         config.validate()  # Valider la configuration au démarrage
+        self._adapter = HTTPAdapter(
+            pool_connections=config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=config.HTTP_POOL_MAXSIZE,
+            pool_block=config.HTTP_POOL_BLOCK
+        )
+        self.session = self._build_session()
+
+        # Cadence des appels sortants : le quota TMDB est partagé entre les workers
+        self._rate_limiter = TokenBucket(
+            rate=config.TMDB_RATE_LIMIT / max(1, config.TMDB_RATE_LIMIT_WORKERS)
+        )
+        self.retries = 0
+        self.rate_limited = 0
+
+        # Un disjoncteur par famille d'endpoints
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self.short_circuited = 0
+        self.last_good_served = 0
+
+        # Rafraîchissement en arrière-plan des entrées périmées (stale-while-revalidate)
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=config.CACHE_REFRESH_WORKERS,
+            thread_name_prefix='tmdb-refresh'
+        )
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.background_refreshes = 0
+
+        # Une seule requête TMDB en vol par clé de cache
+        self._inflight = SingleFlight()
+
+        # Appels indépendants exécutés en parallèle par les routes (fan_out)
+        self._fanout_executor = ThreadPoolExecutor(
+            max_workers=config.FANOUT_WORKERS,
+            thread_name_prefix='tmdb-fanout'
+        )
+
+        # Snapshot du cache : rechargé au démarrage puis sauvegardé périodiquement
+        self._snapshot_stop = threading.Event()
+        if config.CACHE_SNAPSHOT_PATH:
+            self.load_snapshot(config.CACHE_SNAPSHOT_PATH)
+            self._start_snapshot_thread(config.CACHE_SNAPSHOT_PATH, config.CACHE_SNAPSHOT_INTERVAL)
+
+    def _build_session(self) -> requests.Session:
+        """
+        Crée une session HTTP partagée entre les threads
+
+        Les connexions TCP/TLS vers TMDB restent ouvertes (keep-alive) et sont
+        réutilisées d'une requête à l'autre au lieu d'être renégociées.
+        """
+        session = requests.Session()
+        session.mount('https://', self._adapter)
+        session.mount('http://', self._adapter)
+        return session
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du pool de connexions HTTP
+
+        Returns:
+            Dictionnaire avec les connexions ouvertes, le nombre de requêtes
+            et le taux de réutilisation des connexions
+        """
+        pools = self._adapter.poolmanager.pools
+        open_connections = 0
+        in_use = 0
+        new_connections = 0
+        total_requests = 0
+
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            idle = [conn for conn in list(pool.pool.queue) if conn is not None]
+            open_connections += len(idle)
+            in_use += max(0, pool.pool.maxsize - pool.pool.qsize())
+            new_connections += pool.num_connections
+            total_requests += pool.num_requests
+
+        reuse_ratio = 0.0
+        if total_requests:
+            reuse_ratio = max(0.0, 1 - new_connections / total_requests)
+
+        return {
+            "hosts": len(pools),
+            "open_connections": open_connections + in_use,
+            "idle_connections": open_connections,
+            "new_connections": new_connections,
+            "requests": total_requests,
+            "reuse_ratio": round(reuse_ratio, 3)
+        }
 
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
         """
         Effectue une requête à l'API TMDB avec gestion d'erreurs
 
+        Les appels sont cadencés par un seau à jetons partagé entre les threads,
+        en gardant une réserve de jetons pour les appels les plus prioritaires.
+        Les réponses 429 et 502/503/504 sont retentées avec un délai exponentiel
+        aléatoire qui respecte l'en-tête Retry-After.
+
         Returns:
             Tuple[data, error_message]
         """
@@ -56,151 +607,461 @@ class TMDBService:
         params['language'] = 'fr-FR'
 
         url = f"{config.TMDB_BASE_URL}/{endpoint}"
+        reserve = config.TMDB_PRIORITY_RESERVES.get(current_priority(), 0) * self._rate_limiter.capacity
 
-        try:
-            response = requests.get(url, params=params, timeout=config.REQUEST_TIMEOUT)
+        for attempt in range(config.TMDB_MAX_RETRIES + 1):
+            if not self._rate_limiter.acquire(timeout=config.TMDB_RATE_LIMIT_TIMEOUT, reserve=reserve):
+                self.rate_limited += 1
+                return None, ERROR_RATE_LIMITED
+
+            try:
+                response = self.session.get(
+                    url, params=params,
+                    timeout=(config.REQUEST_CONNECT_TIMEOUT, config.REQUEST_TIMEOUT)
+                )
+            except requests.exceptions.Timeout:
+                return None, ERROR_TIMEOUT
+            except requests.exceptions.ConnectionError:
+                return None, ERROR_CONNECTION
+            except Exception:
+                return None, ERROR_UNEXPECTED
+
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == config.TMDB_MAX_RETRIES:
+                break
 
+            delay = backoff_delay(attempt, config.TMDB_RETRY_BASE_DELAY, config.TMDB_RETRY_MAX_DELAY)
+            if response.status_code == 429:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    if retry_after > config.TMDB_RETRY_MAX_DELAY:
+                        # Attente trop longue pour un utilisateur : abandonner
+                        break
+                    delay = max(delay, retry_after)
+                # Suspendre tous les appels du worker, pas seulement celui-ci
+                self._rate_limiter.penalize(delay)
+            else:
+                time.sleep(delay)
+            self.retries += 1
+
+        return self._parse_response(response)
+
+    @staticmethod
+    def _parse_response(response: requests.Response) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Convertit une réponse TMDB en Tuple[data, error_message]"""
+        try:
             if response.status_code == 200:
                 return response.json(), None
             elif response.status_code == 401:
-                return None, "Clé API invalide"
+                return None, ERROR_INVALID_KEY
             elif response.status_code == 404:
-                return None, "Ressource non trouvée"
+                return None, ERROR_NOT_FOUND
             elif response.status_code == 429:
-                return None, "Trop de requêtes - veuillez patienter"
+                return None, ERROR_TOO_MANY_REQUESTS
             else:
-                return None, "Service temporairement indisponible"
-
-        except requests.exceptions.Timeout:
-            return None, "Timeout - service trop lent"
-        except requests.exceptions.ConnectionError:
-            return None, "Erreur de connexion"
+                return None, ERROR_UNAVAILABLE
         except Exception:
-            return None, "Erreur inattendue"
+            return None, ERROR_UNEXPECTED
 
-    def get_popular_movies(self, page: int = 1) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
-        """Récupère les films populaires"""
-        cache_key = f"popular_movies_page_{page}"
+    def _ttl_for(self, family: str) -> float:
+        """
+        Calcule la durée de cache d'une famille d'endpoints
 
-        # Vérifier le cache
-        cached_data = self.cache.get(cache_key)
-        if cached_data:
-            return cached_data, None
+        Un aléa de ±CACHE_TTL_JITTER est appliqué pour que les clés écrites
+        ensemble n'expirent pas toutes à la même seconde.
+        """
+        ttl = config.CACHE_TTL_POLICIES.get(family, config.CACHE_TIMEOUT)
+        jitter = ttl * config.CACHE_TTL_JITTER
+        return ttl + random.uniform(-jitter, jitter)
 
-        # Faire la requête API
-        data, error = self._make_request("movie/popular", {"page": page})
+    def _cached_request(self, cache_key: str, family: str, endpoint: str, params: Dict[str, Any],
+                        transform: Optional[Transform] = None
+                        ) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """
+        Récupère une ressource depuis le cache ou, à défaut, depuis l'API TMDB
 
-        if data:
-            # Limiter le nombre total de pages
-            if 'total_pages' in data:
-                data['total_pages'] = min(data['total_pages'], 500)
+        Args:
+            cache_key: Clé de cache de la ressource
+            family: Famille d'endpoints déterminant la durée de cache
+            endpoint: Endpoint TMDB à appeler si la ressource n'est pas en cache
+            params: Paramètres de la requête
+            transform: Transformation appliquée aux données avant leur mise en cache
 
-            # Mettre en cache
-            self.cache.set(cache_key, data)
+        Returns:
+            Tuple[data, error_message]
+        """
+        # Vérifier le cache, une valeur périmée est servie immédiatement
+        entry = self.cache.get_entry(cache_key)
+        if entry is not None:
+            cached_data, is_stale = entry
+            if is_stale:
+                self._schedule_refresh(cache_key, family, endpoint, params, transform)
+            return cached_data, None
+
+        # Ressource connue comme inexistante
+        not_found_error = self.negative_cache.get(cache_key)
+        if not_found_error is not None:
+            mark_uncacheable()
+            return None, not_found_error
 
+        data, error = self._inflight.do(
+            cache_key,
+            lambda: self._fetch_and_store(cache_key, family, endpoint, params, transform)
+        )
+        if error is None:
+            record_dependency(cache_key, self.cache.version(cache_key))
+        else:
+            mark_uncacheable()
         return data, error
 
-    def search_movies(self, query: str, page: int = 1) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
-        """Recherche des films"""
-        cache_key = f"search_{query}_{page}"
+    def _fetch_and_store(self, cache_key: str, family: str, endpoint: str, params: Dict[str, Any],
+                         transform: Optional[Transform] = None
+                         ) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Interroge l'API TMDB et met le résultat en cache"""
+        # Disjoncteur ouvert : échouer immédiatement sans attendre le timeout
+        breaker = self._breaker_for(family)
+        if not breaker.allow_request():
+            self.short_circuited += 1
+            return self._last_good_or_error(cache_key, ERROR_UNAVAILABLE)
 
-        # Vérifier le cache
-        cached_data = self.cache.get(cache_key)
-        if cached_data:
-            return cached_data, None
+        # Faire la requête API, avec la priorité du contexte (ex: arrière-plan)
+        # ou à défaut celle de la famille d'endpoints
+        priority = current_priority(config.TMDB_ENDPOINT_PRIORITIES.get(family, PRIORITY_NORMAL))
+        with request_priority(priority):
+            data, error = self._make_request(endpoint, dict(params))
 
-        # Faire la requête API
-        data, error = self._make_request("search/movie", {
-            "query": query,
-            "page": page
-        })
+        if error == ERROR_RATE_LIMITED:
+            # Aucune réponse de TMDB : ni succès ni échec pour le disjoncteur
+            breaker.record_skipped()
+            return data, error
+        if error in UPSTREAM_FAILURE_ERRORS:
+            breaker.record_failure()
+            return self._last_good_or_error(cache_key, error)
+        breaker.record_success()
 
         if data:
-            # Mettre en cache
-            self.cache.set(cache_key, data)
+            if transform:
+                data = transform(data)
+
+            # Mettre en cache selon la politique de la famille d'endpoints
+            ttl = self._ttl_for(family)
+            self.cache.set(cache_key, data, ttl=ttl, hard_ttl=ttl * config.CACHE_HARD_TTL_FACTOR)
+        elif error == ERROR_NOT_FOUND:
+            self.negative_cache.set(cache_key, error, ttl=config.NEGATIVE_CACHE_TTL)
 
         return data, error
 
-    def get_genres(self) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
-        """Récupère la liste des genres (mise en cache longue durée)"""
-        cache_key = "movie_genres"
+    def _last_good_or_error(self, cache_key: str, error: str) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Sert la dernière valeur connue d'une clé si TMDB est indisponible"""
+        last_good = self.cache.peek(cache_key)
+        if last_good is not None:
+            self.last_good_served += 1
+            mark_uncacheable()
+            return last_good, None
+        return None, error
 
-        # Vérifier le cache
-        cached_data = self.cache.get(cache_key)
-        if cached_data:
-            return cached_data, None
+    def _breaker_for(self, family: str) -> CircuitBreaker:
+        """Retourne le disjoncteur d'une famille d'endpoints"""
+        with self._breakers_lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                breaker = self._breakers[family] = CircuitBreaker(
+                    failure_threshold=config.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                    reset_timeout=config.CIRCUIT_BREAKER_RESET_TIMEOUT
+                )
+            return breaker
 
-        # Faire la requête API
-        data, error = self._make_request("genre/movie/list", {})
+    def _schedule_refresh(self, cache_key: str, family: str, endpoint: str, params: Dict[str, Any],
+                          transform: Optional[Transform] = None) -> None:
+        """Planifie le rafraîchissement d'une entrée périmée (une seule fois par clé)"""
+        with self._refresh_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
 
-        if data:
-            # Mettre en cache avec une durée plus longue pour les genres
-            self.cache.set(cache_key, data)
+        def refresh():
+            data = None
+            try:
+                with request_priority(PRIORITY_LOW):
+                    data, _ = self._inflight.do(
+                        cache_key,
+                        lambda: self._fetch_and_store(cache_key, family, endpoint, params, transform)
+                    )
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(cache_key)
+                    if data:
+                        self.background_refreshes += 1
 
-        return data, error
+        try:
+            self._refresh_executor.submit(refresh)
+        except RuntimeError:
+            # Exécuteur arrêté (fin du processus) : la prochaine requête rafraîchira
+            with self._refresh_lock:
+                self._refreshing.discard(cache_key)
 
-    def discover_movies_by_genre(self, genre_id: int, page: int = 1) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
-        """Découvre des films par genre"""
-        cache_key = f"discover_genre_{genre_id}_page_{page}"
+    def fan_out(self, **calls: Callable[[], Any]) -> Dict[str, Any]:
+        """
+        Exécute des appels indépendants en parallèle
 
-        # Vérifier le cache
-        cached_data = self.cache.get(cache_key)
-        if cached_data:
-            return cached_data, None
+        La latence totale est celle de l'appel le plus lent au lieu de la
+        somme des latences. Le dernier appel s'exécute dans le thread courant.
+        Les appels ne doivent pas eux-mêmes utiliser fan_out.
 
-        # Faire la requête API
-        data, error = self._make_request("discover/movie", {
-            "with_genres": genre_id,
-            "page": page
-        })
+        Example:
+            results = tmdb_service.fan_out(
+                movies=lambda: tmdb_service.get_popular_movies(page),
+                genres=tmdb_service.get_genres
+            )
 
-        if data:
-            # Limiter le nombre total de pages
-            if 'total_pages' in data:
-                data['total_pages'] = min(data['total_pages'], 500)
+        Returns:
+            Dictionnaire nom -> résultat de l'appel
+        """
+        names = list(calls)
+        if not names:
+            return {}
 
-            # Mettre en cache
-            self.cache.set(cache_key, data)
+        futures = {name: self.submit(calls[name]) for name in names[:-1]}
+        results = {names[-1]: calls[names[-1]]()}
+        for name, future in futures.items():
+            results[name] = future.result()
 
-        return data, error
+        return {name: results[name] for name in names}
 
-    def get_movie_details(self, movie_id: int) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
-        """Récupère les détails complets d'un film"""
-        cache_key = f"movie_details_{movie_id}"
+    def submit(self, call: Callable[[], Any]) -> Future:
+        """Exécute un appel dans le pool de fan_out, avec le contexte courant (dépendances suivies)"""
+        return self._fanout_executor.submit(contextvars.copy_context().run, call)
 
-        # Vérifier le cache
-        cached_data = self.cache.get(cache_key)
-        if cached_data:
-            return cached_data, None
+    def load_snapshot(self, path: str) -> int:
+        """
+        Rattache au cache le snapshot enregistré sur disque
 
-        # Faire la requête API avec append_to_response pour récupérer plus de données
-        data, error = self._make_request(f"movie/{movie_id}", {
-            "append_to_response": "credits,videos,similar,recommendations"
-        })
+        Le fichier est mappé en mémoire et seules les entrées relues sont
+        désérialisées, avec leur durée de validité restante.
 
-        if data:
-            # Mettre en cache
-            self.cache.set(cache_key, data)
+        Returns:
+            Le nombre d'entrées encore valides dans le snapshot
+        """
+        snapshot = open_snapshot(path)
+        if snapshot is None:
+            return 0
 
-        return data, error
+        self.cache.attach_snapshot(snapshot)
+        return len(snapshot)
 
-    def get_movie_credits(self, movie_id: int) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
-        """Récupère les crédits d'un film (acteurs, équipe technique)"""
-        cache_key = f"movie_credits_{movie_id}"
+    def save_snapshot(self, path: str) -> int:
+        """
+        Enregistre le contenu du cache dans un snapshot binaire
 
-        # Vérifier le cache
-        cached_data = self.cache.get(cache_key)
-        if cached_data:
-            return cached_data, None
+        Returns:
+            Le nombre d'entrées enregistrées
+        """
+        try:
+            return write_snapshot(path, self.cache.export_entries())
+        except OSError as exc:
+            logger.warning("Sauvegarde du snapshot de cache impossible: %s", exc)
+            return 0
 
-        # Faire la requête API
-        data, error = self._make_request(f"movie/{movie_id}/credits", {})
+    def _start_snapshot_thread(self, path: str, interval: float) -> None:
+        """Démarre la sauvegarde périodique du cache et sa sauvegarde à l'arrêt"""
+        def run():
+            while not self._snapshot_stop.wait(interval):
+                self.save_snapshot(path)
 
-        if data:
-            # Mettre en cache
-            self.cache.set(cache_key, data)
+        thread = threading.Thread(target=run, name='tmdb-cache-snapshot', daemon=True)
+        thread.start()
+        atexit.register(self.save_snapshot, path)
 
-        return data, error
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques du service (cache, pool HTTP, rafraîchissements)"""
+        return {
+            "cache": self.cache.stats(),
+            "pool": self.get_pool_stats(),
+            "background_refreshes": self.background_refreshes,
+            "coalesced_requests": self._inflight.coalesced,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "short_circuited": self.short_circuited,
+            "last_good_served": self.last_good_served,
+            "negative_cache": self.negative_cache.stats(),
+            "circuit_breakers": {family: breaker.stats() for family, breaker in list(self._breakers.items())}
+        }
+
+    @staticmethod
+    def _limit_total_pages(data: Dict[Any, Any]) -> Dict[Any, Any]:
+        """Limite le nombre total de pages à celui accepté par TMDB"""
+        if 'total_pages' in data:
+            data['total_pages'] = min(data['total_pages'], 500)
+        return data
+
+    def _normalize_list(self, data: Dict[Any, Any]) -> Dict[Any, Any]:
+        """Enregistre les films d'une liste dans le magasin et n'en garde que les identifiants"""
+        normalized = project_movie_list(data)
+        normalized['movie_ids'] = tuple(
+            self.movie_store.upsert(movie).id for movie in normalized.pop('results')
+            if movie.id is not None
+        )
+        return normalized
+
+    def _normalize_paginated_list(self, data: Dict[Any, Any]) -> Dict[Any, Any]:
+        """Normalise une liste paginée en limitant son nombre de pages"""
+        return self._normalize_list(self._limit_total_pages(data))
+
+    def _build_details(self, data: Dict[Any, Any]) -> Dict[Any, Any]:
+        """
+        Construit le modèle de vue mis en cache pour la page de détail
+
+        Le résumé du film est mis à jour dans le magasin et les films
+        similaires n'y sont référencés que par leurs identifiants.
+        """
+        self.movie_store.upsert(MovieSummary.from_details(data))
+        detail = build_movie_detail(data)
+        detail['similar_ids'] = self.movie_store.upsert_many(detail.pop('similar'))
+        return detail
+
+    def _cached_list(self, cache_key: str, family: str, endpoint: str, params: Dict[str, Any],
+                     transform: Transform) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """
+        Récupère une liste de films normalisée et la reconstitue depuis le magasin
+
+        Si des résumés ont été évincés depuis la mise en cache de la liste,
+        celle-ci est relue auprès de TMDB.
+        """
+        data, error = self._cached_request(cache_key, family, endpoint, params, transform)
+        if data is None:
+            return None, error
+
+        movies = self.movie_store.get_many(data['movie_ids'])
+        if None in movies:
+            data, error = self._inflight.do(
+                cache_key,
+                lambda: self._fetch_and_store(cache_key, family, endpoint, params, transform)
+            )
+            if data is None:
+                return None, error
+            record_dependency(cache_key, self.cache.version(cache_key))
+            movies = [movie for movie in self.movie_store.get_many(data['movie_ids']) if movie is not None]
+
+        hydrated = {key: value for key, value in data.items() if key != 'movie_ids'}
+        hydrated['results'] = movies
+        return hydrated, None
+
+    @staticmethod
+    def genres_cache_key() -> str:
+        return "movie_genres"
+
+    @staticmethod
+    def popular_cache_key(page: int) -> str:
+        return f"popular_movies_page_{page}"
+
+    @staticmethod
+    def category_cache_key(category: str, page: int) -> str:
+        if category == 'popular':
+            return TMDBService.popular_cache_key(page)
+        return f"category_{category}_page_{page}"
+
+    @staticmethod
+    def genre_cache_key(genre_id: int, page: int) -> str:
+        return f"discover_genre_{genre_id}_page_{page}"
+
+    @staticmethod
+    def details_cache_key(movie_id: int) -> str:
+        return f"movie_details_{movie_id}"
+
+    def peek_movie_list(self, cache_key: str, limit: Optional[int] = None) -> List[MovieSummary]:
+        """
+        Premiers films d'une liste déjà en mémoire, sans appel à TMDB
+
+        Utilisé avant le rendu d'une page (indications de préchargement) :
+        ni les compteurs du cache ni les dépendances de la page ne changent.
+        """
+        data = self.cache.peek(cache_key)
+        if data is None:
+            return []
+        summaries = (self.movie_store.peek(movie_id) for movie_id in data.get('movie_ids', ())[:limit])
+        return [summary for summary in summaries if summary is not None]
+
+    def get_popular_movies(self, page: int = 1) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Récupère les films populaires"""
+        return self._cached_list(
+            self.popular_cache_key(page), "popular",
+            "movie/popular", {"page": page},
+            transform=self._normalize_paginated_list
+        )
+
+    def get_movies_by_category(self, category: str, page: int = 1) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Récupère les films d'une catégorie TMDB (now_playing, top_rated, upcoming...)"""
+        if category == 'popular':
+            return self.get_popular_movies(page)
+
+        return self._cached_list(
+            self.category_cache_key(category, page), category,
+            f"movie/{category}", {"page": page},
+            transform=self._normalize_paginated_list
+        )
+
+    def search_movies(self, query: str, page: int = 1) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Recherche des films"""
+        return self._cached_list(
+            f"search_{query}_{page}", "search",
+            "search/movie", {"query": query, "page": page},
+            transform=self._normalize_list
+        )
+
+    def get_genres(self) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Récupère la liste des genres (mise en cache longue durée)"""
+        return self._cached_request(self.genres_cache_key(), "genres", "genre/movie/list", {})
+
+    def discover_movies_by_genre(self, genre_id: int, page: int = 1) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Découvre des films par genre"""
+        return self._cached_list(
+            self.genre_cache_key(genre_id, page), "discover",
+            "discover/movie", {"with_genres": genre_id, "page": page},
+            transform=self._normalize_paginated_list
+        )
+
+    def discover_movies(self, params: Dict[str, Any]) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Découvre des films selon des filtres libres (recherche avancée)"""
+        cache_key = "discover_" + "&".join(f"{key}={params[key]}" for key in sorted(params))
+        return self._cached_list(
+            cache_key, "discover",
+            "discover/movie", params,
+            transform=self._normalize_paginated_list
+        )
+
+    def get_movie_details(self, movie_id: int) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """
+        Récupère le modèle de vue de la page de détail d'un film
+
+        Returns:
+            Tuple[data, error_message] où data contient les champs du film,
+            'cast' (10 premiers acteurs), 'director', 'trailers' (3 au plus)
+            et 'similar' (6 résumés au plus)
+        """
+        # append_to_response permet de récupérer plus de données en une seule requête
+        data, error = self._cached_request(
+            self.details_cache_key(movie_id), "movie_details",
+            f"movie/{movie_id}", {"append_to_response": "credits,videos,similar"},
+            transform=self._build_details
+        )
+        if data is None:
+            return data, error
+
+        # Films similaires reconstitués depuis le magasin (les résumés évincés sont omis)
+        similar = [movie for movie in self.movie_store.get_many(data.get('similar_ids', ())) if movie is not None]
+        detail = {key: value for key, value in data.items() if key != 'similar_ids'}
+        detail['similar'] = similar
+        return detail, None
+
+    def get_movie_summary(self, movie_id: int) -> Optional[MovieSummary]:
+        """Résumé d'un film déjà connu (listes, recherche...), sans appel à TMDB"""
+        return self.movie_store.get(movie_id)
+
+    def get_movie_credits(self, movie_id: int) -> Tuple[Optional[Dict[Any, Any]], Optional[str]]:
+        """Récupère les crédits d'un film (acteurs, équipe technique)"""
+        return self._cached_request(
+            f"movie_credits_{movie_id}", "movie_credits",
+            f"movie/{movie_id}/credits", {}
+        )
 
 # Instance globale du service
 tmdb_service = TMDBService()
\ No newline at end of file
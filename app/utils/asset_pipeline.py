@@ -0,0 +1,192 @@
+"""
+Feuilles de style regroupées par type de page et CSS critique
+
+Chaque type de page (PAGE_STYLESHEETS) charge un seul fichier : main.css
+suivi des styles propres à la page, dans l'ordre de la cascade d'origine.
+Le build extrait aussi de chaque regroupement les règles du premier
+affichage (CRITICAL_CSS_SELECTORS), insérées dans la page ; la feuille
+complète est alors chargée sans bloquer le rendu.
+
+Un template choisit son type de page avec {% set page_type = '...' %}.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from flask import Flask
+from markupsafe import Markup
+from app.utils.minifier import minify_css
+
+# Regroupements écrits par le build (un fichier par type de page)
+BUNDLE_DIR = 'css/bundles'
+
+# Type de page des templates qui n'en déclarent pas
+DEFAULT_PAGE_TYPE = 'base'
+
+# Caractères pouvant suivre un préfixe de sélecteur critique (.movie ne couvre pas .movie-detail)
+_SELECTOR_BOUNDARY = frozenset(' :.[>+~#')
+
+
+def bundle_name(page_type: str) -> str:
+    return f'{BUNDLE_DIR}/{page_type}.css'
+
+
+def _existing_files(static_folder: Path, filenames: Sequence[str]) -> List[Path]:
+    """Fichiers d'un type de page présents dans le dossier statique"""
+    return [static_folder / filename for filename in filenames if (static_folder / filename).is_file()]
+
+
+def build_bundles(static_folder: Path, page_stylesheets: Dict[str, Sequence[str]]) -> Dict[str, Path]:
+    """
+    Écrit un regroupement par type de page composé de plusieurs fichiers
+
+    Un regroupement inchangé n'est pas réécrit (build incrémental).
+
+    Returns:
+        Les regroupements écrits (type de page -> chemin)
+    """
+    written = {}
+    for page_type, filenames in page_stylesheets.items():
+        paths = _existing_files(static_folder, filenames)
+        if len(paths) < 2:
+            continue
+
+        content = '\n'.join(
+            f"/* {path.relative_to(static_folder).as_posix()} */\n{path.read_text(encoding='utf-8')}"
+            for path in paths
+        )
+        target = static_folder / bundle_name(page_type)
+        if target.exists() and target.read_text(encoding='utf-8') == content:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding='utf-8')
+        written[page_type] = target
+    return written
+
+
+def split_rules(css: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Découpe du CSS minifié en règles de premier niveau
+
+    Returns:
+        Les couples (prélude, corps) ; le corps vaut None pour une instruction
+        sans bloc (@import, @charset)
+    """
+    rules = []
+    depth = 0
+    start = 0
+    body_start = 0
+    quote = None
+
+    for index, char in enumerate(css):
+        if quote:
+            if char == quote and css[index - 1] != '\\':
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if depth == 0:
+                body_start = index
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((css[start:body_start].strip(), css[body_start + 1:index]))
+                start = index + 1
+        elif char == ';' and depth == 0:
+            rules.append((css[start:index].strip(), None))
+            start = index + 1
+    return rules
+
+
+def _selector_matches(selector: str, prefixes: Sequence[str]) -> bool:
+    for prefix in prefixes:
+        if selector == prefix or (selector.startswith(prefix) and selector[len(prefix)] in _SELECTOR_BOUNDARY):
+            return True
+    return False
+
+
+def extract_critical_css(css: str, prefixes: Sequence[str]) -> str:
+    """
+    Règles du CSS minifié dont un sélecteur commence par l'un des préfixes
+
+    Les blocs @media et @supports sont conservés avec leurs règles critiques.
+    """
+    critical = []
+    for prelude, body in split_rules(css):
+        if body is None:
+            continue
+        if prelude.startswith(('@media', '@supports')):
+            inner = extract_critical_css(body, prefixes)
+            if inner:
+                critical.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@font-face'):
+            critical.append(f'{prelude}{{{body}}}')
+        elif not prelude.startswith('@'):
+            if any(_selector_matches(selector.strip(), prefixes) for selector in prelude.split(',')):
+                critical.append(f'{prelude}{{{body}}}')
+    return ''.join(critical)
+
+
+def critical_selectors(config_selectors: Dict[str, Sequence[str]], page_type: str) -> Tuple[str, ...]:
+    """Préfixes critiques d'un type de page : ceux de base puis les siens"""
+    selectors = tuple(config_selectors.get(DEFAULT_PAGE_TYPE, ()))
+    if page_type != DEFAULT_PAGE_TYPE:
+        selectors += tuple(config_selectors.get(page_type, ()))
+    return selectors
+
+
+def build_critical_css(static_folder: Path, output_dir: Path, page_stylesheets: Dict[str, Sequence[str]],
+                       config_selectors: Dict[str, Sequence[str]]) -> Dict[str, Path]:
+    """
+    Écrit le CSS critique de chaque type de page dans output_dir/<type>.css
+
+    Returns:
+        Les fichiers écrits (type de page -> chemin)
+    """
+    written = {}
+    for page_type, filenames in page_stylesheets.items():
+        selectors = critical_selectors(config_selectors, page_type)
+        paths = _existing_files(static_folder, filenames)
+        if not selectors or not paths:
+            continue
+
+        css = minify_css('\n'.join(path.read_text(encoding='utf-8') for path in paths))
+        critical = extract_critical_css(css, selectors)
+        target = output_dir / f'{page_type}.css'
+        if target.exists() and target.read_text(encoding='utf-8') == critical:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(critical, encoding='utf-8')
+        written[page_type] = target
+    return written
+
+
+def register_asset_pipeline(app: Flask, critical_dir: str) -> None:
+    """
+    Ajoute les fonctions de template page_stylesheets() et critical_css()
+
+    Sans build (flask build-assets non lancé), les fichiers sources sont
+    chargés séparément et aucun CSS critique n'est inséré.
+    """
+    page_stylesheets_config = app.config['PAGE_STYLESHEETS']
+    critical_by_page: Dict[str, Markup] = {}
+
+    def page_stylesheets(page_type: str = DEFAULT_PAGE_TYPE) -> Tuple[str, ...]:
+        """Fichiers CSS d'un type de page : le regroupement s'il a été construit"""
+        filenames = tuple(page_stylesheets_config.get(page_type) or page_stylesheets_config[DEFAULT_PAGE_TYPE])
+        if len(filenames) > 1 and bundle_name(page_type) in app.extensions.get('asset_manifest', {}):
+            return (bundle_name(page_type),)
+        return filenames
+
+    def critical_css(page_type: str = DEFAULT_PAGE_TYPE) -> Markup:
+        """CSS critique d'un type de page, vide s'il n'a pas été construit"""
+        css = critical_by_page.get(page_type)
+        if css is None or app.debug:
+            path = Path(app.static_folder, critical_dir, f'{page_type}.css')
+            try:
+                css = Markup(path.read_text(encoding='utf-8'))
+            except OSError:
+                css = Markup('')
+            critical_by_page[page_type] = css
+        return css
+
+    app.jinja_env.globals.update(page_stylesheets=page_stylesheets, critical_css=critical_css)
@@ -0,0 +1,56 @@
+"""
+Commandes CLI Flask de l'application
+"""
+import click
+from flask import current_app
+from app.services.cache_warmer import CacheWarmer
+from app.services.tmdb_service import tmdb_service
+from app.utils.static_optimization import create_optimized_static_files
+
+
+def register_cli_commands(app):
+    """Enregistre les commandes CLI pour l'application"""
+
+    @app.cli.command('cache-warm')
+    @click.option('--pages', type=int, default=None,
+                  help="Nombre de pages de films populaires à précharger")
+    @click.option('--genre-pages', type=int, default=None,
+                  help="Nombre de pages à précharger pour chaque genre")
+    @click.option('--workers', type=int, default=None,
+                  help="Nombre d'appels TMDB simultanés")
+    @click.option('--rate', type=float, default=None,
+                  help="Nombre maximum d'appels TMDB par seconde")
+    def cache_warm(pages, genre_pages, workers, rate):
+        """Préchauffe le cache TMDB partagé (genres, populaires, catégories, genres)"""
+        config = current_app.config
+        if not config.get('CACHE_L2_BACKEND'):
+            # Sans cache L2, les entrées préchauffées disparaissent avec ce processus
+            raise click.ClickException(
+                "cache-warm nécessite un cache L2 partagé avec les workers (CACHE_L2_BACKEND=sqlite ou redis)"
+            )
+
+        warmer = CacheWarmer(
+            tmdb_service,
+            workers=workers or config['CACHE_WARM_WORKERS'],
+            rate=rate if rate is not None else config['CACHE_WARM_RATE']
+        )
+
+        report = warmer.run(
+            popular_pages=pages if pages is not None else config['CACHE_WARM_POPULAR_PAGES'],
+            genre_pages=genre_pages if genre_pages is not None else config['CACHE_WARM_GENRE_PAGES']
+        )
+
+        click.echo(f"Cache préchauffé: {report['tasks']} appels en {report['duration']:.2f}s")
+        click.echo(f"  Appel moyen: {report['average_call'] * 1000:.0f} ms, "
+                   f"plus lent: {report['slowest_call'] * 1000:.0f} ms")
+        click.echo(f"  Cache: {report['cache_hits']} hits, {report['cache_misses']} misses, "
+                   f"{report['cache_entries']} entrées")
+
+        for label, error in sorted(report['errors'].items()):
+            click.echo(f"  Erreur {label}: {error}", err=True)
+
+    @app.cli.command('build-assets')
+    @click.option('--force', is_flag=True, help='Reconstruit aussi les fichiers inchangés')
+    def build_assets(force):
+        """Minifie, versionne et précompresse (.gz, .br) les ressources statiques"""
+        create_optimized_static_files(current_app, force=force)
@@ -0,0 +1,212 @@
+"""
+Compression des réponses dynamiques (gzip, brotli, zstd)
+"""
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterable, Iterator, Sequence, Tuple
+from flask import Flask, request
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard est optionnel
+    zstandard = None
+
+# Types de contenu compressés
+COMPRESSIBLE_MIMETYPES = ('text/', 'application/json', 'application/javascript')
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Encodages utilisables selon les paquets installés"""
+    encodings = ['gzip']
+    if brotli is not None:
+        encodings.append('br')
+    if zstandard is not None:
+        encodings.append('zstd')
+    return tuple(encodings)
+
+
+def negotiate_encoding(accept_encodings, preferred: Sequence[str]) -> Optional[str]:
+    """
+    Choisit l'encodage de la réponse
+
+    Args:
+        accept_encodings: En-tête Accept-Encoding analysé (request.accept_encodings)
+        preferred: Encodages configurés, par ordre de préférence
+
+    Returns:
+        Le premier encodage préféré, installé et accepté par le client, ou None
+    """
+    installed = available_encodings()
+    for encoding in preferred:
+        if encoding in installed and accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """Compresse un corps complet"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    # mtime=0 : même entrée, même sortie (ETag et mémorisation)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class StreamCompressor:
+    """
+    Compression incrémentale d'un flux
+
+    Chaque morceau est vidé immédiatement (sync flush) pour que le client
+    reçoive le début de la page sans attendre la fin du rendu.
+    """
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=level)
+        elif encoding == 'zstd':
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compresse un morceau et vide le tampon du compresseur"""
+        if self.encoding == 'br':
+            return self._compressor.process(chunk) + self._compressor.flush()
+        if self.encoding == 'zstd':
+            return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """Termine le flux compressé"""
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress_stream(chunks: Iterable[Any], compressor: StreamCompressor) -> Iterator[bytes]:
+    """Compresse un flux de réponse morceau par morceau"""
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                compressed = compressor.compress(chunk)
+                if compressed:
+                    yield compressed
+        yield compressor.finish()
+    finally:
+        # Libérer le flux d'origine (ex: contexte de stream_with_context)
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+class CompressedBodyCache:
+    """
+    Mémorisation des corps compressés, bornée en octets
+
+    Les réponses identiques (mêmes octets, même encodage, même niveau) ne
+    sont compressées qu'une fois ; la clé est une empreinte du corps.
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._bodies: 'OrderedDict[Tuple[bytes, str, int], bytes]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+
+    def compress(self, data: bytes, encoding: str, level: int) -> bytes:
+        """Retourne le corps compressé, depuis la mémoire si possible"""
+        key = (hashlib.blake2b(data, digest_size=16).digest(), encoding, level)
+
+        with self._lock:
+            compressed = self._bodies.get(key)
+            if compressed is not None:
+                self._bodies.move_to_end(key)
+                self.hits += 1
+                return compressed
+            self.misses += 1
+
+        compressed = compress(data, encoding, level)
+        if len(compressed) > self.max_bytes:
+            return compressed
+
+        with self._lock:
+            if key not in self._bodies:
+                self._bodies[key] = compressed
+                self._total_bytes += len(compressed)
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._bodies.popitem(last=False)
+                self._total_bytes -= len(evicted)
+        return compressed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._bodies),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def configure_compression(app: Flask):
+    """Compresse les réponses dynamiques selon COMPRESSION_ALGORITHMS et COMPRESSION_LEVELS"""
+    preferred = app.config['COMPRESSION_ALGORITHMS']
+    levels = app.config['COMPRESSION_LEVELS']
+    min_size = app.config['COMPRESSION_MIN_SIZE']
+    body_cache = app.extensions['compression_cache'] = CompressedBodyCache(app.config['COMPRESSION_CACHE_MAX_BYTES'])
+
+    @app.after_request
+    def compress_response(response):
+        """Compresse les réponses si possible"""
+        # Ne pas compresser les fichiers statiques gérés par Flask
+        if request.endpoint == 'static':
+            return response
+
+        # Réponse déjà compressée (ex: page servie par le cache des pages)
+        if 'Content-Encoding' in response.headers:
+            return response
+
+        if (response.status_code != 200 or response.direct_passthrough or not response.content_type
+                or not response.content_type.startswith(COMPRESSIBLE_MIMETYPES)):
+            return response
+
+        encoding = negotiate_encoding(request.accept_encodings, preferred)
+        if encoding is None:
+            return response
+        level = levels[encoding]
+
+        if response.is_streamed:
+            # Page rendue en flux : compression incrémentale, taille inconnue
+            response.response = compress_stream(response.response, StreamCompressor(encoding, level))
+            response.headers.pop('Content-Length', None)
+        else:
+            response_data = response.get_data()
+            # Compresser seulement les réponses assez grosses
+            if len(response_data) <= min_size:
+                return response
+
+            compressed = body_cache.compress(response_data, encoding, level)
+            # Seulement si la compression est bénéfique
+            if len(compressed) >= len(response_data) * 0.9:
+                return response
+            response.set_data(compressed)
+
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
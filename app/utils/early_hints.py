@@ -0,0 +1,107 @@
+"""
+Indications de préchargement des pages de films (103 Early Hints et en-têtes Link)
+
+Avant l'appel à TMDB, les feuilles de style, le script principal, la
+connexion au serveur d'images et les premières affiches (lues dans le cache
+mémoire, sans appel réseau) sont annoncés au navigateur :
+
+- en réponse 103 Early Hints si le serveur WSGI expose environ['wsgi.early_hints'] ;
+- dans l'en-tête Link de la réponse finale (repris en 103 par certains CDN).
+"""
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+from flask import Flask, current_app, g, request, url_for
+from app.services.tmdb_service import tmdb_service
+from app.utils.asset_pipeline import DEFAULT_PAGE_TYPE
+from app.utils.validators import validate_page
+
+# Type de page (voir asset_pipeline) des routes annoncées
+PAGE_TYPES = {
+    'movies.home': DEFAULT_PAGE_TYPE,
+    'movies.movies_by_genre': 'movies_by_genre',
+    'movies.movies_by_category': 'movies_by_category',
+    'movies.movie_detail': 'movie_detail',
+}
+
+
+def _list_posters(cache_key: str, limit: int) -> List[str]:
+    """Affiches des premiers films d'une liste, si elle est déjà en cache"""
+    image_base = current_app.config['TMDB_IMAGE_BASE_URL']
+    return [
+        f"{image_base}{movie.poster_path}"
+        for movie in tmdb_service.peek_movie_list(cache_key, limit)
+        if movie.poster_path
+    ]
+
+
+def _home_posters(limit: int) -> List[str]:
+    page = validate_page(request.args.get('page', 1))
+    return _list_posters(tmdb_service.popular_cache_key(page), limit)
+
+
+def _genre_posters(limit: int) -> List[str]:
+    page = validate_page(request.args.get('page', 1))
+    return _list_posters(tmdb_service.genre_cache_key(request.view_args['genre_id'], page), limit)
+
+
+def _category_posters(limit: int) -> List[str]:
+    page = validate_page(request.args.get('page', 1))
+    return _list_posters(tmdb_service.category_cache_key(request.view_args['category'], page), limit)
+
+
+def _detail_poster(limit: int) -> List[str]:
+    summary = tmdb_service.movie_store.peek(request.view_args['movie_id'])
+    if summary is None or not summary.poster_path:
+        return []
+    # Même taille que l'affiche de movie_detail.html
+    return [f"{current_app.config['TMDB_IMAGE_BASE_URL'].replace('w500', 'w780')}{summary.poster_path}"]
+
+
+POSTER_SOURCES: Dict[str, Callable[[int], List[str]]] = {
+    'movies.home': _home_posters,
+    'movies.movies_by_genre': _genre_posters,
+    'movies.movies_by_category': _category_posters,
+    'movies.movie_detail': _detail_poster,
+}
+
+
+def resource_links(endpoint: str, poster_limit: int) -> List[str]:
+    """Valeurs Link (preload / preconnect) d'une page, calculées sans appel à TMDB"""
+    page_stylesheets = current_app.jinja_env.globals['page_stylesheets']
+    links = [
+        f"<{url_for('static', filename=filename)}>; rel=preload; as=style"
+        for filename in page_stylesheets(PAGE_TYPES[endpoint])
+    ]
+    links.append(f"<{url_for('static', filename='js/main.js')}>; rel=preload; as=script")
+
+    image_url = urlsplit(current_app.config['TMDB_IMAGE_BASE_URL'])
+    links.append(f"<{image_url.scheme}://{image_url.netloc}>; rel=preconnect")
+
+    links.extend(f"<{poster}>; rel=preload; as=image" for poster in POSTER_SOURCES[endpoint](poster_limit))
+    return links
+
+
+def register_early_hints(app: Flask) -> None:
+    """Annonce les ressources des pages de films avant leur rendu (EARLY_HINTS_ENABLED)"""
+    if not app.config.get('EARLY_HINTS_ENABLED'):
+        return
+    poster_limit = app.config['EARLY_HINTS_POSTERS']
+
+    @app.before_request
+    def send_early_hints():
+        """Envoie une réponse 103 avant l'appel à TMDB si le serveur le permet"""
+        if request.endpoint not in PAGE_TYPES or request.method != 'GET':
+            return
+        links = g.early_hint_links = resource_links(request.endpoint, poster_limit)
+
+        send_hints: Optional[Callable] = request.environ.get('wsgi.early_hints')
+        if callable(send_hints):
+            send_hints([('Link', link) for link in links])
+
+    @app.after_request
+    def add_link_header(response):
+        """Reprend les indications dans l'en-tête Link de la page"""
+        links = g.get('early_hint_links')
+        if links and response.status_code == 200 and response.mimetype == 'text/html':
+            response.headers['Link'] = ', '.join(links)
+        return response
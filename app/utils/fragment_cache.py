@@ -0,0 +1,108 @@
+"""
+Cache des fragments de templates Jinja (cartes de films, menus...)
+
+Usage dans un template :
+
+    {% fragment 'movie_card', movie.id, movie.title, movie.poster_path %}
+        ... rendu coûteux ...
+    {% endfragment %}
+
+Le contenu est rendu une seule fois par combinaison de clés puis réutilisé
+par toutes les pages. Les clés doivent couvrir tout ce qui influence le rendu.
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Tuple
+from flask import Flask, has_request_context, request
+from jinja2 import nodes, Undefined
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+class FragmentCache:
+    """Cache LRU des fragments rendus"""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._fragments: 'OrderedDict[Tuple[Any, ...], Markup]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Markup]:
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._fragments.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+    def set(self, key: Tuple[Any, ...], fragment: Markup) -> None:
+        with self._lock:
+            self._fragments[key] = fragment
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fragments.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._fragments), "hits": self.hits, "misses": self.misses}
+
+
+def _freeze(value: Any) -> Any:
+    """Convertit une clé de fragment en valeur hachable"""
+    if isinstance(value, Undefined):
+        return None
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class FragmentCacheExtension(Extension):
+    """Extension Jinja ajoutant la balise {% fragment %}"""
+
+    tags = {'fragment'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentCache())
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+
+        keys = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            keys.append(parser.parse_expression())
+
+        body = parser.parse_statements(('name:endfragment',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_render_fragment', [nodes.List(keys)]), [], [], body
+        ).set_lineno(lineno)
+
+    def _render_fragment(self, keys: list, caller: Callable[[], str]) -> str:
+        # Les URL générées dépendent du préfixe de l'application (SCRIPT_NAME)
+        script_root = request.script_root if has_request_context() else ''
+        key = (script_root,) + _freeze(keys)
+
+        cache = self.environment.fragment_cache
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = caller()
+            cache.set(key, fragment)
+        return fragment
+
+
+def register_fragment_cache(app: Flask) -> None:
+    """Ajoute la balise {% fragment %} à l'environnement Jinja de l'application"""
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    app.jinja_env.fragment_cache.max_entries = app.config['FRAGMENT_CACHE_MAX_ENTRIES']
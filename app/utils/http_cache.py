@@ -0,0 +1,108 @@
+"""
+En-têtes de cache HTTP des pages HTML (ETag, Cache-Control, Surrogate-Key)
+"""
+import hashlib
+from pathlib import Path
+from typing import Optional
+from flask import Flask, g, request
+from app.services.dependencies import Dependencies
+from app.utils.static_optimization import ASSET_MANIFEST, CRITICAL_CSS_DIR
+
+
+def compute_template_version(app: Flask) -> str:
+    """
+    Empreinte du contenu des templates, calculée une fois au démarrage
+
+    Inclut le manifeste des ressources versionnées et le CSS critique : les
+    URL des CSS/JS et les styles insérés dans les pages changent avec eux.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    template_root = Path(app.root_path, app.template_folder)
+
+    for path in sorted(template_root.rglob('*.html')):
+        digest.update(str(path.relative_to(template_root)).encode())
+        digest.update(path.read_bytes())
+
+    manifest = Path(app.static_folder, ASSET_MANIFEST)
+    if manifest.is_file():
+        digest.update(manifest.read_bytes())
+
+    for path in sorted(Path(app.static_folder, CRITICAL_CSS_DIR).glob('*.css')):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+def page_etag(dependencies: Dependencies, template_version: str) -> Optional[str]:
+    """
+    ETag fort d'une page : version des templates et des entrées TMDB utilisées
+
+    Returns:
+        L'ETag, ou None si une donnée de la page n'a pas de version stable
+        (erreur TMDB, valeur périmée ou de secours)
+    """
+    versions = dependencies.versions
+    if not dependencies.cacheable or not versions or None in versions.values():
+        return None
+
+    digest = hashlib.blake2b(template_version.encode(), digest_size=16)
+    for key in sorted(versions):
+        digest.update(f"{key}={versions[key]!r};".encode())
+    return digest.hexdigest()
+
+
+def surrogate_keys(dependencies: Dependencies) -> str:
+    """Clés de purge CDN : une par entrée TMDB utilisée (ex: movie_summary_550)"""
+    return ' '.join(sorted('_'.join(key.split()) for key in dependencies.versions))
+
+
+def register_http_cache(app: Flask) -> None:
+    """
+    Ajoute les en-têtes de cache HTTP aux pages HTML
+
+    Doit être enregistré avant la compression des réponses : Flask exécute
+    les fonctions after_request dans l'ordre inverse, l'ETag tient donc
+    compte de l'encodage de la réponse.
+    """
+    template_version = compute_template_version(app)
+    policies = app.config.get('HTTP_CACHE_POLICIES', {})
+
+    @app.after_request
+    def add_page_cache_headers(response):
+        """ETag, Cache-Control par route et Surrogate-Key des pages HTML"""
+        policy = policies.get(request.endpoint)
+        if policy is None or response.mimetype != 'text/html' or request.method not in ('GET', 'HEAD'):
+            return response
+
+        dependencies = g.get('page_dependencies')
+        if response.status_code != 200 or (dependencies is not None and not dependencies.cacheable):
+            # Page d'erreur ou rendue pendant une panne TMDB : ne pas la garder
+            response.cache_control.no_cache = True
+            return response
+
+        if response.is_streamed:
+            # Page en flux : en-têtes envoyés avant ses données, ni ETag ni cache partagé
+            response.cache_control.no_cache = True
+            return response
+
+        response.cache_control.public = True
+        response.cache_control.max_age = policy['max_age']
+        response.cache_control.s_maxage = policy['s_maxage']
+        if policy.get('stale_while_revalidate'):
+            response.cache_control.stale_while_revalidate = policy['stale_while_revalidate']
+        response.vary.add('Accept-Encoding')
+
+        if dependencies is None:
+            return response
+
+        response.headers['Surrogate-Key'] = surrogate_keys(dependencies)
+
+        etag = page_etag(dependencies, template_version)
+        if etag is not None:
+            # Un ETag fort désigne une représentation : il dépend de l'encodage
+            encoding = response.headers.get('Content-Encoding')
+            response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+            response.make_conditional(request)
+
+        return response
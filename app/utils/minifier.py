@@ -0,0 +1,198 @@
+"""
+Minification CSS et JavaScript en une seule passe
+
+Le texte est découpé en lexèmes (chaînes, commentaires, espaces, ponctuation,
+mots) par un seul parcours. Les chaînes, les gabarits JS (`...`) et les
+expressions régulières littérales sont recopiés tels quels ; seuls les
+commentaires et les espaces inutiles sont supprimés.
+"""
+import re
+from typing import List
+
+# Lexèmes CSS : chaîne, commentaire, espaces, ou suite de caractères sans espace
+_CSS_TOKEN = re.compile(r'''
+    (?P<string>"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?)
+  | (?P<comment>/\*.*?(?:\*/|\Z))
+  | (?P<space>\s+)
+  | (?P<code>[^"'/\s]+|/)
+''', re.DOTALL | re.VERBOSE)
+
+# Aucun espace n'est nécessaire autour de ces caractères CSS
+# (sauf avant ':', qui distingue "a :hover" de "a:hover")
+_CSS_NO_SPACE_AFTER = frozenset('{};,>~:')
+_CSS_NO_SPACE_BEFORE = frozenset('{};,>~')
+
+# Lexèmes JavaScript : chaîne, commentaire, espaces, suite de caractères sans
+# espace ni '/', ou '/' seul (les gabarits et expressions régulières sont lus à part)
+_JS_TOKEN = re.compile(r'''
+    (?P<string>"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?)
+  | (?P<line_comment>//[^\n]*)
+  | (?P<comment>/\*.*?(?:\*/|\Z))
+  | (?P<newline>[^\S\n]*\n\s*)
+  | (?P<space>[^\S\n]+)
+  | (?P<code>[^\s"'`/]+|/)
+''', re.DOTALL | re.VERBOSE)
+
+_JS_TRAILING_WORD = re.compile(r'[\w$]+$')
+
+_JS_REGEX = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*')
+
+# Un '/' après ces mots-clés ouvre une expression régulière, pas une division
+_JS_REGEX_KEYWORDS = frozenset((
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await'
+))
+
+# Un saut de ligne peut être supprimé après / avant ces caractères sans
+# changer l'insertion automatique des points-virgules
+_JS_JOIN_AFTER = frozenset('{[(,;:=?&|<>*%^!~')
+_JS_JOIN_BEFORE = frozenset('}]),;:?.=&|<>*%^')
+
+
+def _is_js_word_char(char: str) -> bool:
+    return char.isalnum() or char in '_$' or char > '\x7f'
+
+
+def minify_css(css_content: str) -> str:
+    """Minifie du CSS : commentaires et espaces superflus supprimés, chaînes intactes"""
+    out: List[str] = []
+    pending_space = False
+
+    for match in _CSS_TOKEN.finditer(css_content):
+        kind = match.lastgroup
+        if kind in ('space', 'comment'):
+            pending_space = True
+            continue
+
+        token = match.group()
+        if kind == 'code' and ';}' in token:
+            # Le point-virgule avant une accolade fermante est inutile
+            token = token.replace(';}', '}')
+        if out:
+            if token[0] == '}' and out[-1][-1] == ';':
+                out[-1] = out[-1][:-1]
+                if not out[-1]:
+                    out.pop()
+            elif (pending_space and out[-1][-1] not in _CSS_NO_SPACE_AFTER
+                    and token[0] not in _CSS_NO_SPACE_BEFORE):
+                out.append(' ')
+        out.append(token)
+        pending_space = False
+
+    return ''.join(out)
+
+
+def _template_end(text: str, start: int) -> int:
+    """Position suivant la fin du gabarit commençant à `start` (``...${expr}...``)"""
+    i = start + 1
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char == '\\':
+            i += 2
+        elif char == '`':
+            return i + 1
+        elif char == '$' and text.startswith('{', i + 1):
+            i = _expression_end(text, i + 2)
+        else:
+            i += 1
+    return length
+
+
+def _expression_end(text: str, start: int) -> int:
+    """Position suivant l'accolade fermant une expression ${...} d'un gabarit"""
+    depth = 1
+    i = start
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char in '"\'':
+            match = _JS_TOKEN.match(text, i)
+            i = match.end()
+            continue
+        if char == '`':
+            i = _template_end(text, i)
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return length
+
+
+def minify_js(js_content: str) -> str:
+    """
+    Minifie du JavaScript sans changer son comportement
+
+    Les sauts de ligne sont conservés là où l'insertion automatique des
+    points-virgules pourrait en dépendre, et un espace est gardé entre deux
+    mots (`return x`) ou deux opérateurs qui fusionneraient (`a - -b`).
+    """
+    out: List[str] = []
+    separator = ''  # Espace en attente : '', ' ' ou '\n'
+    previous = ''  # Dernier lexème significatif (contexte des expressions régulières)
+    length = len(js_content)
+    pos = 0
+
+    while pos < length:
+        char = js_content[pos]
+
+        if char == '`':
+            end = _template_end(js_content, pos)
+            kind = 'string'
+        else:
+            match = _JS_TOKEN.match(js_content, pos)
+            kind = match.lastgroup
+            end = match.end()
+            if kind == 'code' and char == '/':
+                regex = _regex_allowed(previous) and _JS_REGEX.match(js_content, pos)
+                if regex:
+                    kind = 'string'
+                    end = regex.end()
+
+        if kind == 'newline' or kind == 'line_comment':
+            # Un commentaire // se termine par un saut de ligne
+            separator = '\n'
+        elif kind == 'space':
+            separator = separator or ' '
+        elif kind == 'comment':
+            separator = '\n' if separator == '\n' or '\n' in match.group() else ' '
+        else:
+            token = js_content[pos:end]
+            if out and separator:
+                _append_separator(out, separator, token)
+            out.append(token)
+            separator = ''
+            previous = token
+        pos = end
+
+    return ''.join(out)
+
+
+def _regex_allowed(previous: str) -> bool:
+    """Un '/' ouvre une expression régulière s'il ne peut pas être une division"""
+    if not previous:
+        return True
+    last = previous[-1]
+    if _is_js_word_char(last):
+        word = _JS_TRAILING_WORD.search(previous)
+        return word is not None and word.group() in _JS_REGEX_KEYWORDS
+    return last not in ')]}"\'`'
+
+
+
+def _append_separator(out: List[str], separator: str, token: str) -> None:
+    """Ajoute l'espace ou le saut de ligne nécessaire entre deux lexèmes"""
+    before = out[-1][-1]
+    after = token[0]
+
+    if separator == '\n' and before not in _JS_JOIN_AFTER and after not in _JS_JOIN_BEFORE:
+        out.append('\n')
+    elif _is_js_word_char(before) and _is_js_word_char(after):
+        out.append(' ')
+    elif before in '+-/' and after == before:
+        # a + +b, a - -b, a / /re/ : les opérateurs ne doivent pas fusionner
+        out.append(' ')
@@ -0,0 +1,231 @@
+"""
+Cache des pages HTML rendues (optionnel, PAGE_CACHE_ENABLED)
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional, Dict, Any, Callable, List, Tuple
+from urllib.parse import urlencode
+from flask import Flask, Response, current_app, g, request
+from app.services.dependencies import Dependencies, track_dependencies
+from app.services.tmdb_service import TMDBCache, tmdb_service
+from app.utils.compression import compress
+from app.utils.validators import validate_page
+
+# Taille minimum d'une page pour la stocker aussi compressée
+MIN_COMPRESS_SIZE = 1024
+
+
+class CachedPage:
+    """Page rendue, sa version compressée et les entrées TMDB dont elle dépend"""
+    __slots__ = ('body', 'gzipped', 'mimetype', 'dependencies', 'created_at')
+
+    def __init__(self, body: bytes, gzipped: Optional[bytes], mimetype: str,
+                 dependencies: Dict[str, float], created_at: float):
+        self.body = body
+        self.gzipped = gzipped
+        self.mimetype = mimetype
+        self.dependencies = dependencies
+        self.created_at = created_at
+
+
+class PageCache:
+    """
+    Cache LRU des pages rendues
+
+    Une page n'est resservie que si toutes les entrées du cache TMDB utilisées
+    pour la rendre sont encore fraîches et n'ont pas été réécrites depuis.
+    La durée `timeout` borne en plus la durée de vie de chaque page.
+    """
+
+    def __init__(self, source: TMDBCache, max_entries: int = 500, timeout: float = 300,
+                 compress_level: int = 6):
+        self.source = source
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.compress_level = compress_level
+        self._pages: 'OrderedDict[str, CachedPage]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[CachedPage]:
+        """Retourne la page si elle est encore valide"""
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+
+        if not self._is_valid(page):
+            with self._lock:
+                if self._pages.get(key) is page:
+                    del self._pages[key]
+                self.invalidations += 1
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key in self._pages:
+                self._pages.move_to_end(key)
+            self.hits += 1
+        return page
+
+    def _is_valid(self, page: CachedPage) -> bool:
+        if time.time() - page.created_at > self.timeout:
+            return False
+        return all(self.source.version(key) == version for key, version in page.dependencies.items())
+
+    def store(self, key: str, body: bytes, mimetype: str, dependencies: Dependencies) -> Optional[CachedPage]:
+        """
+        Enregistre une page rendue et sa version compressée
+
+        Returns:
+            La page enregistrée, ou None si le rendu n'est pas réutilisable
+            (erreur TMDB, valeur de secours ou entrée périmée)
+        """
+        if not dependencies.cacheable or None in dependencies.versions.values():
+            return None
+
+        gzipped = None
+        if len(body) > MIN_COMPRESS_SIZE:
+            compressed = compress(body, 'gzip', self.compress_level)
+            if len(compressed) < len(body) * 0.9:
+                gzipped = compressed
+
+        page = CachedPage(body, gzipped, mimetype, dict(dependencies.versions), time.time())
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+        return page
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._pages),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations
+            }
+
+
+def register_page_cache(app: Flask) -> None:
+    """Active le cache des pages si PAGE_CACHE_ENABLED est défini"""
+    if not app.config.get('PAGE_CACHE_ENABLED'):
+        return
+
+    app.extensions['page_cache'] = PageCache(
+        tmdb_service.cache,
+        max_entries=app.config['PAGE_CACHE_MAX_ENTRIES'],
+        timeout=app.config['PAGE_CACHE_TIMEOUT'],
+        compress_level=app.config['PAGE_CACHE_COMPRESS_LEVEL']
+    )
+
+
+def _page_cache() -> Optional[PageCache]:
+    """Cache des pages de l'application, si la requête peut l'utiliser"""
+    cache = current_app.extensions.get('page_cache')
+    if cache is None or request.method != 'GET':
+        return None
+    # Pages anonymes uniquement
+    if 'Authorization' in request.headers or current_app.config['SESSION_COOKIE_NAME'] in request.cookies:
+        return None
+    return cache
+
+
+def _normalized_args() -> List[Tuple[str, str]]:
+    """
+    Paramètres tels que lus par la vue (PAGE_CACHE_KEY_ARGS)
+
+    Page validée, page 1 par défaut omise, sans valeurs vides ; les
+    paramètres que la vue ne lit pas ne créent pas de nouvelle entrée.
+    """
+    names = current_app.config['PAGE_CACHE_KEY_ARGS'].get(request.endpoint, ())
+    args = []
+    for name in names:
+        for value in request.args.getlist(name):
+            if name == 'page':
+                value = str(validate_page(value))
+                if value == '1':
+                    continue
+            if value != '':
+                args.append((name, value))
+    return sorted(args)
+
+
+def page_cache_key() -> str:
+    """Clé d'une page : chemin (endpoint et arguments de la vue) et paramètres lus par la vue"""
+    return f"{request.path}?{urlencode(_normalized_args())}"
+
+
+def _page_response(page: CachedPage, status: str) -> Response:
+    """Réponse servie depuis une page en cache, compressée si le client l'accepte"""
+    if page.gzipped is not None and request.accept_encodings['gzip']:
+        response = Response(page.gzipped, mimetype=page.mimetype)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(page.body, mimetype=page.mimetype)
+
+    if page.gzipped is not None:
+        response.vary.add('Accept-Encoding')
+    response.headers['X-Page-Cache'] = status
+    return response
+
+
+def _store_response(cache: PageCache, key: str, rv: Any, dependencies: Dependencies) -> Response:
+    """Met en cache le résultat d'une vue s'il s'agit d'une page HTML réutilisable"""
+    response = current_app.make_response(rv)
+    if (response.status_code != 200 or response.mimetype != 'text/html'
+            or response.direct_passthrough or response.is_streamed):
+        return response
+
+    page = cache.store(key, response.get_data(), response.mimetype, dependencies)
+    if page is None:
+        return response
+    return _page_response(page, 'MISS')
+
+
+def _cached_response(cache: Optional[PageCache], key: Optional[str]) -> Optional[Response]:
+    """Réponse depuis le cache des pages, en exposant ses dépendances (en-têtes HTTP)"""
+    if cache is None:
+        return None
+    page = cache.get(key)
+    if page is None:
+        return None
+    g.page_dependencies = Dependencies(page.dependencies)
+    return _page_response(page, 'HIT')
+
+
+def cached_page(view: Callable) -> Callable:
+    """
+    Sert la vue depuis le cache des pages quand il est activé
+
+    Les entrées TMDB lues pendant le rendu sont toujours exposées dans
+    g.page_dependencies (ETag et Surrogate-Key, voir http_cache).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        cache = _page_cache()
+        key = page_cache_key() if cache is not None else None
+        response = _cached_response(cache, key)
+        if response is not None:
+            return response
+
+        with track_dependencies() as dependencies:
+            rv = view(*args, **kwargs)
+        g.page_dependencies = dependencies
+        if cache is None:
+            return rv
+        return _store_response(cache, key, rv, dependencies)
+
+    return wrapper
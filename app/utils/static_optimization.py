@@ -1,21 +1,69 @@
 """
 Optimisation des ressources statiques
 """
-from flask import Flask
+from flask import Flask, request, send_from_directory
+from werkzeug.security import safe_join
+from app.utils.asset_pipeline import build_bundles, build_critical_css, register_asset_pipeline
+from app.utils.compression import configure_compression
+from app.utils.minifier import minify_css, minify_js
 import gzip
+import hashlib
+import json
+import mimetypes
 import os
 from pathlib import Path
+from typing import Dict, List, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : seules les variantes .gz sont produites
+    brotli = None
+
+# Variantes précompressées, par ordre de préférence (encodage, extension)
+PRECOMPRESSED_VARIANTS = (('br', '.br'), ('gzip', '.gz'))
+
+# Ressources textuelles à précompresser
+PRECOMPRESSIBLE_SUFFIXES = ('.css', '.js', '.svg', '.json', '.txt')
+
+# Copies nommées d'après leur contenu (servies avec un cache immuable)
+ASSET_BUILD_DIR = 'dist'
+ASSET_MANIFEST = f'{ASSET_BUILD_DIR}/manifest.json'
+ASSET_HASH_LENGTH = 12
+
+# Ressources versionnées par le manifeste
+HASHED_SUFFIXES = ('.css', '.js')
+
+# CSS critique de chaque type de page (voir asset_pipeline)
+CRITICAL_CSS_DIR = f'{ASSET_BUILD_DIR}/critical'
+
+# État du build incrémental ; BUILD_VERSION change avec le minifieur ou la précompression
+BUILD_STATE = f'{ASSET_BUILD_DIR}/build-state.json'
+BUILD_VERSION = '2'
 
 
 def configure_static_optimization(app: Flask):
     """Configure l'optimisation des ressources statiques"""
+    configure_asset_manifest(app)
+    register_asset_pipeline(app, CRITICAL_CSS_DIR)
+    configure_precompressed_static(app)
+    configure_compression(app)
+    immutable_max_age = app.config['STATIC_IMMUTABLE_MAX_AGE']
 
     @app.after_request
     def add_cache_headers(response):
         """Ajoute les en-têtes de cache pour les ressources statiques"""
+        if is_hashed_asset_request() and response.status_code == 200:
+            # Nom dérivé du contenu : le fichier ne change jamais, sans revalidation
+            # (send_file ajoute no-cache)
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = immutable_max_age
+            response.cache_control.immutable = True
+            return response
+
         if (response.content_type and
             (response.content_type.startswith('text/css') or
-             response.content_type.startswith('application/javascript') or
+             response.content_type.startswith(('application/javascript', 'text/javascript')) or
              response.content_type.startswith('image/'))):
 
             # Cache pour 1 jour pour le CSS/JS, 1 semaine pour les images
@@ -28,110 +76,262 @@ def configure_static_optimization(app: Flask):
 
         return response
 
-    @app.after_request
-    def compress_response(response):
-        """Compresse les réponses si possible"""
-        # Ne pas compresser les fichiers statiques gérés par Flask
-        if request.endpoint == 'static':
-            return response
-
-        # Vérifier si la compression est supportée par le client
-        accept_encoding = request.headers.get('Accept-Encoding', '')
-
-        if ('gzip' in accept_encoding and
-            response.status_code == 200 and
-            response.content_type and
-            (response.content_type.startswith('text/') or
-             response.content_type.startswith('application/json') or
-             response.content_type.startswith('application/javascript'))):
-
-            # Vérifier si la réponse a des données à compresser
-            try:
-                response_data = response.get_data()
-                # Compresser seulement les réponses > 1KB
-                if len(response_data) > 1024:
-                    compressed = gzip.compress(response_data)
-
-                    # Seulement si la compression est bénéfique
-                    if len(compressed) < len(response_data) * 0.9:
-                        response.set_data(compressed)
-                        response.headers['Content-Encoding'] = 'gzip'
-                        response.headers['Content-Length'] = len(compressed)
-            except (RuntimeError, AttributeError):
-                # Ignorer les erreurs de compression pour les réponses en mode passthrough
-                pass
-
-        return response
-
 
-def minify_css(css_content: str) -> str:
-    """Minification basique du CSS"""
-    import re
+def _source_assets(static_folder: Path, suffix: str) -> List[Path]:
+    """Fichiers sources d'un type, hors versions minifiées et copies versionnées"""
+    build_dir = static_folder / ASSET_BUILD_DIR
+    return [
+        path for path in sorted(static_folder.rglob(f'*{suffix}'))
+        if not path.name.endswith(f'.min{suffix}') and build_dir not in path.parents
+    ]
 
-    # Supprimer les commentaires CSS
-    css_content = re.sub(r'/\*.*?\*/', '', css_content, flags=re.DOTALL)
 
-    # Supprimer les espaces multiples et les sauts de ligne
-    css_content = re.sub(r'\s+', ' ', css_content)
+def create_optimized_static_files(app: Flask, force: bool = False):
+    """
+    Crée des versions optimisées des fichiers statiques
 
-    # Supprimer les espaces autour des caractères spéciaux
-    css_content = re.sub(r'\s*([{}:;,>+~])\s*', r'\1', css_content)
+    Le build est incrémental : une étape n'est rejouée que si l'empreinte de
+    son fichier d'entrée a changé depuis le build précédent (BUILD_STATE).
 
-    # Supprimer les points-virgules avant les accolades fermantes
-    css_content = re.sub(r';}', '}', css_content)
-
-    return css_content.strip()
-
-
-def minify_js(js_content: str) -> str:
-    """Minification basique du JavaScript"""
-    import re
-
-    # Supprimer les commentaires de ligne
-    js_content = re.sub(r'//.*?$', '', js_content, flags=re.MULTILINE)
-
-    # Supprimer les commentaires de bloc
-    js_content = re.sub(r'/\*.*?\*/', '', js_content, flags=re.DOTALL)
-
-    # Supprimer les espaces multiples et normaliser les sauts de ligne
-    js_content = re.sub(r'\s+', ' ', js_content)
-
-    # Supprimer les espaces autour des opérateurs
-    js_content = re.sub(r'\s*([{}()[\];,=+\-*/])\s*', r'\1', js_content)
-
-    return js_content.strip()
-
-
-def create_optimized_static_files(app: Flask):
-    """Crée des versions optimisées des fichiers statiques"""
+    Args:
+        force: Reconstruit tous les fichiers
+    """
     static_folder = Path(app.static_folder)
-
-    # Optimiser les fichiers CSS
-    css_files = static_folder.rglob('*.css')
-    for css_file in css_files:
-        if not css_file.name.endswith('.min.css'):
-            content = css_file.read_text(encoding='utf-8')
-            minified = minify_css(content)
-
-            # Créer le fichier minifié
-            min_file = css_file.with_suffix('.min.css')
-            min_file.write_text(minified, encoding='utf-8')
-
-            print(f"CSS minifié: {css_file.name} -> {min_file.name}")
-
-    # Optimiser les fichiers JavaScript
-    js_files = static_folder.rglob('*.js')
-    for js_file in js_files:
-        if not js_file.name.endswith('.min.js'):
-            content = js_file.read_text(encoding='utf-8')
-            minified = minify_js(content)
+    state = {} if force else _load_build_state(static_folder)
+    skipped = 0
+
+    # Regrouper les feuilles de style de chaque type de page
+    for page_type, bundle in build_bundles(static_folder, app.config['PAGE_STYLESHEETS']).items():
+        print(f"Regroupé: {page_type} -> {bundle.relative_to(static_folder).as_posix()}")
+
+    # Optimiser les fichiers CSS et JavaScript
+    for suffix, label, minify in (('.css', 'CSS', minify_css), ('.js', 'JS', minify_js)):
+        for source in _source_assets(static_folder, suffix):
+            min_file = source.with_suffix(f'.min{suffix}')
+            content = source.read_bytes()
+            if _is_up_to_date(state, 'minify', source, static_folder, content) and min_file.exists():
+                skipped += 1
+                continue
 
             # Créer le fichier minifié
-            min_file = js_file.with_suffix('.min.js')
-            min_file.write_text(minified, encoding='utf-8')
-
-            print(f"JS minifié: {js_file.name} -> {min_file.name}")
-
+            min_file.write_text(minify(content.decode('utf-8')), encoding='utf-8')
+            print(f"{label} minifié: {source.name} -> {min_file.name}")
+
+    # CSS critique inséré dans les pages
+    critical = build_critical_css(static_folder, static_folder / CRITICAL_CSS_DIR,
+                                  app.config['PAGE_STYLESHEETS'], app.config['CRITICAL_CSS_SELECTORS'])
+    for page_type, path in critical.items():
+        print(f"CSS critique: {page_type} ({path.stat().st_size} octets)")
+
+    # Copies versionnées par leur contenu et manifeste
+    manifest = build_asset_manifest(static_folder)
+    for source, hashed in manifest.items():
+        print(f"Versionné: {source} -> {hashed}")
+
+    # Précompresser les ressources textuelles (sources, versions minifiées et versionnées),
+    # hors fichiers du build et CSS critique (inséré dans les pages)
+    build_files = {static_folder / ASSET_MANIFEST, static_folder / BUILD_STATE}
+    critical_dir = static_folder / CRITICAL_CSS_DIR
+    for asset in sorted(static_folder.rglob('*')):
+        if (asset.is_file() and asset.suffix in PRECOMPRESSIBLE_SUFFIXES and asset not in build_files
+                and critical_dir not in asset.parents):
+            # Extensions des variantes écrites au build précédent : une variante supprimée est réécrite
+            variants_key = f"precompress-variants:{asset.relative_to(static_folder).as_posix()}"
+            previous_variants = [ext for ext in state.get(variants_key, '').split(',') if ext]
+            if (_is_up_to_date(state, 'precompress', asset, static_folder, asset.read_bytes())
+                    and all(asset.with_name(asset.name + ext).exists() for ext in previous_variants)):
+                skipped += 1
+                continue
+            written = precompress_file(asset)
+            state[variants_key] = ','.join(variant.name[len(asset.name):] for variant in written)
+            for variant in written:
+                print(f"Précompressé: {asset.name} -> {variant.name}")
+
+    _save_build_state(static_folder, state)
+    if skipped:
+        print(f"Inchangés: {skipped} fichier(s) ignoré(s)")
+
+
+def _build_version() -> str:
+    """Version des outils de build (les variantes .br dépendent du paquet brotli)"""
+    return BUILD_VERSION if brotli is None else f'{BUILD_VERSION}+br'
+
+
+def _load_build_state(static_folder: Path) -> Dict[str, str]:
+    """Empreintes des entrées du build précédent"""
+    try:
+        state = json.loads((static_folder / BUILD_STATE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    # Un changement des outils de build invalide tout l'état
+    if state.get('version') != _build_version():
+        return {}
+    return state.get('inputs', {})
+
+
+def _save_build_state(static_folder: Path, state: Dict[str, str]):
+    path = static_folder / BUILD_STATE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'version': _build_version(), 'inputs': state}, indent=2, sort_keys=True),
+                    encoding='utf-8')
+
+
+def _is_up_to_date(state: Dict[str, str], step: str, path: Path, static_folder: Path, content: bytes) -> bool:
+    """Indique si l'étape a déjà traité ce contenu, et enregistre sa nouvelle empreinte sinon"""
+    key = f"{step}:{path.relative_to(static_folder).as_posix()}"
+    digest = hashlib.sha256(content).hexdigest()
+    if state.get(key) == digest:
+        return True
+    state[key] = digest
+    return False
+
+
+def build_asset_manifest(static_folder: Path) -> Dict[str, str]:
+    """
+    Écrit une copie nommée d'après son contenu de chaque ressource CSS/JS
+
+    La copie reprend la version minifiée si elle existe (css/main.css ->
+    dist/css/main.<empreinte>.css). Les copies des builds précédents sont
+    conservées : les pages déjà en cache chez les clients y font référence.
+
+    Returns:
+        Le manifeste écrit dans ASSET_MANIFEST (nom source -> nom versionné)
+    """
+    manifest = {}
+    for suffix in HASHED_SUFFIXES:
+        for source in _source_assets(static_folder, suffix):
+            minified = source.with_suffix(f'.min{suffix}')
+            content = (minified if minified.exists() else source).read_bytes()
+            digest = hashlib.sha256(content).hexdigest()[:ASSET_HASH_LENGTH]
+
+            relative = source.relative_to(static_folder)
+            hashed = Path(ASSET_BUILD_DIR, relative.parent, f'{source.stem}.{digest}{suffix}')
+            target = static_folder / hashed
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(content)
+            manifest[relative.as_posix()] = hashed.as_posix()
+
+    manifest_path = static_folder / ASSET_MANIFEST
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+    return manifest
+
+
+def load_asset_manifest(app: Flask) -> Dict[str, str]:
+    """Charge le manifeste des ressources versionnées (vide s'il n'a pas été construit)"""
+    try:
+        manifest = json.loads(Path(app.static_folder, ASSET_MANIFEST).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        manifest = {}
+    app.extensions['asset_manifest'] = manifest
+    return manifest
+
+
+def is_hashed_asset_request() -> bool:
+    """Indique si la requête vise une copie versionnée (dist/...)"""
+    if request.endpoint != 'static' or not request.view_args:
+        return False
+    return request.view_args.get('filename', '').startswith(f'{ASSET_BUILD_DIR}/')
+
+
+def configure_asset_manifest(app: Flask):
+    """
+    Fait pointer url_for('static', ...) vers les copies versionnées
+
+    Sans manifeste (flask build-assets non lancé), les URL restent inchangées.
+    """
+    load_asset_manifest(app)
+
+    @app.url_defaults
+    def hashed_static_filename(endpoint, values):
+        if endpoint == 'static':
+            hashed = app.extensions['asset_manifest'].get(values.get('filename'))
+            if hashed is not None:
+                values['filename'] = hashed
+
+
+def precompress_file(path: Path) -> List[Path]:
+    """
+    Écrit les variantes .gz (et .br si brotli est installé) d'un fichier
+
+    Une variante n'est écrite que si elle est plus petite que l'original.
+
+    Returns:
+        Les variantes écrites
+    """
+    data = path.read_bytes()
+    written = []
+
+    # mtime=0 : sortie reproductible d'un build à l'autre
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+
+    for extension, compressed in variants:
+        variant = path.with_name(path.name + extension)
+        if len(compressed) < len(data):
+            variant.write_bytes(compressed)
+            written.append(variant)
+        elif variant.exists():
+            variant.unlink()
+
+    return written
+
+
+def configure_precompressed_static(app: Flask):
+    """
+    Sert les variantes précompressées des fichiers statiques
+
+    La meilleure variante acceptée par le client (Accept-Encoding) est servie
+    telle quelle, sans compression à la requête. Une variante plus ancienne
+    que son fichier source (source modifiée sans nouveau build) est ignorée.
+    Les variantes disponibles pour chaque fichier sont mémorisées tant que
+    la source ne change pas (recalculées en mode debug).
+    """
+    variants_by_file: Dict[str, Tuple[float, Tuple[Tuple[str, str], ...]]] = {}
+
+    def available_variants(filename: str) -> Tuple[Tuple[str, str], ...]:
+        source = safe_join(app.static_folder, filename)
+        try:
+            source_mtime = os.stat(source).st_mtime if source else None
+        except OSError:
+            source_mtime = None
+        if source_mtime is None:
+            return ()
+
+        cached = variants_by_file.get(filename)
+        if cached is not None and cached[0] == source_mtime and not app.debug:
+            return cached[1]
+
+        found = []
+        for encoding, extension in PRECOMPRESSED_VARIANTS:
+            try:
+                if os.stat(source + extension).st_mtime >= source_mtime:
+                    found.append((encoding, filename + extension))
+            except OSError:
+                continue
+        variants = tuple(found)
+        variants_by_file[filename] = (source_mtime, variants)
+        return variants
+
+    def send_static(filename):
+        """Fichier statique, précompressé si le client l'accepte"""
+        variants = available_variants(filename)
+        accepted = request.accept_encodings
+
+        for encoding, variant in variants:
+            if accepted[encoding]:
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response = send_from_directory(app.static_folder, variant, mimetype=mimetype)
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            response = app.send_static_file(filename)
+
+        if variants:
+            response.vary.add('Accept-Encoding')
+        return response
 
-# Import de request pour la fonction compress_response
-from flask import request
\ No newline at end of file
+    if 'static' in app.view_functions:
+        app.view_functions['static'] = send_static
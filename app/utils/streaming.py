@@ -0,0 +1,99 @@
+"""
+Rendu en flux des pages dont les données TMDB ne sont pas en cache (STREAMED_RENDERING)
+
+Le <head>, la barre de navigation et un squelette sont envoyés tout de suite ;
+le contenu de la page (bloc content du template) suit dès que TMDB répond.
+Les pages déjà en cache restent rendues d'un bloc (ETag, cache des pages).
+
+Les en-têtes partent avant les données : une page en flux n'a ni ETag ni
+mise en cache partagée (voir http_cache).
+"""
+from typing import Any, Callable, Dict, Iterator, Tuple
+from flask import Flask, Response, current_app, render_template, request, stream_with_context
+from jinja2 import Template
+from app.services.tmdb_service import tmdb_service
+
+# Templates du squelette et du message d'erreur insérés dans le flux
+PLACEHOLDER_TEMPLATE = 'components/stream_placeholder.html'
+ERROR_TEMPLATE = 'components/error_message.html'
+
+# Délimite le bloc content dans le rendu d'une page
+_CONTENT_MARKER = '<!--stream:content-->'
+
+PageLoader = Callable[[], Tuple[str, Dict[str, Any]]]
+
+
+def streams_cold_page(cache_key: str) -> bool:
+    """
+    Indique si la page doit être rendue en flux : entrée TMDB introuvable
+
+    Une entrée périmée, ou présente seulement dans le cache L2 ou le snapshot,
+    est servie sans attendre TMDB : la page est alors rendue d'un bloc.
+    """
+    if not current_app.config.get('STREAMED_RENDERING') or request.method != 'GET':
+        return False
+    return not tmdb_service.cache.contains(cache_key)
+
+
+def _shell(app: Flask, template: Template, context: Dict[str, Any]) -> Tuple[str, str]:
+    """Début et fin de la page, sans le bloc content"""
+    context = dict(context)
+    app.update_template_context(context)
+    jinja_context = template.new_context(context)
+
+    def content_marker(_context) -> Iterator[str]:
+        yield _CONTENT_MARKER
+
+    jinja_context.blocks['content'] = [content_marker]
+    head, _, tail = ''.join(template.root_render_func(jinja_context)).partition(_CONTENT_MARKER)
+    return head, tail
+
+
+def _content(app: Flask, template: Template, context: Dict[str, Any]) -> str:
+    """Bloc content d'une page, rendu avec toute la page (variables définies hors des blocs)"""
+    context = dict(context)
+    app.update_template_context(context)
+    jinja_context = template.new_context(context)
+    content_block = jinja_context.blocks['content'][0]
+
+    def marked_content(block_context) -> Iterator[str]:
+        yield _CONTENT_MARKER
+        yield from content_block(block_context)
+        yield _CONTENT_MARKER
+
+    jinja_context.blocks['content'] = [marked_content]
+    return ''.join(template.root_render_func(jinja_context)).split(_CONTENT_MARKER)[1]
+
+
+def stream_page(template_name: str, shell_context: Dict[str, Any], load_page: PageLoader) -> Response:
+    """
+    Page rendue en flux
+
+    Args:
+        template_name: Template de la page, rendu sans son bloc content pour le squelette
+        shell_context: Variables utilisées hors du bloc content (titre...)
+        load_page: Récupère les données et retourne (template, contexte) de la
+            page finale, comme pour render_template. Exécuté en parallèle du
+            rendu du squelette, hors du contexte de la requête : il ne doit
+            pas utiliser fan_out.
+
+    Un template final sans bloc content (error.html) est remplacé par le
+    message d'erreur dans la page.
+    """
+    app = current_app._get_current_object()
+    page = tmdb_service.submit(load_page)
+
+    @stream_with_context
+    def generate() -> Iterator[str]:
+        head, tail = _shell(app, app.jinja_env.get_template(template_name), shell_context)
+        yield head + app.jinja_env.get_template(PLACEHOLDER_TEMPLATE).render()
+
+        final_name, final_context = page.result()
+        final_template = app.jinja_env.get_template(final_name)
+        if 'content' in final_template.blocks:
+            yield _content(app, final_template, final_context)
+        else:
+            yield render_template(ERROR_TEMPLATE, **final_context)
+        yield tail
+
+    return Response(generate(), mimetype='text/html')
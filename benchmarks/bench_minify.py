@@ -0,0 +1,70 @@
+"""
+Banc d'essai du minifieur : lexèmes en une passe contre l'ancienne version à expressions régulières
+
+Usage :
+    python benchmarks/bench_minify.py [--repeat N] [fichier ...]
+
+Sans fichier, mesure static/css/main.css et static/js/main.js.
+"""
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.utils.minifier import minify_css, minify_js  # noqa: E402
+
+
+def legacy_minify_css(css_content: str) -> str:
+    """Ancienne minification CSS (quatre passes d'expressions régulières)"""
+    css_content = re.sub(r'/\*.*?\*/', '', css_content, flags=re.DOTALL)
+    css_content = re.sub(r'\s+', ' ', css_content)
+    css_content = re.sub(r'\s*([{}:;,>+~])\s*', r'\1', css_content)
+    css_content = re.sub(r';}', '}', css_content)
+    return css_content.strip()
+
+
+def legacy_minify_js(js_content: str) -> str:
+    """Ancienne minification JavaScript (quatre passes, ne respecte pas les chaînes)"""
+    js_content = re.sub(r'//.*?$', '', js_content, flags=re.MULTILINE)
+    js_content = re.sub(r'/\*.*?\*/', '', js_content, flags=re.DOTALL)
+    js_content = re.sub(r'\s+', ' ', js_content)
+    js_content = re.sub(r'\s*([{}()[\];,=+\-*/])\s*', r'\1', js_content)
+    return js_content.strip()
+
+
+MINIFIERS = {
+    '.css': (('regex', legacy_minify_css), ('lexèmes', minify_css)),
+    '.js': (('regex', legacy_minify_js), ('lexèmes', minify_js)),
+}
+
+
+def bench_file(path: Path, repeat: int) -> None:
+    source = path.read_text(encoding='utf-8')
+    print(f"{path.relative_to(ROOT) if path.is_relative_to(ROOT) else path} ({len(source)} octets)")
+
+    for name, minify in MINIFIERS[path.suffix]:
+        # Meilleur temps sur 5 séries : moins sensible au bruit
+        best = min(timeit.repeat(lambda: minify(source), number=repeat, repeat=5)) / repeat
+        output = minify(source)
+        throughput = len(source) / best / 1024 / 1024
+        print(f"  {name:<8} {best * 1e3:8.3f} ms  {throughput:7.1f} Mo/s  "
+              f"{len(output):6d} octets ({len(output) / len(source):.1%})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('files', nargs='*', type=Path)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    files = args.files or [ROOT / 'static' / 'css' / 'main.css', ROOT / 'static' / 'js' / 'main.js']
+    for path in files:
+        bench_file(path.resolve(), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,48 @@ Configuration des tests pytest
 """
 import pytest
 import os
+from unittest.mock import patch
 from app.factory import create_app
+from app.services.tmdb_service import TMDBService, tmdb_service
+
+
+@pytest.fixture(autouse=True)
+def reset_tmdb_failures():
+    """Disjoncteurs et cache négatif du service global remis à zéro pour chaque test"""
+    tmdb_service._breakers.clear()
+    tmdb_service.negative_cache.clear()
+    yield
+    tmdb_service._breakers.clear()
+    tmdb_service.negative_cache.clear()
+
+
+@pytest.fixture
+def tmdb_movies():
+    """Films des listes du TMDB simulé (à remplacer avec pytest.mark.parametrize)"""
+    return [{"id": 1, "title": "Film Test", "poster_path": "/affiche1.jpg", "vote_average": 8.0,
+             "overview": "Un film de test " * 100}]
+
+
+@pytest.fixture
+def fake_tmdb(tmdb_movies):
+    """
+    TMDB simulé pour les routes, retourne le mock de _make_request
+
+    Genres, listes de films (tmdb_movies) et détail des films de la liste.
+    Le cache du service global est vidé avant et après le test.
+    """
+    def respond(endpoint, params):
+        if endpoint == "genre/movie/list":
+            return {"genres": [{"id": 28, "name": "Action"}]}, None
+        for movie in tmdb_movies:
+            if endpoint == f"movie/{movie['id']}":
+                return dict(movie, overview="Synopsis complet"), None
+        return {"page": 1, "total_pages": 1, "total_results": len(tmdb_movies), "results": tmdb_movies}, None
+
+    tmdb_service.cache.clear()
+    with patch.object(TMDBService, '_make_request', side_effect=respond) as mock_request:
+        yield mock_request
+    tmdb_service.cache.clear()
 
 
 @pytest.fixture
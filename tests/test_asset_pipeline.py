@@ -0,0 +1,93 @@
+"""
+Tests pour les feuilles de style regroupées et le CSS critique
+"""
+import pytest
+from flask import render_template_string
+from app.utils.asset_pipeline import build_bundles, extract_critical_css, split_rules
+from app.utils.static_optimization import create_optimized_static_files, load_asset_manifest
+
+MAIN_CSS = "body { margin: 0; }\n.navbar { color: red; }\n.pagination { display: flex; }\n"
+DETAIL_CSS = ".movie-detail { padding: 2rem; }\n.cast-grid { display: grid; }\n"
+
+STYLESHEETS = """{% set page_type = 'movie_detail' %}{% for f in page_stylesheets(page_type) %}[{{ f }}]{% endfor %}{{ critical_css(page_type) }}"""
+
+
+class TestCriticalCss:
+    """Tests de l'extraction du CSS critique"""
+
+    def test_split_rules(self):
+        """Test du découpage en règles de premier niveau"""
+        css = "@charset 'utf-8';a{b:c}@media (max-width:10px){d{e:f}}g::after{content:'}'}"
+
+        assert split_rules(css) == [
+            ("@charset 'utf-8'", None),
+            ('a', 'b:c'),
+            ('@media (max-width:10px)', 'd{e:f}'),
+            ('g::after', "content:'}'"),
+        ]
+
+    def test_keeps_matching_rules(self):
+        """Test que seules les règles des sélecteurs critiques sont gardées"""
+        css = "body{margin:0}.movie{color:red}.movie-detail{padding:0}.movie:hover{opacity:1}.footer{color:blue}"
+
+        critical = extract_critical_css(css, ('body', '.movie'))
+
+        assert critical == "body{margin:0}.movie{color:red}.movie:hover{opacity:1}"
+
+    def test_keeps_media_blocks_with_critical_rules(self):
+        """Test que les blocs @media ne gardent que leurs règles critiques"""
+        css = "@media (max-width:768px){.navbar{display:block}.footer{display:none}}@media print{.footer{color:#000}}"
+
+        assert extract_critical_css(css, ('.navbar',)) == "@media (max-width:768px){.navbar{display:block}}"
+
+
+class TestPageStylesheets:
+    """Tests des regroupements par type de page"""
+
+    @pytest.fixture
+    def static_app(self, app, tmp_path):
+        (tmp_path / "css" / "pages").mkdir(parents=True)
+        (tmp_path / "css" / "main.css").write_text(MAIN_CSS)
+        (tmp_path / "css" / "pages" / "movie_detail.css").write_text(DETAIL_CSS)
+        app.static_folder = str(tmp_path)
+        app.config['CRITICAL_CSS_SELECTORS'] = {'base': ('body', '.navbar'), 'movie_detail': ('.movie-detail',)}
+        return app
+
+    def test_bundle_keeps_cascade_order(self, static_app, tmp_path):
+        """Test que le regroupement concatène les fichiers dans l'ordre configuré"""
+        written = build_bundles(tmp_path, static_app.config['PAGE_STYLESHEETS'])
+        bundle = written['movie_detail'].read_text()
+
+        assert 'base' not in written
+        assert bundle.index('.navbar') < bundle.index('.movie-detail')
+        assert build_bundles(tmp_path, static_app.config['PAGE_STYLESHEETS']) == {}
+
+    def test_sources_without_build(self, static_app):
+        """Test que les fichiers sources sont chargés séparément sans build"""
+        with static_app.test_request_context():
+            rendered = render_template_string(STYLESHEETS)
+
+        assert rendered == "[css/main.css][css/pages/movie_detail.css]"
+
+    def test_bundle_and_critical_css_after_build(self, static_app):
+        """Test du regroupement et du CSS critique une fois le build lancé"""
+        create_optimized_static_files(static_app)
+        load_asset_manifest(static_app)
+
+        with static_app.test_request_context():
+            rendered = render_template_string(STYLESHEETS)
+
+        assert rendered == "[css/bundles/movie_detail.css]body{margin:0}.navbar{color:red}.movie-detail{padding:2rem}"
+
+    def test_base_template_loads_stylesheet_asynchronously(self, static_app):
+        """Test que la feuille complète est préchargée quand le CSS critique est inséré"""
+        create_optimized_static_files(static_app)
+        load_asset_manifest(static_app)
+
+        with static_app.test_request_context():
+            rendered = render_template_string("{% extends 'base.html' %}{% set page_type = 'movie_detail' %}")
+
+        bundle = static_app.extensions['asset_manifest']['css/bundles/movie_detail.css']
+        assert '<style>body{margin:0}' in rendered
+        assert f'<link rel="preload" href="/static/{bundle}" as="style"' in rendered
+        assert f'<noscript><link rel="stylesheet" href="/static/{bundle}"></noscript>' in rendered
@@ -0,0 +1,187 @@
+"""
+Tests pour les backends de cache L2
+"""
+import fnmatch
+import os
+import time
+import pytest
+from app.services.cache_backends import SQLiteCacheBackend, RedisCacheBackend, create_l2_backend
+from app.services.tmdb_service import TMDBCache
+
+
+class FakeRedis:
+    """Substitut local minimal d'un client Redis"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        value, expires_at = self.store.get(key, (None, 0))
+        if value is None or expires_at <= time.time():
+            return None
+        return value
+
+    def set(self, key, value, px=None):
+        self.store[key] = (value, time.time() + px / 1000)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def scan_iter(self, match='*'):
+        return [key for key in list(self.store) if fnmatch.fnmatch(key, match)]
+
+
+class TestSQLiteCacheBackend:
+    """Tests pour le backend SQLite"""
+
+    def test_set_get(self, tmp_path):
+        """Test set et get"""
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+        backend.set("key", b"data", 60)
+
+        assert backend.get("key") == b"data"
+
+    def test_expired_entry(self, tmp_path):
+        """Test qu'une entrée expirée n'est pas retournée"""
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+        backend.set("key", b"data", -1)
+
+        assert backend.get("key") is None
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test que deux instances (workers) partagent les entrées"""
+        path = str(tmp_path / "cache.sqlite3")
+        SQLiteCacheBackend(path).set("key", b"data", 60)
+
+        assert SQLiteCacheBackend(path).get("key") == b"data"
+
+    def test_delete_and_clear(self, tmp_path):
+        """Test de la suppression et du vidage"""
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+        backend.set("a", b"1", 60)
+        backend.set("b", b"2", 60)
+
+        backend.delete("a")
+        assert backend.get("a") is None
+
+        backend.clear()
+        assert backend.get("b") is None
+
+
+class TestRedisCacheBackend:
+    """Tests pour le backend Redis avec un substitut local"""
+
+    def test_set_get_with_prefix(self):
+        """Test set et get avec préfixe de clé"""
+        client = FakeRedis()
+        backend = RedisCacheBackend(client=client, prefix="test:")
+        backend.set("key", b"data", 60)
+
+        assert backend.get("key") == b"data"
+        assert "test:key" in client.store
+
+    def test_clear_only_prefixed_keys(self):
+        """Test que le vidage ne touche que les clés préfixées"""
+        client = FakeRedis()
+        client.set("other", b"x", px=60000)
+        backend = RedisCacheBackend(client=client, prefix="test:")
+        backend.set("key", b"data", 60)
+
+        backend.clear()
+
+        assert backend.get("key") is None
+        assert client.get("other") == b"x"
+
+
+class TestTMDBCacheWithL2:
+    """Tests du TMDBCache avec un second niveau"""
+
+    def test_l1_miss_promoted_from_l2(self):
+        """Test qu'une entrée écrite par un autre worker est lue depuis le L2"""
+        client = FakeRedis()
+        worker_a = TMDBCache(l2=RedisCacheBackend(client=client))
+        worker_b = TMDBCache(l2=RedisCacheBackend(client=client))
+
+        worker_a.set("movie_genres", {"genres": []}, ttl=60)
+
+        assert worker_b.get("movie_genres") == {"genres": []}
+        assert worker_b.stats()["l2_hits"] == 1
+        # L'entrée est désormais servie par le L1
+        assert worker_b.get("movie_genres") == {"genres": []}
+        assert worker_b.stats()["l2_hits"] == 1
+
+    def test_contains_checks_l2_without_stats(self):
+        """Test que contains() trouve une entrée du L2 sans modifier les compteurs"""
+        client = FakeRedis()
+        TMDBCache(l2=RedisCacheBackend(client=client)).set("movie_genres", {"genres": []}, ttl=60)
+        reader = TMDBCache(l2=RedisCacheBackend(client=client))
+
+        assert reader.contains("movie_genres")
+        assert not reader.contains("popular_movies_page_1")
+        assert reader.stats()["hits"] == reader.stats()["misses"] == reader.stats()["l2_hits"] == 0
+
+    def test_l2_keeps_remaining_ttl(self, tmp_path):
+        """Test que le L2 conserve l'horodatage d'origine de l'entrée"""
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+        writer = TMDBCache(l2=backend)
+        writer.set("key", {"test": "data"}, ttl=10, hard_ttl=100)
+
+        reader = TMDBCache(l2=backend)
+        reader_entry = reader.get_entry("key")
+
+        assert reader_entry == ({"test": "data"}, False)
+        assert reader._timestamps["key"] == pytest.approx(writer._timestamps["key"])
+
+    def test_l2_errors_do_not_break_cache(self):
+        """Test qu'un L2 défaillant ne casse pas le cache mémoire"""
+        class BrokenBackend(RedisCacheBackend):
+            def get(self, key):
+                raise ConnectionError("indisponible")
+
+            def set(self, key, data, expires_in):
+                raise ConnectionError("indisponible")
+
+        cache = TMDBCache(l2=BrokenBackend(client=FakeRedis()))
+        cache.set("key", {"test": "data"})
+
+        assert cache.get("key") == {"test": "data"}
+        assert cache.get("missing") is None
+        assert cache.stats()["l2_errors"] == 2
+
+
+class TestCreateL2Backend:
+    """Tests de la création du backend depuis la configuration"""
+
+    def test_disabled(self):
+        """Test sans backend configuré"""
+        class Config:
+            CACHE_L2_BACKEND = None
+
+        assert create_l2_backend(Config) is None
+
+    def test_sqlite(self, tmp_path):
+        """Test du backend SQLite configuré"""
+        class Config:
+            CACHE_L2_BACKEND = 'sqlite'
+            CACHE_L2_PATH = str(tmp_path / "cache.sqlite3")
+
+        assert isinstance(create_l2_backend(Config), SQLiteCacheBackend)
+        assert os.stat(Config.CACHE_L2_PATH).st_mode & 0o777 == 0o600
+
+    def test_sqlite_requires_path(self):
+        """Test que le backend SQLite n'a pas de fichier par défaut"""
+        class Config:
+            CACHE_L2_BACKEND = 'sqlite'
+            CACHE_L2_PATH = None
+
+        with pytest.raises(ValueError):
+            create_l2_backend(Config)
+
+    def test_unknown(self):
+        """Test d'un backend inconnu"""
+        class Config:
+            CACHE_L2_BACKEND = 'memcached'
+
+        with pytest.raises(ValueError):
+            create_l2_backend(Config)
@@ -0,0 +1,139 @@
+"""
+Tests pour les snapshots du cache
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.services.cache_snapshot import CacheSnapshot, open_snapshot, write_snapshot
+from app.services.tmdb_service import TMDBCache, TMDBService
+
+
+class TestCacheSnapshot:
+    """Tests du format de snapshot"""
+
+    def test_roundtrip(self, tmp_path):
+        """Test écriture puis relecture d'un snapshot"""
+        path = str(tmp_path / "cache.snap")
+        cache = TMDBCache()
+        cache.set("movie_genres", {"genres": [{"id": 28, "name": "Action"}]}, ttl=60)
+
+        assert write_snapshot(path, cache.export_entries()) == 1
+
+        snapshot = CacheSnapshot(path)
+        value, timestamp, ttl, hard_ttl = snapshot.pop("movie_genres")
+        assert value == {"genres": [{"id": 28, "name": "Action"}]}
+        assert ttl == 60
+        assert snapshot.pop("movie_genres") is None
+
+    def test_expired_entries_not_indexed(self, tmp_path):
+        """Test que les entrées expirées ne sont pas rechargées"""
+        path = str(tmp_path / "cache.snap")
+        now = time.time()
+        write_snapshot(path, [
+            ("old", now - 200, 60, 100, b"x"),
+            ("recent", now, 60, 100, b"y"),
+        ])
+
+        snapshot = CacheSnapshot(path)
+
+        assert len(snapshot) == 1
+        assert snapshot.pop("old") is None
+
+    def test_concurrent_writes(self, tmp_path):
+        """Test que des sauvegardes simultanées (plusieurs workers) laissent un snapshot valide"""
+        path = str(tmp_path / "cache.snap")
+        now = time.time()
+
+        def save(worker):
+            write_snapshot(path, [(f"key_{worker}_{index}", now, 60, 100, b"x" * 1000) for index in range(50)])
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(save, range(8)))
+
+        assert len(CacheSnapshot(path)) == 50
+        assert [child.name for child in tmp_path.iterdir()] == ["cache.snap"]
+
+    def test_invalid_file_ignored(self, tmp_path):
+        """Test qu'un fichier corrompu ou absent est ignoré"""
+        path = tmp_path / "cache.snap"
+        path.write_bytes(b"corrompu" * 4)
+
+        assert open_snapshot(str(path)) is None
+        assert open_snapshot(str(tmp_path / "absent.snap")) is None
+
+
+class TestCacheWarmStart:
+    """Tests du redémarrage à chaud du cache"""
+
+    def test_lazy_load_keeps_remaining_ttl(self, tmp_path):
+        """Test du chargement à la demande avec la durée de validité restante"""
+        path = str(tmp_path / "cache.snap")
+        writer = TMDBCache()
+        writer.set("key", {"test": "data"}, ttl=60, hard_ttl=120)
+        write_snapshot(path, writer.export_entries())
+
+        reader = TMDBCache()
+        reader.attach_snapshot(CacheSnapshot(path))
+
+        # Rien n'est désérialisé avant le premier accès
+        assert len(reader) == 0
+        assert reader.get("key") == {"test": "data"}
+        assert reader.stats()["snapshot_hits"] == 1
+        assert reader._timestamps["key"] == writer._timestamps["key"]
+
+    def test_contains_does_not_count_snapshot_hit(self, tmp_path):
+        """Test que contains() charge l'entrée du snapshot sans la compter comme lue"""
+        path = str(tmp_path / "cache.snap")
+        writer = TMDBCache()
+        writer.set("key", {"test": "data"}, ttl=60)
+        write_snapshot(path, writer.export_entries())
+
+        reader = TMDBCache()
+        reader.attach_snapshot(CacheSnapshot(path))
+
+        assert reader.contains("key")
+        assert reader.stats()["snapshot_hits"] == 0
+
+    def test_export_keeps_unloaded_entries(self, tmp_path):
+        """Test qu'un nouveau snapshot conserve les entrées jamais relues"""
+        path = str(tmp_path / "cache.snap")
+        writer = TMDBCache()
+        writer.set("a", {"v": 1})
+        writer.set("b", {"v": 2})
+        write_snapshot(path, writer.export_entries())
+
+        reader = TMDBCache()
+        reader.attach_snapshot(CacheSnapshot(path))
+        reader.get("a")
+        reader.set("c", {"v": 3})
+
+        keys = sorted(entry[0] for entry in reader.export_entries())
+        assert keys == ["a", "b", "c"]
+
+    def test_set_overrides_snapshot_entry(self, tmp_path):
+        """Test qu'une nouvelle valeur remplace celle du snapshot"""
+        path = str(tmp_path / "cache.snap")
+        writer = TMDBCache()
+        writer.set("key", {"v": "ancienne"})
+        write_snapshot(path, writer.export_entries())
+
+        reader = TMDBCache(max_entries=1)
+        reader.attach_snapshot(CacheSnapshot(path))
+        reader.set("key", {"v": "nouvelle"})
+        reader.set("other", {"v": 0})  # Évince "key" du cache mémoire
+
+        # L'ancienne valeur du snapshot n'est pas rechargée
+        assert reader.get("key") is None
+
+    def test_service_save_and_load(self, tmp_path):
+        """Test de la sauvegarde et du rechargement par le service"""
+        path = str(tmp_path / "cache.snap")
+        service = TMDBService()
+        service.cache.clear()
+        service.cache.set("movie_genres", {"genres": []}, ttl=60)
+
+        assert service.save_snapshot(path) == 1
+
+        restarted = TMDBService()
+        restarted.cache.clear()
+        assert restarted.load_snapshot(path) == 1
+        assert restarted.cache.get("movie_genres") == {"genres": []}
@@ -0,0 +1,91 @@
+"""
+Tests pour le préchauffage du cache
+"""
+from unittest.mock import patch
+from app.services.cache_warmer import CacheWarmer
+from app.services.tmdb_service import TMDBService
+
+
+class TestCacheWarmer:
+    """Tests pour le préchauffage du cache"""
+
+    def setup_method(self):
+        """Setup pour chaque test"""
+        self.service = TMDBService()
+        self.service.cache.clear()
+
+    @patch.object(TMDBService, '_make_request')
+    def test_run_fills_cache(self, mock_request, mock_genres_response):
+        """Test que toutes les pages prévues sont chargées"""
+        def fake_request(endpoint, params):
+            if endpoint == "genre/movie/list":
+                return mock_genres_response, None
+            return {"results": [], "total_pages": 10}, None
+
+        mock_request.side_effect = fake_request
+
+        report = CacheWarmer(self.service, workers=3, rate=0).run(popular_pages=2, genre_pages=2)
+
+        # genres + 2 pages populaires + 3 catégories + 3 genres x 2 pages
+        assert report["tasks"] == 12
+        assert report["errors"] == {}
+        assert report["cache_misses"] == 12
+        assert self.service.cache.get("discover_genre_35_page_2") is not None
+        assert self.service.cache.get("category_upcoming_page_1") is not None
+
+    @patch.object(TMDBService, '_make_request')
+    def test_hits_counted_per_task(self, mock_request, mock_genres_response):
+        """Test que les hits et misses comptent les tâches, pas les lectures des résumés de films"""
+        def fake_request(endpoint, params):
+            if endpoint == "genre/movie/list":
+                return mock_genres_response, None
+            return {"results": [{"id": 1, "title": "Film"}, {"id": 2, "title": "Autre"}], "total_pages": 10}, None
+
+        mock_request.side_effect = fake_request
+        warmer = CacheWarmer(self.service, workers=2, rate=0)
+        warmer.run(popular_pages=1, genre_pages=1)
+
+        report = warmer.run(popular_pages=2, genre_pages=1)
+
+        # genres + 1 page populaire + 3 catégories + 3 genres déjà en cache, seule la page 2 est nouvelle
+        assert report["tasks"] == 9
+        assert report["cache_hits"] == 8
+        assert report["cache_misses"] == 1
+
+    @patch.object(TMDBService, '_make_request')
+    def test_run_reports_errors(self, mock_request):
+        """Test que les erreurs sont rapportées sans interrompre le préchauffage"""
+        mock_request.return_value = (None, "Erreur de connexion")
+
+        report = CacheWarmer(self.service, workers=2, rate=0).run(popular_pages=1, genre_pages=1)
+
+        assert report["errors"]["genres"] == "Erreur de connexion"
+        assert report["errors"]["popular:1"] == "Erreur de connexion"
+
+    def test_cli_requires_l2(self, runner):
+        """Test que la commande refuse de s'exécuter sans cache L2 partagé"""
+        with patch('app.utils.cli.CacheWarmer') as mock_warmer:
+            result = runner.invoke(args=['cache-warm'])
+
+        assert result.exit_code != 0
+        assert "CACHE_L2_BACKEND" in result.output
+        mock_warmer.assert_not_called()
+
+    def test_cli_command(self, app, runner):
+        """Test de la commande flask cache-warm"""
+        app.config['CACHE_L2_BACKEND'] = 'redis'
+        report = {
+            "tasks": 3, "errors": {"popular:1": "Timeout"}, "duration": 0.5,
+            "slowest_call": 0.2, "average_call": 0.1,
+            "cache_hits": 1, "cache_misses": 2, "cache_entries": 2
+        }
+
+        with patch('app.utils.cli.CacheWarmer') as mock_warmer:
+            mock_warmer.return_value.run.return_value = report
+            result = runner.invoke(args=['cache-warm', '--pages', '3', '--rate', '5'])
+
+        assert result.exit_code == 0
+        assert "3 appels" in result.output
+        assert "Erreur popular:1: Timeout" in result.output
+        mock_warmer.return_value.run.assert_called_once_with(popular_pages=3, genre_pages=1)
+        assert mock_warmer.call_args.kwargs["rate"] == 5
@@ -0,0 +1,64 @@
+"""
+Tests pour le disjoncteur
+"""
+import time
+from app.services.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """Tests pour la classe CircuitBreaker"""
+
+    def test_opens_after_threshold(self):
+        """Test de l'ouverture après des échecs consécutifs"""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+        for _ in range(3):
+            assert breaker.allow_request() is True
+            breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+
+    def test_success_resets_failures(self):
+        """Test qu'un succès remet le compteur d'échecs à zéro"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_single_trial(self):
+        """Test qu'un seul appel d'essai passe après le délai"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_skipped_trial_keeps_state(self):
+        """Test qu'un essai qui n'a pas atteint le service ne referme pas le disjoncteur"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.allow_request()
+        breaker.record_skipped()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is True
+
+    def test_failed_trial_reopens(self):
+        """Test qu'un essai en échec rouvre le disjoncteur"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
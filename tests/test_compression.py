@@ -0,0 +1,108 @@
+"""
+Tests pour la compression des réponses
+"""
+import gzip
+import zlib
+from flask import Response
+from werkzeug.http import parse_accept_header
+from app.utils.compression import (
+    compress, negotiate_encoding, StreamCompressor, CompressedBodyCache, available_encodings
+)
+
+HTML = ("<div class='movie'><h3>Film</h3></div>\n" * 200).encode()
+
+
+class TestCompression:
+    """Tests des fonctions de compression"""
+
+    def test_compress_gzip_deterministic(self):
+        """Test qu'un même corps donne toujours les mêmes octets"""
+        assert compress(HTML, 'gzip', 6) == compress(HTML, 'gzip', 6)
+        assert gzip.decompress(compress(HTML, 'gzip', 6)) == HTML
+
+    def test_negotiate_encoding(self):
+        """Test du choix de l'encodage selon les préférences et le client"""
+        accepted = parse_accept_header('gzip, deflate')
+
+        assert negotiate_encoding(accepted, ('br', 'zstd', 'gzip')) == 'gzip'
+        assert negotiate_encoding(parse_accept_header('identity'), ('gzip',)) is None
+        assert negotiate_encoding(parse_accept_header('gzip;q=0'), ('gzip',)) is None
+
+    def test_negotiate_skips_missing_packages(self):
+        """Test qu'un encodage non installé n'est jamais choisi"""
+        encoding = negotiate_encoding(parse_accept_header('br, zstd, gzip'), ('br', 'zstd', 'gzip'))
+
+        assert encoding in available_encodings()
+
+    def test_stream_compressor(self):
+        """Test que chaque morceau est émis immédiatement et que le flux est valide"""
+        compressor = StreamCompressor('gzip', 6)
+        parts = [compressor.compress(HTML[:1000]), compressor.compress(HTML[1000:])]
+        parts.append(compressor.finish())
+
+        assert all(parts[:2])
+        assert zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(parts[0])
+        assert gzip.decompress(b''.join(parts)) == HTML
+
+
+class TestCompressedBodyCache:
+    """Tests pour la classe CompressedBodyCache"""
+
+    def test_identical_payload_compressed_once(self):
+        """Test que les corps identiques ne sont compressés qu'une fois"""
+        cache = CompressedBodyCache()
+
+        first = cache.compress(HTML, 'gzip', 6)
+        second = cache.compress(bytes(HTML), 'gzip', 6)
+
+        assert first is second
+        assert cache.stats()["hits"] == 1
+
+    def test_bounded_in_bytes(self):
+        """Test que la mémoire utilisée reste bornée"""
+        cache = CompressedBodyCache(max_bytes=len(compress(HTML, 'gzip', 6)) + 10)
+
+        cache.compress(HTML, 'gzip', 6)
+        cache.compress(HTML + b"x", 'gzip', 6)
+
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+class TestCompressResponse:
+    """Tests du hook compress_response"""
+
+    def test_html_compressed_and_memoized(self, app):
+        """Test de la compression d'une page et de la mémorisation du corps"""
+        app.add_url_rule('/page-test', 'page_test', lambda: HTML.decode())
+        client = app.test_client()
+
+        first = client.get('/page-test', headers={'Accept-Encoding': 'gzip'})
+        second = client.get('/page-test', headers={'Accept-Encoding': 'gzip'})
+
+        assert first.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in first.vary
+        assert gzip.decompress(first.data) == HTML
+        assert second.data == first.data
+        assert app.extensions['compression_cache'].stats()["hits"] == 1
+
+    def test_streamed_response_compressed(self, app):
+        """Test de la compression incrémentale d'une réponse en flux"""
+        chunks = [HTML[:2000].decode(), HTML[2000:].decode()]
+        app.add_url_rule('/stream-test', 'stream_test',
+                         lambda: Response((chunk for chunk in chunks), mimetype='text/html'))
+        client = app.test_client()
+
+        response = client.get('/stream-test', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        assert gzip.decompress(response.data) == HTML
+
+    def test_small_response_not_compressed(self, app):
+        """Test qu'une petite réponse n'est pas compressée"""
+        app.add_url_rule('/small-test', 'small_test', lambda: "<p>ok</p>")
+
+        response = app.test_client().get('/small-test', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in response.headers
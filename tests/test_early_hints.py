@@ -0,0 +1,67 @@
+"""
+Tests pour les indications de préchargement (103 Early Hints et en-tête Link)
+"""
+import pytest
+from unittest.mock import patch
+from app.services.projection import MovieSummary
+from app.services.tmdb_service import TMDBService, tmdb_service
+
+
+@pytest.mark.usefixtures('fake_tmdb')
+class TestEarlyHints:
+    """Tests des indications envoyées par les routes de films"""
+
+    def test_link_header(self, client):
+        """Test des ressources annoncées dans l'en-tête Link"""
+        links = client.get('/').headers['Link']
+
+        assert '</static/css/main.css>; rel=preload; as=style' in links
+        assert '</static/js/main.js>; rel=preload; as=script' in links
+        assert '<https://image.tmdb.org>; rel=preconnect' in links
+
+    @pytest.mark.parametrize('tmdb_movies', [[
+        {"id": 1, "title": "Film Test", "poster_path": "/affiche1.jpg", "vote_average": 8.0},
+        {"id": 2, "title": "Sans affiche", "vote_average": 6.0},
+    ]])
+    def test_posters_from_cached_list(self, client, app):
+        """Test que les affiches ne sont annoncées qu'une fois la liste en cache"""
+        poster = f"<{app.config['TMDB_IMAGE_BASE_URL']}/affiche1.jpg>; rel=preload; as=image"
+
+        assert poster not in client.get('/').headers['Link']
+
+        links = client.get('/').headers['Link']
+        assert poster in links
+        assert links.count('as=image') == 1
+
+    def test_early_hints_sent_before_tmdb(self, client):
+        """Test que la réponse 103 part avant l'appel à TMDB"""
+        sent = []
+        discover = tmdb_service.discover_movies_by_genre
+
+        def discover_after_hints(*args):
+            assert sent, "103 Early Hints non envoyée avant l'appel à TMDB"
+            return discover(*args)
+
+        with patch.object(tmdb_service, 'discover_movies_by_genre', side_effect=discover_after_hints):
+            response = client.get('/genre/28', environ_overrides={'wsgi.early_hints': sent.extend})
+
+        assert response.status_code == 200
+        assert ('Link', '</static/css/main.css>; rel=preload; as=style') in sent
+
+    def test_detail_poster_size(self, client, app):
+        """Test que l'affiche de la page de détail est annoncée à sa taille d'affichage"""
+        client.get('/')
+
+        links = client.get('/movie/1').headers['Link']
+
+        assert f"<{app.config['TMDB_IMAGE_BASE_URL'].replace('w500', 'w780')}/affiche1.jpg>" in links
+
+    def test_peek_does_not_touch_stats(self, app):
+        """Test que la lecture des affiches ne modifie pas les compteurs du cache"""
+        tmdb_service.cache.set(TMDBService.popular_cache_key(1), {"movie_ids": (1,)})
+        tmdb_service.movie_store.upsert(MovieSummary(1, title="Film Test", poster_path="/affiche1.jpg"))
+        before = tmdb_service.cache.stats()
+
+        assert [movie.id for movie in tmdb_service.peek_movie_list(TMDBService.popular_cache_key(1))] == [1]
+        assert tmdb_service.cache.stats() == before
+
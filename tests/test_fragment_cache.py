@@ -0,0 +1,83 @@
+"""
+Tests pour le cache des fragments de templates
+"""
+from jinja2 import Environment
+from app.utils.fragment_cache import FragmentCacheExtension
+
+
+class TestFragmentCacheExtension:
+    """Tests pour la balise {% fragment %}"""
+
+    def setup_method(self):
+        self.env = Environment(extensions=[FragmentCacheExtension], autoescape=True)
+        self.renders = 0
+
+        def count():
+            self.renders += 1
+            return ''
+
+        self.env.globals['count'] = count
+        self.template = self.env.from_string(
+            "{% fragment 'card', movie.id, movie.title %}{{ count() }}<b>{{ movie.title }}</b>{% endfragment %}"
+        )
+
+    def test_fragment_reused(self):
+        """Test qu'un fragment déjà rendu est réutilisé"""
+        first = self.template.render(movie={"id": 1, "title": "Film"})
+        second = self.template.render(movie={"id": 1, "title": "Film"})
+
+        assert first == second == "<b>Film</b>"
+        assert self.renders == 1
+        assert self.env.fragment_cache.stats()["hits"] == 1
+
+    def test_keys_change_render(self):
+        """Test qu'un changement de clé provoque un nouveau rendu"""
+        self.template.render(movie={"id": 1, "title": "Film"})
+        updated = self.template.render(movie={"id": 1, "title": "Nouveau titre"})
+
+        assert updated == "<b>Nouveau titre</b>"
+        assert self.renders == 2
+
+    def test_autoescape_preserved(self):
+        """Test que le contenu reste échappé, rendu ou réutilisé"""
+        movie = {"id": 2, "title": "<script>"}
+
+        assert self.template.render(movie=movie) == "<b>&lt;script&gt;</b>"
+        assert self.template.render(movie=movie) == "<b>&lt;script&gt;</b>"
+
+    def test_lru_bound(self):
+        """Test de l'éviction des fragments les moins récemment utilisés"""
+        self.env.fragment_cache.max_entries = 2
+        for movie_id in (1, 2, 3):
+            self.template.render(movie={"id": movie_id, "title": "Film"})
+
+        self.template.render(movie={"id": 1, "title": "Film"})
+
+        assert self.renders == 4
+        assert self.env.fragment_cache.stats()["entries"] == 2
+
+    def test_unhashable_keys(self):
+        """Test avec des listes de dictionnaires comme clés (menu des genres)"""
+        template = self.env.from_string(
+            "{% fragment 'genres', genres %}{% for g in genres %}{{ g.name }} {% endfor %}{% endfragment %}"
+        )
+
+        assert template.render(genres=[{"id": 28, "name": "Action"}]) == "Action "
+        assert template.render(genres=[{"id": 28, "name": "Action"}]) == "Action "
+
+
+class TestFragmentCacheApp:
+    """Tests du cache des fragments dans l'application"""
+
+    def test_movie_card_cached(self, app):
+        """Test que les cartes de films sont mises en cache par l'application"""
+        with app.test_request_context('/'):
+            template = app.jinja_env.get_template('components/movie_card.html')
+            context = {"movie": {"id": 1, "title": "Film Test", "vote_average": 8.0},
+                       "TMDB_IMAGE_BASE_URL": "https://image.tmdb.org/t/p/w500"}
+            first = template.render(context)
+            second = template.render(context)
+
+        assert first == second
+        assert 'Film Test' in first
+        assert app.jinja_env.fragment_cache.stats()["hits"] >= 1
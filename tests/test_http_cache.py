@@ -0,0 +1,75 @@
+"""
+Tests pour les en-têtes de cache HTTP des pages
+"""
+import pytest
+from app.services.dependencies import Dependencies
+from app.utils.http_cache import page_etag, surrogate_keys
+
+
+class TestPageEtag:
+    """Tests pour page_etag et surrogate_keys"""
+
+    def test_etag_follows_data_and_templates(self):
+        """Test que l'ETag change avec la version des données ou des templates"""
+        etag = page_etag(Dependencies({"movie_genres": 1.0}), "v1")
+
+        assert etag == page_etag(Dependencies({"movie_genres": 1.0}), "v1")
+        assert etag != page_etag(Dependencies({"movie_genres": 2.0}), "v1")
+        assert etag != page_etag(Dependencies({"movie_genres": 1.0}), "v2")
+
+    def test_no_etag_without_stable_versions(self):
+        """Test qu'aucun ETag n'est calculé pour une page sans version stable"""
+        degraded = Dependencies({"movie_genres": 1.0})
+        degraded.cacheable = False
+
+        assert page_etag(degraded, "v1") is None
+        assert page_etag(Dependencies({"movie_genres": None}), "v1") is None
+        assert page_etag(Dependencies(), "v1") is None
+
+    def test_surrogate_keys(self):
+        """Test des clés de purge CDN"""
+        keys = surrogate_keys(Dependencies({"popular_movies_page_1": 1.0, "movie_genres": 1.0}))
+
+        assert keys == "movie_genres popular_movies_page_1"
+
+
+@pytest.mark.usefixtures('fake_tmdb')
+class TestPageCacheHeaders:
+    """Tests des en-têtes de cache HTTP sur les routes"""
+
+    def test_cache_headers(self, client, app):
+        """Test des en-têtes Cache-Control, ETag et Surrogate-Key"""
+        response = client.get('/')
+        policy = app.config['HTTP_CACHE_POLICIES']['movies.home']
+
+        assert response.cache_control.public
+        assert response.cache_control.max_age == policy['max_age']
+        assert response.cache_control.s_maxage == policy['s_maxage']
+        assert response.headers['ETag']
+        assert 'popular_movies_page_1' in response.headers['Surrogate-Key'].split()
+
+    def test_not_modified(self, client):
+        """Test d'une réponse 304 sur If-None-Match"""
+        etag = client.get('/genre/28').headers['ETag']
+
+        response = client.get('/genre/28', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_etag_depends_on_encoding(self, client):
+        """Test que les représentations compressée et non compressée ont des ETags distincts"""
+        plain = client.get('/')
+        compressed = client.get('/', headers={'Accept-Encoding': 'gzip'})
+
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert compressed.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+    def test_error_page_not_cacheable(self, fake_tmdb, client):
+        """Test qu'une page rendue pendant une panne TMDB n'est pas mise en cache"""
+        fake_tmdb.side_effect = lambda endpoint, params: (None, "Service TMDB temporairement indisponible")
+
+        response = client.get('/')
+
+        assert response.cache_control.no_cache
+        assert 'ETag' not in response.headers
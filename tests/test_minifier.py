@@ -0,0 +1,64 @@
+"""
+Tests pour le minifieur CSS/JS
+"""
+from app.utils.minifier import minify_css, minify_js
+
+
+class TestMinifyCss:
+    """Tests pour minify_css"""
+
+    def test_removes_comments_and_spaces(self):
+        """Test de la suppression des commentaires et espaces superflus"""
+        css = "/* Titre */\nh1 , h2 > span {\n    color : red ;\n    margin: 0;\n}\n"
+
+        assert minify_css(css) == "h1,h2>span{color :red;margin:0}"
+
+    def test_preserves_strings(self):
+        """Test que le contenu des chaînes est conservé"""
+        css = "a::after { content: ' /* pas un commentaire */  ;} '; }"
+
+        assert minify_css(css) == "a::after{content:' /* pas un commentaire */  ;} '}"
+
+    def test_keeps_required_spaces(self):
+        """Test des espaces significatifs (descendant, calc, media queries)"""
+        css = "a :hover { width: calc(100% - 2px) }\n@media screen and (max-width: 768px) { a { b: c } }"
+
+        assert minify_css(css) == "a :hover{width:calc(100% - 2px)}@media screen and (max-width:768px){a{b:c}}"
+
+
+class TestMinifyJs:
+    """Tests pour minify_js"""
+
+    def test_removes_comments_and_spaces(self):
+        """Test de la suppression des commentaires et espaces superflus"""
+        js = "// Initialisation\nfunction init ( a , b ) {\n    /* somme */\n    return a + b;\n}\n"
+
+        assert minify_js(js) == "function init(a,b){return a+b;}"
+
+    def test_preserves_strings_and_urls(self):
+        """Test que // dans une chaîne n'est pas pris pour un commentaire"""
+        js = "const url = 'https://api.example.com//v3';  const s = \"a  //  b\";"
+
+        assert minify_js(js) == "const url='https://api.example.com//v3';const s=\"a  //  b\";"
+
+    def test_preserves_template_literals(self):
+        """Test que les gabarits, y compris imbriqués, sont conservés"""
+        js = "el.className = `flash  ${type === 'x' ? `a ${b}` : 'c'}  end`;"
+
+        assert minify_js(js) == "el.className=`flash  ${type === 'x' ? `a ${b}` : 'c'}  end`;"
+
+    def test_preserves_regex_literals(self):
+        """Test des expressions régulières littérales, distinguées de la division"""
+        js = "const re = /\\/\\/ [a-z]+/g;\nconst half = total / 2 / count;\nif (ok) return /a b/.test(s);"
+
+        assert minify_js(js) == "const re=/\\/\\/ [a-z]+/g;const half=total/2/count;if(ok)return/a b/.test(s);"
+
+    def test_keeps_newlines_needed_by_asi(self):
+        """Test que les sauts de ligne dont dépend l'insertion des points-virgules sont gardés"""
+        js = "let a = 1\nlet b = a\nreturn\nb"
+
+        assert minify_js(js) == "let a=1\nlet b=a\nreturn\nb"
+
+    def test_keeps_spaces_between_operators(self):
+        """Test que deux opérateurs ne fusionnent pas (a - -b n'est pas a--b)"""
+        assert minify_js("x = a - -b + +c;") == "x=a- -b+ +c;"
@@ -0,0 +1,127 @@
+"""
+Tests pour le cache des pages rendues
+"""
+import gzip
+import pytest
+from unittest.mock import patch
+from app.config.settings import TestingConfig
+from app.factory import create_app
+from app.services.dependencies import track_dependencies, record_dependency, mark_uncacheable
+from app.services.tmdb_service import TMDBCache
+from app.utils.page_cache import PageCache, page_cache_key
+
+
+class TestPageCache:
+    """Tests pour la classe PageCache"""
+
+    def setup_method(self):
+        self.source = TMDBCache(tracked=True)
+        self.source.set("popular", {"results": []})
+        self.pages = PageCache(self.source, max_entries=2)
+
+    def render(self, *keys):
+        """Simule un rendu lisant les clés données"""
+        with track_dependencies() as dependencies:
+            for key in keys:
+                self.source.get(key)
+        return dependencies
+
+    def test_store_and_get(self):
+        """Test qu'une page est resservie tant que ses données n'ont pas changé"""
+        self.pages.store("/", b"<html>" * 500, "text/html", self.render("popular"))
+
+        page = self.pages.get("/")
+
+        assert page is not None
+        assert gzip.decompress(page.gzipped) == page.body
+        assert page.dependencies == {"popular": self.source.version("popular")}
+
+    def test_invalidated_when_source_changes(self):
+        """Test de l'invalidation quand une entrée TMDB utilisée est réécrite"""
+        self.pages.store("/", b"<html>", "text/html", self.render("popular"))
+        self.source.set("popular", {"results": [1]})
+
+        assert self.pages.get("/") is None
+        assert self.pages.stats()["invalidations"] == 1
+
+    def test_uncacheable_render_not_stored(self):
+        """Test qu'un rendu reposant sur une erreur TMDB n'est pas mis en cache"""
+        with track_dependencies() as dependencies:
+            mark_uncacheable()
+        with track_dependencies() as stale:
+            record_dependency("popular", None)
+
+        assert self.pages.store("/", b"<html>", "text/html", dependencies) is None
+        assert self.pages.store("/", b"<html>", "text/html", stale) is None
+        assert self.pages.get("/") is None
+
+    def test_lru_bound(self):
+        """Test de l'éviction des pages les moins récemment utilisées"""
+        for path in ("/a", "/b", "/c"):
+            self.pages.store(path, b"<html>", "text/html", self.render("popular"))
+
+        assert self.pages.get("/a") is None
+        assert self.pages.get("/c") is not None
+
+
+class TestPageCacheRoutes:
+    """Tests du cache des pages sur les routes"""
+
+    @pytest.fixture
+    def cached_client(self, app, monkeypatch, fake_tmdb):
+        monkeypatch.setattr(TestingConfig, 'PAGE_CACHE_ENABLED', True)
+        return create_app('testing').test_client()
+
+    def test_page_served_from_cache(self, cached_client):
+        """Test qu'une page chaude est resservie sans nouveau rendu"""
+        first = cached_client.get('/?page=1&utm=')
+        with patch('app.routes.movies.render_home') as mock_render:
+            second = cached_client.get('/?page=1', headers={'Accept-Encoding': 'gzip'})
+
+        assert first.headers['X-Page-Cache'] == 'MISS'
+        assert second.headers['X-Page-Cache'] == 'HIT'
+        assert second.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(second.data) == first.data
+        mock_render.assert_not_called()
+
+    def test_key_normalizes_page(self, app):
+        """Test que la page par défaut ou invalide partage la clé de la page 1"""
+        keys = set()
+        for query in ('', 'page=1', 'page=abc', 'page=0', 'page=', 'utm=&page=1'):
+            with app.test_request_context(f'/?{query}'):
+                keys.add(page_cache_key())
+
+        with app.test_request_context('/genre/28?page=2'):
+            assert page_cache_key() == '/genre/28?page=2'
+        assert keys == {'/?'}
+
+    def test_key_ignores_unread_args(self, app):
+        """Test que les paramètres non lus par la vue (suivi de campagne...) ne changent pas la clé"""
+        with app.test_request_context('/?page=2&utm_source=newsletter&fbclid=abc'):
+            assert page_cache_key() == '/?page=2'
+        with app.test_request_context('/movie/1?page=2'):
+            assert page_cache_key() == '/movie/1?'
+
+    def test_tracking_args_served_from_cache(self, cached_client):
+        """Test qu'une URL avec des paramètres de suivi est servie depuis l'entrée existante"""
+        cached_client.get('/')
+
+        response = cached_client.get('/?utm_source=newsletter')
+
+        assert response.headers['X-Page-Cache'] == 'HIT'
+
+    def test_gzip_refused_by_client(self, cached_client):
+        """Test qu'une page en cache n'est pas servie compressée quand gzip est refusé (q=0)"""
+        cached_client.get('/')
+        response = cached_client.get('/', headers={'Accept-Encoding': 'gzip;q=0'})
+
+        assert response.headers['X-Page-Cache'] == 'HIT'
+        assert 'Content-Encoding' not in response.headers
+
+    def test_error_page_not_cached(self, fake_tmdb, cached_client):
+        """Test qu'une page rendue pendant une panne TMDB n'est pas mise en cache"""
+        fake_tmdb.side_effect = lambda endpoint, params: (None, "Service TMDB temporairement indisponible")
+
+        response = cached_client.get('/')
+
+        assert 'X-Page-Cache' not in response.headers
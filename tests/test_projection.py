@@ -0,0 +1,116 @@
+"""
+Tests pour la projection des réponses TMDB
+"""
+import pickle
+from app.services.projection import (
+    MovieSummary, project_movie_list, build_movie_detail, MOVIE_SUMMARY_FIELDS
+)
+
+
+TMDB_MOVIE = {
+    "id": 550,
+    "title": "Fight Club",
+    "original_title": "Fight Club",
+    "overview": "Un employé de bureau insomniaque...",
+    "poster_path": "/poster.jpg",
+    "backdrop_path": "/backdrop.jpg",
+    "release_date": "1999-10-15",
+    "vote_average": 8.4,
+    "vote_count": 26000,
+    "popularity": 61.4,
+    "genre_ids": [18, 53],
+    "adult": False,
+    "video": False,
+    "original_language": "en"
+}
+
+
+class TestMovieSummary:
+    """Tests pour la classe MovieSummary"""
+
+    def test_from_dict_keeps_only_read_fields(self):
+        """Test que seuls les champs lus par les vues sont conservés"""
+        summary = MovieSummary.from_dict(TMDB_MOVIE)
+
+        assert summary.to_dict() == {
+            "id": 550, "title": "Fight Club", "poster_path": "/poster.jpg",
+            "release_date": "1999-10-15", "vote_average": 8.4, "genre_ids": (18, 53)
+        }
+        assert not hasattr(summary, '__dict__')
+
+    def test_dict_like_access(self):
+        """Test de l'accès en lecture façon dictionnaire"""
+        summary = MovieSummary.from_dict({"id": 1, "title": "Film"})
+
+        assert summary["title"] == "Film"
+        assert summary.get("release_date") is None
+        assert summary.get("vote_average", 0) == 0
+        assert 18 not in summary.get("genre_ids", [])
+        assert summary.get("overview", "absent") == "absent"
+        assert "overview" not in summary
+
+    def test_pickle_roundtrip(self):
+        """Test que les résumés survivent au cache L2 et aux snapshots"""
+        summary = MovieSummary.from_dict(TMDB_MOVIE)
+        restored = pickle.loads(pickle.dumps(summary))
+
+        assert restored == summary
+        assert len(pickle.dumps(summary)) < len(pickle.dumps(TMDB_MOVIE))
+
+
+class TestProjectMovieList:
+    """Tests pour project_movie_list"""
+
+    def test_project_list(self):
+        """Test de la projection d'une liste paginée"""
+        data = {"page": 2, "total_pages": 10, "total_results": 200,
+                "dates": {"minimum": "2024-01-01"}, "results": [TMDB_MOVIE]}
+
+        projected = project_movie_list(data)
+
+        assert set(projected) == {"page", "total_pages", "total_results", "results"}
+        assert isinstance(projected["results"][0], MovieSummary)
+        assert set(projected["results"][0].to_dict()) == set(MOVIE_SUMMARY_FIELDS)
+
+
+class TestBuildMovieDetail:
+    """Tests pour build_movie_detail"""
+
+    def test_view_model(self):
+        """Test du modèle de vue de la page de détail"""
+        data = {
+            **TMDB_MOVIE,
+            "runtime": 139,
+            "genres": [{"id": 18, "name": "Drame"}],
+            "credits": {
+                "cast": [{"name": f"Acteur {i}", "character": "Rôle", "profile_path": None, "order": i}
+                         for i in range(15)],
+                "crew": [{"job": "Producer", "name": "Producteur"}, {"job": "Director", "name": "David Fincher"}]
+            },
+            "videos": {"results": [
+                {"type": "Teaser", "site": "YouTube", "key": "a", "name": "Teaser"},
+                {"type": "Trailer", "site": "Vimeo", "key": "b", "name": "Vimeo"},
+                *[{"type": "Trailer", "site": "YouTube", "key": f"t{i}", "name": "Trailer"} for i in range(5)]
+            ]},
+            "similar": {"results": [{"id": i} for i in range(10)]},
+            "recommendations": {"results": [{"id": 1}]}
+        }
+
+        detail = build_movie_detail(data)
+
+        assert detail["title"] == "Fight Club"
+        assert detail["genres"] == [{"id": 18, "name": "Drame"}]
+        assert len(detail["cast"]) == 10
+        assert set(detail["cast"][0]) == {"name", "character", "profile_path"}
+        assert detail["director"] == "David Fincher"
+        assert [trailer["key"] for trailer in detail["trailers"]] == ["t0", "t1", "t2"]
+        assert len(detail["similar"]) == 6
+        assert "credits" not in detail and "videos" not in detail and "recommendations" not in detail
+
+    def test_view_model_without_appended_data(self):
+        """Test avec une réponse sans crédits, vidéos ni films similaires"""
+        detail = build_movie_detail({"id": 1, "title": "Film", "vote_average": None})
+
+        assert detail["cast"] == [] and detail["trailers"] == [] and detail["similar"] == []
+        assert detail["director"] is None
+        assert detail["vote_average"] == 0
@@ -0,0 +1,94 @@
+"""
+Tests pour la limitation de débit des appels sortants
+"""
+import time
+from email.utils import formatdate
+from app.services.rate_limit import (
+    TokenBucket, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL,
+    backoff_delay, current_priority, parse_retry_after, request_priority
+)
+
+
+class TestTokenBucket:
+    """Tests pour le seau à jetons"""
+
+    def test_burst_then_empty(self):
+        """Test qu'un seau plein autorise une rafale puis se vide"""
+        bucket = TokenBucket(rate=1, capacity=3)
+
+        assert all(bucket.try_acquire() for _ in range(3))
+        assert bucket.try_acquire() is False
+
+    def test_acquire_waits_for_refill(self):
+        """Test que acquire attend le remplissage du seau"""
+        bucket = TokenBucket(rate=50, capacity=1)
+        bucket.acquire()
+
+        start = time.monotonic()
+        assert bucket.acquire(timeout=1) is True
+        assert time.monotonic() - start >= 0.01
+
+    def test_acquire_timeout(self):
+        """Test du délai maximum d'attente"""
+        bucket = TokenBucket(rate=0.1, capacity=1)
+        bucket.acquire()
+
+        assert bucket.acquire(timeout=0.01) is False
+
+    def test_reserve_kept_for_higher_priorities(self):
+        """Test qu'une réserve de jetons bloque les appels peu prioritaires"""
+        bucket = TokenBucket(rate=0.1, capacity=4)
+
+        assert bucket.try_acquire(reserve=2) is True
+        assert bucket.try_acquire(reserve=2) is True
+        assert bucket.try_acquire(reserve=2) is False
+        # Les appels prioritaires peuvent encore consommer la réserve
+        assert bucket.try_acquire() is True
+
+    def test_penalize_suspends_calls(self):
+        """Test que penalize vide le seau"""
+        bucket = TokenBucket(rate=10, capacity=10)
+        bucket.penalize(1)
+
+        assert bucket.try_acquire() is False
+
+
+class TestRequestPriority:
+    """Tests pour la priorité des appels"""
+
+    def test_default_priority(self):
+        """Test de la priorité par défaut"""
+        assert current_priority() == PRIORITY_NORMAL
+        assert current_priority(PRIORITY_HIGH) == PRIORITY_HIGH
+
+    def test_context_priority(self):
+        """Test que la priorité du contexte prime sur la valeur par défaut"""
+        with request_priority(PRIORITY_LOW):
+            assert current_priority(PRIORITY_HIGH) == PRIORITY_LOW
+
+        assert current_priority() == PRIORITY_NORMAL
+
+
+class TestBackoff:
+    """Tests pour le délai entre deux tentatives"""
+
+    def test_backoff_delay_bounds(self):
+        """Test que le délai reste borné"""
+        delays = [backoff_delay(attempt, 0.5, 4) for attempt in range(10) for _ in range(10)]
+
+        assert all(0 <= delay <= 4 for delay in delays)
+
+    def test_parse_retry_after_seconds(self):
+        """Test d'un Retry-After en secondes"""
+        assert parse_retry_after("3") == 3.0
+
+    def test_parse_retry_after_http_date(self):
+        """Test d'un Retry-After sous forme de date HTTP"""
+        delay = parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+
+        assert 25 <= delay <= 31
+
+    def test_parse_retry_after_invalid(self):
+        """Test d'un Retry-After absent ou invalide"""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("bientôt") is None
@@ -3,6 +3,7 @@ Tests pour les routes de l'application
 """
 import pytest
 from unittest.mock import patch, MagicMock
+from app.services.projection import MovieSummary
 
 
 class TestHomeRoute:
@@ -141,6 +142,72 @@ class TestGenreRoute:
         assert response.status_code == 404
 
 
+class TestCategoryRoute:
+    """Tests pour la route catégorie"""
+
+    @patch('app.routes.movies.tmdb_service.get_movies_by_category')
+    def test_category_success(self, mock_category, client, mock_tmdb_response):
+        """Test d'une catégorie avec succès"""
+        mock_category.return_value = (mock_tmdb_response, None)
+
+        response = client.get('/category/now_playing?page=2')
+
+        assert response.status_code == 200
+        assert b'Film Test' in response.data
+        mock_category.assert_called_once_with('now_playing', 2)
+
+    def test_category_unknown(self, client):
+        """Test avec une catégorie inconnue"""
+        response = client.get('/category/inconnue')
+
+        assert response.status_code == 404
+
+
+class TestMovieDetailRoute:
+    """Tests pour la route de détail d'un film"""
+
+    @patch('app.routes.movies.tmdb_service.get_movie_details')
+    def test_movie_detail_success(self, mock_details, client):
+        """Test de la page de détail avec succès"""
+        mock_details.return_value = ({
+            "id": 1, "title": "Film Test", "vote_average": 8.5, "vote_count": 42,
+            "cast": [{"name": "Acteur Test", "character": "Rôle", "profile_path": None}],
+            "director": "Réalisateur Test", "trailers": [], "similar": []
+        }, None)
+
+        response = client.get('/movie/1')
+
+        assert response.status_code == 200
+        assert b'Film Test' in response.data
+        assert b'42 votes' in response.data
+        assert b'Acteur Test' in response.data
+        assert 'Réalisateur Test'.encode() in response.data
+
+    @patch('app.routes.movies.tmdb_service.get_movie_summary')
+    @patch('app.routes.movies.tmdb_service.get_movie_details')
+    def test_movie_detail_partial_from_summary(self, mock_details, mock_summary, client):
+        """Test de la page partielle construite depuis le magasin si TMDB est indisponible"""
+        mock_details.return_value = (None, "Service TMDB temporairement indisponible")
+        mock_summary.return_value = MovieSummary(id=1, title="Film Test", vote_average=8.5)
+
+        response = client.get('/movie/1')
+
+        assert response.status_code == 200
+        assert b'Film Test' in response.data
+        assert 'momentanément indisponibles'.encode() in response.data
+
+    @patch('app.routes.movies.tmdb_service.get_movie_summary')
+    @patch('app.routes.movies.tmdb_service.get_movie_details')
+    def test_movie_detail_not_found(self, mock_details, mock_summary, client):
+        """Test qu'un film inexistant n'utilise pas le magasin"""
+        mock_details.return_value = (None, "Ressource non trouvée")
+
+        response = client.get('/movie/1')
+
+        assert 'Ressource non trouvée'.encode() in response.data
+        mock_summary.assert_not_called()
+
+
 class TestErrorHandling:
     """Tests pour la gestion d'erreurs"""
 
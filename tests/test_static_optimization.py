@@ -0,0 +1,197 @@
+"""
+Tests pour l'optimisation des ressources statiques
+"""
+import gzip
+import json
+import os
+import re
+import pytest
+from flask import url_for
+from app.utils.static_optimization import (
+    ASSET_MANIFEST, create_optimized_static_files, load_asset_manifest, precompress_file
+)
+
+CSS = "body { color: #333; }\n" * 200
+
+
+class TestPrecompressFile:
+    """Tests pour precompress_file"""
+
+    def test_writes_gzip_variant(self, tmp_path):
+        """Test de l'écriture de la variante .gz"""
+        asset = tmp_path / "main.css"
+        asset.write_text(CSS)
+
+        written = precompress_file(asset)
+
+        assert tmp_path / "main.css.gz" in written
+        assert gzip.decompress((tmp_path / "main.css.gz").read_bytes()).decode() == CSS
+
+    def test_skips_incompressible(self, tmp_path):
+        """Test qu'aucune variante plus grosse que l'original n'est écrite"""
+        asset = tmp_path / "tiny.js"
+        asset.write_text("a")
+
+        assert precompress_file(asset) == []
+        assert not (tmp_path / "tiny.js.gz").exists()
+
+
+class TestPrecompressedStatic:
+    """Tests du service des variantes précompressées"""
+
+    @pytest.fixture
+    def static_client(self, app, tmp_path):
+        (tmp_path / "css").mkdir()
+        asset = tmp_path / "css" / "main.css"
+        asset.write_text(CSS)
+        precompress_file(asset)
+        app.static_folder = str(tmp_path)
+        return app.test_client()
+
+    def test_serves_gzip_variant(self, static_client, tmp_path):
+        """Test que la variante .gz est servie si le client l'accepte"""
+        response = static_client.get('/static/css/main.css', headers={'Accept-Encoding': 'gzip, deflate'})
+        gzipped = (tmp_path / "css" / "main.css.gz").read_bytes()
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Content-Length'] == str(len(gzipped))
+        assert response.mimetype == 'text/css'
+        assert 'Accept-Encoding' in response.vary
+        assert response.data == gzipped
+
+    def test_prefers_brotli(self, static_client, tmp_path):
+        """Test que la variante .br est préférée quand elle existe"""
+        (tmp_path / "css" / "main.css.br").write_bytes(b"brotli")
+
+        response = static_client.get('/static/css/main.css', headers={'Accept-Encoding': 'gzip, br'})
+
+        assert response.headers['Content-Encoding'] == 'br'
+        assert response.data == b"brotli"
+
+    def test_stale_variant_ignored(self, static_client, tmp_path):
+        """Test qu'une variante plus ancienne que la source modifiée n'est pas servie"""
+        source = tmp_path / "css" / "main.css"
+        source.write_text(CSS + "a { color: red; }")
+        variant_mtime = (tmp_path / "css" / "main.css.gz").stat().st_mtime
+        os.utime(source, (variant_mtime + 10, variant_mtime + 10))
+
+        response = static_client.get('/static/css/main.css', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.data.decode().endswith("a { color: red; }")
+
+    def test_identity_without_accept_encoding(self, static_client):
+        """Test que l'original est servi si le client n'accepte pas la compression"""
+        response = static_client.get('/static/css/main.css', headers={'Accept-Encoding': 'identity'})
+
+        assert 'Content-Encoding' not in response.headers
+        assert 'Accept-Encoding' in response.vary
+        assert response.data.decode() == CSS
+
+
+class TestIncrementalBuild:
+    """Tests du build incrémental des ressources"""
+
+    def test_unchanged_files_are_skipped(self, app, tmp_path, capsys):
+        """Test qu'un fichier inchangé n'est ni reminifié ni reprécompressé"""
+        (tmp_path / "css").mkdir()
+        source = tmp_path / "css" / "main.css"
+        source.write_text(CSS)
+        app.static_folder = str(tmp_path)
+
+        create_optimized_static_files(app)
+        capsys.readouterr()
+        create_optimized_static_files(app)
+
+        output = capsys.readouterr().out
+        assert "minifié" not in output
+        assert "Précompressé" not in output
+
+        source.write_text(CSS + "a { color: red; }")
+        create_optimized_static_files(app)
+
+        assert "CSS minifié: main.css" in capsys.readouterr().out
+        assert (tmp_path / "css" / "main.min.css").read_text().endswith("a{color:red}")
+
+    def test_deleted_variant_rebuilt(self, app, tmp_path, capsys):
+        """Test qu'une variante supprimée est réécrite même si la source n'a pas changé"""
+        (tmp_path / "css").mkdir()
+        (tmp_path / "css" / "main.css").write_text(CSS)
+        app.static_folder = str(tmp_path)
+
+        create_optimized_static_files(app)
+        (tmp_path / "css" / "main.css.gz").unlink()
+        capsys.readouterr()
+        create_optimized_static_files(app)
+
+        assert "Précompressé: main.css -> main.css.gz" in capsys.readouterr().out
+        assert (tmp_path / "css" / "main.css.gz").exists()
+
+    def test_force_rebuilds(self, app, tmp_path, capsys):
+        """Test que force reconstruit les fichiers inchangés"""
+        (tmp_path / "main.js").write_text("var a = 1;\n" * 100)
+        app.static_folder = str(tmp_path)
+
+        create_optimized_static_files(app)
+        capsys.readouterr()
+        create_optimized_static_files(app, force=True)
+
+        assert "JS minifié: main.js" in capsys.readouterr().out
+
+
+class TestAssetManifest:
+    """Tests des ressources versionnées par leur contenu"""
+
+    @pytest.fixture
+    def built_app(self, app, tmp_path):
+        (tmp_path / "css").mkdir()
+        (tmp_path / "css" / "main.css").write_text(CSS)
+        app.static_folder = str(tmp_path)
+        create_optimized_static_files(app)
+        load_asset_manifest(app)
+        return app
+
+    def test_manifest_maps_to_hashed_minified_copy(self, built_app, tmp_path):
+        """Test que la copie versionnée reprend la version minifiée"""
+        manifest = json.loads((tmp_path / ASSET_MANIFEST).read_text())
+        hashed = manifest['css/main.css']
+
+        assert re.fullmatch(r'dist/css/main\.[0-9a-f]{12}\.css', hashed)
+        assert (tmp_path / hashed).read_text() == (tmp_path / "css" / "main.min.css").read_text()
+        assert (tmp_path / (hashed + '.gz')).exists()
+
+    def test_hash_changes_with_content(self, built_app, tmp_path):
+        """Test qu'une modification du fichier change son nom versionné"""
+        first = built_app.extensions['asset_manifest']['css/main.css']
+        (tmp_path / "css" / "main.css").write_text(CSS + "a { color: red; }")
+        create_optimized_static_files(built_app)
+
+        assert load_asset_manifest(built_app)['css/main.css'] != first
+        assert (tmp_path / first).exists()
+
+    def test_url_for_emits_hashed_name(self, built_app):
+        """Test que url_for pointe vers la copie versionnée"""
+        hashed = built_app.extensions['asset_manifest']['css/main.css']
+
+        with built_app.test_request_context():
+            assert url_for('static', filename='css/main.css') == f'/static/{hashed}'
+            assert url_for('static', filename='images/logo.png') == '/static/images/logo.png'
+
+    def test_hashed_asset_is_immutable(self, built_app):
+        """Test du cache immuable d'un an des copies versionnées"""
+        hashed = built_app.extensions['asset_manifest']['css/main.css']
+
+        response = built_app.test_client().get(f'/static/{hashed}')
+
+        assert response.status_code == 200
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == 365 * 24 * 3600
+        assert 'no-cache' not in response.headers['Cache-Control']
+
+    def test_source_asset_keeps_short_cache(self, built_app):
+        """Test que les fichiers non versionnés gardent un cache court"""
+        response = built_app.test_client().get('/static/css/main.css')
+
+        assert not response.cache_control.immutable
+        assert response.cache_control.max_age == 86400
@@ -0,0 +1,109 @@
+"""
+Tests pour le rendu en flux des pages de films
+"""
+import gzip
+import threading
+import pytest
+from app.services.projection import MovieSummary
+from app.services.tmdb_service import tmdb_service
+
+
+@pytest.mark.usefixtures('fake_tmdb')
+class TestStreamedRendering:
+    """Tests des pages envoyées en flux quand leurs données ne sont pas en cache"""
+
+    @pytest.fixture(autouse=True)
+    def streamed_app(self, app):
+        app.config['STREAMED_RENDERING'] = True
+        return app
+
+    def test_cold_page_streamed(self, client):
+        """Test qu'une page absente du cache est envoyée en flux, complète"""
+        response = client.get('/')
+        html = response.get_data(as_text=True)
+
+        assert 'Content-Length' not in response.headers
+        assert response.status_code == 200
+        assert html.index('class="navbar"') < html.index('stream-placeholder') < html.index('Film Test')
+        assert html.rstrip().endswith('</html>')
+
+    def test_shell_sent_before_tmdb(self, fake_tmdb, client):
+        """Test que le <head>, la barre de navigation et le squelette partent avant la réponse de TMDB"""
+        answered = threading.Event()
+        respond = fake_tmdb.side_effect
+
+        def slow_tmdb(endpoint, params):
+            if endpoint != "genre/movie/list":
+                assert answered.wait(5)
+            return respond(endpoint, params)
+
+        fake_tmdb.side_effect = slow_tmdb
+        response = client.get('/genre/28', buffered=False)
+        chunks = iter(response.response)
+        try:
+            first = next(chunks).decode()
+            assert '<title>Action - Ivoire Ciné</title>' in first
+            assert 'class="navbar"' in first
+            assert 'stream-placeholder' in first
+            assert 'Film Test' not in first
+
+            answered.set()
+            assert 'Film Test' in b''.join(chunks).decode()
+        finally:
+            answered.set()
+            response.close()
+
+    def test_streamed_page_compressed(self, client):
+        """Test de la compression d'une page en flux"""
+        response = client.get('/category/top_rated', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Film Test' in gzip.decompress(response.data).decode()
+
+    def test_streamed_page_not_cached(self, client):
+        """Test qu'une page en flux n'a ni ETag ni cache partagé"""
+        response = client.get('/')
+
+        assert response.headers.get('ETag') is None
+        assert 'Surrogate-Key' not in response.headers
+        assert response.cache_control.no_cache
+
+    def test_warm_page_not_streamed(self, client):
+        """Test qu'une page dont les données sont en cache est rendue d'un bloc"""
+        client.get('/')
+
+        response = client.get('/')
+
+        assert 'Content-Length' in response.headers
+        assert response.headers.get('ETag') is not None
+
+    def test_stale_page_not_streamed(self, client):
+        """Test qu'une page dont les données sont seulement périmées n'est pas en flux"""
+        client.get('/')
+        tmdb_service.cache._timestamps["popular_movies_page_1"] -= tmdb_service.cache._ttls["popular_movies_page_1"] + 1
+
+        response = client.get('/')
+
+        assert 'Content-Length' in response.headers
+
+    def test_error_message_streamed(self, fake_tmdb, client):
+        """Test que l'erreur TMDB est affichée dans la page déjà envoyée"""
+        fake_tmdb.side_effect = lambda endpoint, params: (None, "TMDB indisponible")
+        html = client.get('/').get_data(as_text=True)
+
+        assert 'class="navbar"' in html
+        assert 'class="error-container"' in html
+        assert 'TMDB indisponible' in html
+
+    def test_detail_streamed_from_summary(self, client):
+        """Test que la page de détail n'est en flux que si le film est déjà connu"""
+        assert 'Content-Length' in client.get('/movie/1').headers
+
+        tmdb_service.cache.clear()
+        tmdb_service.movie_store.upsert(MovieSummary(1, title="Film Test"))
+        response = client.get('/movie/1')
+        html = response.get_data(as_text=True)
+
+        assert 'Content-Length' not in response.headers
+        assert '<title>Film Test - Ivoire Ciné</title>' in html
+        assert 'Synopsis complet' in html
@@ -1,9 +1,18 @@
 """
 Tests pour le service TMDB
 """
+import io
 import pytest
 from unittest.mock import patch, MagicMock
-from app.services.tmdb_service import TMDBService, TMDBCache
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.response import HTTPResponse
+from app.services.tmdb_service import (
+    TMDBService, TMDBCache, SingleFlight, ERROR_RATE_LIMITED, ERROR_TOO_MANY_REQUESTS, ERROR_UNEXPECTED, config
+)
+from app.services.rate_limit import PRIORITY_HIGH, PRIORITY_LOW, current_priority, request_priority
+from app.services.projection import MovieSummary
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
 
 
@@ -41,6 +50,137 @@ class TestTMDBCache:
 
         assert cache.get("test_key") is None
 
+    def test_cache_custom_ttl(self):
+        """Test d'une durée de validité spécifique à une clé"""
+        cache = TMDBCache()
+        cache.set("short", {"test": "data"}, ttl=10)
+        cache.set("long", {"test": "data"}, ttl=86400)
+        cache._timestamps["short"] = time.time() - 20
+        cache._timestamps["long"] = time.time() - 7200
+
+        assert cache.get("short") is None
+        assert cache.get("long") == {"test": "data"}
+
+    def test_cache_stale_entry(self):
+        """Test d'une entrée périmée encore servie jusqu'au hard TTL"""
+        cache = TMDBCache()
+        cache.set("key", {"test": "data"}, ttl=10, hard_ttl=100)
+        cache._timestamps["key"] = time.time() - 50
+
+        assert cache.get("key") is None
+        assert cache.get_entry("key") == ({"test": "data"}, True)
+
+        cache._timestamps["key"] = time.time() - 150
+        assert cache.get_entry("key") is None
+
+    def test_cache_peek_during_grace(self):
+        """Test que la dernière valeur connue reste accessible pendant le délai de grâce"""
+        cache = TMDBCache(grace=1000)
+        cache.set("key", {"test": "data"}, ttl=10)
+        cache._timestamps["key"] = time.time() - 100
+
+        assert cache.get_entry("key") is None
+        assert cache.peek("key") == {"test": "data"}
+
+        cache._timestamps["key"] = time.time() - 2000
+        assert cache.peek("key") is None
+
+    def test_cache_lru_eviction_by_entries(self):
+        """Test de l'éviction LRU quand le nombre d'entrées est dépassé"""
+        cache = TMDBCache(max_entries=2)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+        cache.get("a")  # "a" devient la plus récemment utilisée
+        cache.set("c", {"v": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": 1}
+        assert cache.get("c") == {"v": 3}
+        assert cache.stats()["evictions"] == 1
+
+    def test_cache_eviction_by_bytes(self):
+        """Test de l'éviction quand le budget mémoire est dépassé"""
+        cache = TMDBCache(max_bytes=2000)
+        for i in range(10):
+            cache.set(f"key_{i}", {"payload": "x" * 300})
+
+        stats = cache.stats()
+        assert stats["bytes"] <= 2000
+        assert stats["evictions"] > 0
+        assert cache.get("key_9") is not None
+        assert cache.get("key_0") is None
+
+    def test_cache_value_larger_than_budget_not_stored(self):
+        """Test qu'une valeur plus grosse que le budget n'est pas mise en cache"""
+        cache = TMDBCache(max_bytes=100)
+        cache.set("big", {"payload": "x" * 1000})
+
+        assert cache.get("big") is None
+        assert len(cache) == 0
+
+    def test_cache_sweep_removes_unread_expired_entries(self):
+        """Test que la purge périodique supprime les entrées expirées jamais relues"""
+        cache = TMDBCache(sweep_interval=0)
+        cache.set("old", {"test": "data"})
+        cache._timestamps["old"] = time.time() - 3700
+
+        cache.set("new", {"test": "data"})
+
+        assert "old" not in cache._cache
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["entries"] == 1
+
+    def test_cache_hit_miss_counters(self):
+        """Test des compteurs de hits et de misses"""
+        cache = TMDBCache()
+        cache.set("key", {"test": "data"})
+        cache.get("key")
+        cache.get("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+
+class TestSingleFlight:
+    """Tests pour la déduplication des appels concurrents"""
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Test qu'un seul appel est effectué pour des appelants concurrents"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(timeout=5)
+            return {"id": 1}, None
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(flight.do, "movie_details_1", fetch) for _ in range(5)]
+            deadline = time.time() + 5
+            while flight.coalesced < 4 and time.time() < deadline:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert len(calls) == 1
+        assert flight.coalesced == 4
+        assert all(result == ({"id": 1}, None) for result in results)
+
+    def test_exception_shared_with_waiters(self):
+        """Test que l'exception du premier appel est propagée"""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("échec")
+
+        with pytest.raises(ValueError):
+            flight.do("key", fail)
+
+        # La clé est libérée après l'échec
+        assert flight.do("key", lambda: "ok") == "ok"
+
 
 class TestTMDBService:
     """Tests pour la classe TMDBService"""
@@ -50,7 +190,7 @@ class TestTMDBService:
         self.service = TMDBService()
         self.service.cache.clear()  # Nettoyer le cache entre les tests
 
-    @patch('app.services.tmdb_service.requests.get')
+    @patch('app.services.tmdb_service.requests.Session.get')
     def test_make_request_success(self, mock_get):
         """Test d'une requête réussie"""
         mock_response = MagicMock()
@@ -64,7 +204,7 @@ class TestTMDBService:
         assert result == {"results": []}
         mock_get.assert_called_once()
 
-    @patch('app.services.tmdb_service.requests.get')
+    @patch('app.services.tmdb_service.requests.Session.get')
     def test_make_request_timeout(self, mock_get):
         """Test d'une requête avec timeout"""
         mock_get.side_effect = Exception("Timeout")
@@ -74,7 +214,7 @@ class TestTMDBService:
         assert result is None
         assert "Erreur inattendue" in error
 
-    @patch('app.services.tmdb_service.requests.get')
+    @patch('app.services.tmdb_service.requests.Session.get')
     def test_make_request_401(self, mock_get):
         """Test d'une requête avec erreur 401"""
         mock_response = MagicMock()
@@ -86,7 +226,7 @@ class TestTMDBService:
         assert result is None
         assert "Clé API invalide" in error
 
-    @patch('app.services.tmdb_service.requests.get')
+    @patch('app.services.tmdb_service.requests.Session.get')
     def test_make_request_404(self, mock_get):
         """Test d'une requête avec erreur 404"""
         mock_response = MagicMock()
@@ -98,6 +238,281 @@ class TestTMDBService:
         assert result is None
         assert "Ressource non trouvée" in error
 
+    @patch('app.services.tmdb_service.time.sleep')
+    @patch('app.services.tmdb_service.requests.Session.get')
+    def test_make_request_retries_transient_errors(self, mock_get, mock_sleep):
+        """Test des nouvelles tentatives sur une erreur 503 transitoire"""
+        unavailable = MagicMock(status_code=503)
+        success = MagicMock(status_code=200)
+        success.json.return_value = {"results": []}
+        mock_get.side_effect = [unavailable, success]
+
+        result, error = self.service._make_request("test/endpoint", {})
+
+        assert error is None
+        assert result == {"results": []}
+        assert mock_get.call_count == 2
+        assert self.service.get_stats()["retries"] == 1
+
+    @patch('app.services.tmdb_service.requests.Session.get')
+    def test_make_request_429_honors_retry_after(self, mock_get):
+        """Test qu'un 429 suspend les appels pendant Retry-After"""
+        too_many = MagicMock(status_code=429, headers={"Retry-After": "0"})
+        success = MagicMock(status_code=200)
+        success.json.return_value = {"results": []}
+        mock_get.side_effect = [too_many, success]
+
+        with patch.object(self.service._rate_limiter, 'penalize') as mock_penalize:
+            result, error = self.service._make_request("test/endpoint", {})
+
+        assert error is None
+        mock_penalize.assert_called_once()
+
+    @patch('app.services.tmdb_service.requests.Session.get')
+    def test_make_request_429_long_retry_after_gives_up(self, mock_get):
+        """Test qu'un Retry-After trop long renvoie directement l'erreur"""
+        mock_get.return_value = MagicMock(status_code=429, headers={"Retry-After": "120"})
+
+        result, error = self.service._make_request("test/endpoint", {})
+
+        assert result is None
+        assert "Trop de requêtes" in error
+        assert mock_get.call_count == 1
+
+    @patch('app.services.tmdb_service.requests.Session.get')
+    def test_make_request_rate_limited_locally(self, mock_get):
+        """Test qu'aucun appel n'est fait quand le seau reste vide"""
+        with patch.object(self.service._rate_limiter, 'acquire', return_value=False):
+            result, error = self.service._make_request("test/endpoint", {})
+
+        assert result is None
+        assert "Trop de requêtes" in error
+        mock_get.assert_not_called()
+
+    @patch.object(TMDBService, '_make_request')
+    def test_endpoint_priority_applied(self, mock_request):
+        """Test que la priorité de la famille d'endpoints est appliquée"""
+        priorities = []
+
+        def record_priority(endpoint, params):
+            priorities.append(current_priority())
+            return {"id": 1}, None
+
+        mock_request.side_effect = record_priority
+
+        self.service.get_movie_details(1)
+        with request_priority(PRIORITY_LOW):
+            self.service.get_movie_details(2)
+
+        assert priorities == [PRIORITY_HIGH, PRIORITY_LOW]
+
+    @patch.object(TMDBService, '_make_request')
+    def test_circuit_breaker_fails_fast(self, mock_request):
+        """Test que le disjoncteur ouvert évite d'appeler TMDB"""
+        mock_request.return_value = (None, "Timeout - service trop lent")
+
+        for page in range(config.CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+            self.service.get_popular_movies(page + 1)
+        result, error = self.service.get_popular_movies(99)
+
+        assert result is None
+        assert error == "Service temporairement indisponible"
+        assert mock_request.call_count == config.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        stats = self.service.get_stats()
+        assert stats["short_circuited"] == 1
+        assert stats["circuit_breakers"]["popular"]["state"] == "open"
+
+    def test_local_rate_limit_leaves_breaker_unchanged(self):
+        """Test qu'un appel bloqué par le seau local ne compte pas comme un succès de TMDB"""
+        breaker = self.service._breaker_for("popular")
+        for _ in range(config.CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+            breaker.record_failure()
+        breaker._opened_at -= config.CIRCUIT_BREAKER_RESET_TIMEOUT
+
+        with patch.object(self.service._rate_limiter, 'acquire', return_value=False):
+            result, error = self.service.get_popular_movies(1)
+
+        assert result is None
+        assert error == ERROR_RATE_LIMITED
+        assert breaker.state == "half_open"
+
+    @pytest.mark.parametrize('error', [ERROR_TOO_MANY_REQUESTS, ERROR_UNEXPECTED])
+    @patch.object(TMDBService, '_make_request')
+    def test_upstream_error_reopens_half_open_breaker(self, mock_request, error):
+        """Test qu'un 429 persistant ou une réponse illisible rouvre un disjoncteur à demi ouvert"""
+        breaker = self.service._breaker_for("popular")
+        for _ in range(config.CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+            breaker.record_failure()
+        breaker._opened_at -= config.CIRCUIT_BREAKER_RESET_TIMEOUT
+        mock_request.return_value = (None, error)
+
+        result, returned_error = self.service.get_popular_movies(1)
+
+        assert result is None
+        assert returned_error == error
+        assert breaker.state == "open"
+
+    @patch.object(TMDBService, '_make_request')
+    def test_circuit_breaker_per_endpoint_family(self, mock_request):
+        """Test que les disjoncteurs sont indépendants par famille d'endpoints"""
+        mock_request.return_value = (None, "Erreur de connexion")
+        for page in range(config.CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+            self.service.get_popular_movies(page + 1)
+
+        mock_request.return_value = ({"genres": []}, None)
+        result, error = self.service.get_genres()
+
+        assert error is None
+        assert result == {"genres": []}
+
+    @patch.object(TMDBService, '_make_request')
+    def test_last_good_value_served_on_failure(self, mock_request):
+        """Test que la dernière valeur connue est servie si TMDB est en panne"""
+        mock_request.return_value = ({"id": 1, "title": "Film"}, None)
+        self.service.get_movie_details(1)
+        # Au-delà du hard TTL (mais dans la période de grâce) : un appel synchrone est nécessaire
+        self.service.cache._timestamps["movie_details_1"] -= self.service.cache._hard_ttls["movie_details_1"] + 1
+
+        mock_request.return_value = (None, "Timeout - service trop lent")
+        result, error = self.service.get_movie_details(1)
+
+        assert error is None
+        assert result["title"] == "Film"
+        assert self.service.get_stats()["last_good_served"] == 1
+
+    @patch.object(TMDBService, '_make_request')
+    def test_list_projected_before_caching(self, mock_request):
+        """Test que les listes sont projetées en résumés compacts et mises en cache par identifiants"""
+        mock_request.return_value = ({
+            "page": 1, "total_pages": 900,
+            "results": [{"id": 1, "title": "Film", "overview": "Long résumé", "popularity": 12.3}]
+        }, None)
+
+        result, error = self.service.get_popular_movies(1)
+        cached = self.service.cache.get("popular_movies_page_1")
+
+        assert error is None
+        assert result["total_pages"] == 500
+        assert isinstance(result["results"][0], MovieSummary)
+        assert "overview" not in result["results"][0]
+        assert cached["movie_ids"] == (1,)
+
+    @patch.object(TMDBService, '_make_request')
+    def test_movie_stored_once_across_lists(self, mock_request):
+        """Test qu'un film présent dans plusieurs listes n'est stocké qu'une fois"""
+        mock_request.return_value = ({"page": 1, "results": [{"id": 7, "title": "Film"}]}, None)
+
+        popular, _ = self.service.get_popular_movies(1)
+        found, _ = self.service.search_movies("film")
+
+        assert popular["results"][0] is found["results"][0]
+        assert self.service.get_movie_summary(7).title == "Film"
+
+    @patch.object(TMDBService, '_make_request')
+    def test_unchanged_summary_keeps_version(self, mock_request):
+        """Test qu'un résumé inchangé n'est pas réécrit (pages en cache toujours valides)"""
+        mock_request.return_value = ({"page": 1, "results": [{"id": 7, "title": "Film"}]}, None)
+        self.service.get_popular_movies(1)
+        version = self.service.cache.version("movie_summary_7")
+
+        self.service.search_movies("film")
+
+        assert self.service.cache.version("movie_summary_7") == version
+
+    @patch.object(TMDBService, '_make_request')
+    def test_details_refresh_summary_in_lists(self, mock_request):
+        """Test que des détails récents mettent à jour le film dans les listes"""
+        mock_request.return_value = ({"page": 1, "results": [{"id": 7, "title": "Ancien titre"}]}, None)
+        self.service.get_popular_movies(1)
+
+        mock_request.return_value = ({
+            "id": 7, "title": "Nouveau titre", "vote_average": 7.5,
+            "genres": [{"id": 18, "name": "Drame"}],
+            "similar": {"results": [{"id": 8, "title": "Similaire"}]}
+        }, None)
+        details, error = self.service.get_movie_details(7)
+        popular, _ = self.service.get_popular_movies(1)
+
+        assert error is None
+        assert details["similar"][0].title == "Similaire"
+        assert popular["results"][0].title == "Nouveau titre"
+        assert popular["results"][0].genre_ids == (18,)
+
+    @patch.object(TMDBService, '_make_request')
+    def test_details_cached_as_view_model(self, mock_request):
+        """Test que les détails sont mis en cache sous forme de modèle de vue"""
+        mock_request.return_value = ({
+            "id": 7, "title": "Film",
+            "credits": {"cast": [], "crew": [{"job": "Director", "name": "Réalisatrice"}]},
+            "recommendations": {"results": [{"id": 9}]}
+        }, None)
+
+        details, _ = self.service.get_movie_details(7)
+        cached = self.service.cache.get("movie_details_7")
+
+        assert details["director"] == "Réalisatrice"
+        assert "credits" not in cached and "recommendations" not in cached
+        assert "recommendations" not in mock_request.call_args[0][1]["append_to_response"]
+
+    @patch.object(TMDBService, '_make_request')
+    def test_list_refetched_when_summary_evicted(self, mock_request):
+        """Test qu'une liste dont un résumé a été évincé est relue auprès de TMDB"""
+        mock_request.return_value = ({"page": 1, "results": [{"id": 7, "title": "Film"}]}, None)
+        self.service.get_popular_movies(1)
+        self.service.cache._delete("movie_summary_7")
+
+        result, error = self.service.get_popular_movies(1)
+
+        assert error is None
+        assert result["results"][0].title == "Film"
+        assert mock_request.call_count == 2
+
+    @patch.object(TMDBService, '_make_request')
+    def test_not_found_negatively_cached(self, mock_request):
+        """Test que les 404 sont mis en cache pour une courte durée"""
+        mock_request.return_value = (None, "Ressource non trouvée")
+
+        self.service.get_movie_details(999999)
+        result, error = self.service.get_movie_details(999999)
+
+        assert result is None
+        assert error == "Ressource non trouvée"
+        assert mock_request.call_count == 1
+        assert self.service.negative_cache._ttls["movie_details_999999"] == config.NEGATIVE_CACHE_TTL
+
+    def test_session_uses_configured_pool(self):
+        """Test que la session partagée utilise le pool configuré"""
+        adapter = self.service.session.get_adapter('https://api.themoviedb.org/3')
+
+        assert adapter is self.service._adapter
+        assert adapter._pool_connections == config.HTTP_POOL_CONNECTIONS
+        assert adapter._pool_maxsize == config.HTTP_POOL_MAXSIZE
+
+    def test_get_pool_stats_empty(self):
+        """Test des statistiques d'un pool sans requête"""
+        stats = self.service.get_pool_stats()
+
+        assert stats["requests"] == 0
+        assert stats["open_connections"] == 0
+        assert stats["reuse_ratio"] == 0.0
+
+    def test_get_pool_stats_after_request(self):
+        """Test des statistiques du pool après une requête (connexion simulée)"""
+        response = HTTPResponse(body=io.BytesIO(b'{}'), status=200,
+                                headers={'Content-Type': 'application/json'}, preload_content=False)
+
+        with patch.object(HTTPSConnection, 'connect'), \
+                patch.object(HTTPSConnection, 'is_verified', True), \
+                patch.object(HTTPConnection, 'request'), \
+                patch.object(HTTPConnection, 'getresponse', return_value=response):
+            self.service.session.get(f"{config.TMDB_BASE_URL}/genre/movie/list")
+
+        stats = self.service.get_pool_stats()
+
+        assert stats["hosts"] == 1
+        assert stats["requests"] == 1
+        assert stats["open_connections"] == 1
+
     @patch.object(TMDBService, '_make_request')
     def test_get_popular_movies(self, mock_request):
         """Test de récupération des films populaires"""
@@ -125,6 +540,114 @@ class TestTMDBService:
         # _make_request ne doit être appelé qu'une fois grâce au cache
         assert mock_request.call_count == 1
 
+    def test_ttl_policy_with_jitter(self):
+        """Test des durées de cache par famille avec aléa"""
+        base = config.CACHE_TTL_POLICIES['genres']
+        jitter = base * config.CACHE_TTL_JITTER
+
+        ttls = [self.service._ttl_for('genres') for _ in range(20)]
+
+        assert all(base - jitter <= ttl <= base + jitter for ttl in ttls)
+        assert len(set(ttls)) > 1
+        assert self.service._ttl_for('inconnue') <= config.CACHE_TIMEOUT * (1 + config.CACHE_TTL_JITTER)
+
+    @patch.object(TMDBService, '_make_request')
+    def test_genres_cached_with_genres_policy(self, mock_request):
+        """Test que les genres utilisent la durée de cache longue"""
+        mock_request.return_value = ({"genres": []}, None)
+
+        self.service.get_genres()
+
+        assert self.service.cache._ttls["movie_genres"] > config.CACHE_TIMEOUT
+
+    @patch.object(TMDBService, '_make_request')
+    def test_get_movies_by_category(self, mock_request):
+        """Test de récupération d'une catégorie avec mise en cache"""
+        mock_request.return_value = ({"results": [], "total_pages": 900}, None)
+
+        result, error = self.service.get_movies_by_category("now_playing", 2)
+        self.service.get_movies_by_category("now_playing", 2)
+
+        assert error is None
+        assert result["total_pages"] == 500
+        mock_request.assert_called_once_with("movie/now_playing", {"page": 2})
+
+    @patch.object(TMDBService, '_make_request')
+    def test_stale_entry_served_and_refreshed_in_background(self, mock_request):
+        """Test du stale-while-revalidate : valeur périmée servie puis rafraîchie"""
+        mock_request.return_value = ({"results": [], "total_pages": 5}, None)
+        self.service.get_popular_movies(1)
+        self.service.cache._timestamps["popular_movies_page_1"] -= config.CACHE_TTL_POLICIES['popular'] * 1.5
+
+        mock_request.return_value = ({"results": [], "total_pages": 7}, None)
+        result, error = self.service.get_popular_movies(1)
+        self.service._refresh_executor.shutdown(wait=True)
+
+        assert error is None
+        assert result["total_pages"] == 5
+        assert mock_request.call_count == 2
+        assert self.service.cache.get("popular_movies_page_1")["total_pages"] == 7
+        assert self.service.get_stats()["background_refreshes"] == 1
+
+    @patch.object(TMDBService, '_make_request')
+    def test_hard_expired_entry_fetched_synchronously(self, mock_request):
+        """Test qu'une entrée au-delà du hard TTL est récupérée de manière synchrone"""
+        mock_request.return_value = ({"results": [], "total_pages": 5}, None)
+        self.service.get_popular_movies(1)
+        self.service.cache._timestamps["popular_movies_page_1"] -= config.CACHE_TTL_POLICIES['popular'] * 3
+
+        mock_request.return_value = ({"results": [], "total_pages": 7}, None)
+        result, _ = self.service.get_popular_movies(1)
+
+        assert result["total_pages"] == 7
+
+    @patch.object(TMDBService, '_make_request')
+    def test_concurrent_misses_make_single_request(self, mock_request):
+        """Test que des misses concurrents sur la même clé ne font qu'un appel TMDB"""
+        release = threading.Event()
+
+        def slow_request(endpoint, params):
+            release.wait(timeout=5)
+            return {"id": 42, "title": "Film"}, None
+
+        mock_request.side_effect = slow_request
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(self.service.get_movie_details, 42) for _ in range(4)]
+            deadline = time.time() + 5
+            while self.service.get_stats()["coalesced_requests"] < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert mock_request.call_count == 1
+        assert all(data["id"] == 42 for data, _ in results)
+
+    def test_fan_out_runs_calls_in_parallel(self):
+        """Test que fan_out exécute les appels en parallèle"""
+        def slow(value):
+            time.sleep(0.2)
+            return value, None
+
+        start = time.perf_counter()
+        results = self.service.fan_out(
+            movies=lambda: slow("films"),
+            genres=lambda: slow("genres"),
+            details=lambda: slow("détails")
+        )
+
+        assert time.perf_counter() - start < 0.5
+        assert list(results) == ["movies", "genres", "details"]
+        assert results["genres"] == ("genres", None)
+
+    def test_fan_out_propagates_exceptions(self):
+        """Test que les exceptions des appels sont propagées"""
+        def fail():
+            raise ValueError("échec")
+
+        with pytest.raises(ValueError):
+            self.service.fan_out(movies=fail, genres=lambda: ("ok", None))
+
     @patch.object(TMDBService, '_make_request')
     def test_search_movies(self, mock_request):
         """Test de recherche de films"""
@@ -166,6 +689,17 @@ class TestTMDBService:
             "page": 2
         })
 
+    @patch.object(TMDBService, '_make_request')
+    def test_discover_movies_cached_by_params(self, mock_request):
+        """Test de la découverte libre mise en cache selon les paramètres"""
+        mock_request.return_value = ({"results": [], "total_pages": 900}, None)
+
+        result, _ = self.service.discover_movies({"page": 1, "with_genres": 28})
+        self.service.discover_movies({"with_genres": 28, "page": 1})
+
+        assert result["total_pages"] == 500
+        mock_request.assert_called_once_with("discover/movie", {"page": 1, "with_genres": 28})
+
     @patch.object(TMDBService, '_make_request')
     def test_total_pages_limit(self, mock_request):
         """Test de la limitation du nombre de pages"""